@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--benchmark', action='store_true',
+        help="Also run the benchmark tests, which print timings.")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', "benchmark: opt-in timing test (run with --benchmark)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--benchmark'):
+        return
+
+    skip = pytest.mark.skip(reason="benchmark (run with --benchmark)")
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def cache_dir(tmpdir_factory):
+    """Point the robotframework-tools cache directory
+       to a temporary one for the whole test session
+       (also inherited by subprocesses).
+    """
+    path = str(tmpdir_factory.mktemp('cache'))
+    previous = os.environ.get('ROBOTTOOLS_CACHE_DIR')
+    os.environ['ROBOTTOOLS_CACHE_DIR'] = path
+    yield path
+    if previous is None:
+        del os.environ['ROBOTTOOLS_CACHE_DIR']
+    else:
+        os.environ['ROBOTTOOLS_CACHE_DIR'] = previous
@@ -24,8 +24,75 @@ Python Tools for Robot Framework and Test Libraries.
 .. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
 """
 
+from collections import OrderedDict
+
+# The submodules providing the public names of this package,
+# which are only imported on first access of these names
+# (see :func:`load`)
+SUBMODULE_NAMES = OrderedDict([
+  ('robottools.library', [
+    'testlibrary', 'istestlibraryclass', 'TestLibraryType',
+    ]),
+  ('robottools.library.keywords', [
+    'Keyword', 'KeywordName', 'KeywordsDict', 'KeywordDecoratorType',
+    'memoized', 'batch', 'InvalidKeywordOption', 'KeywordNotDefined',
+    ]),
+  ('robottools.library.session', [
+    'SessionHandler',
+    ]),
+  ('robottools.library.context', [
+    'ContextHandler', 'ActiveContexts', 'contextmethod',
+    ]),
+  ('robottools.library.inspector', [
+    'ROBOT_LIBRARIES', 'TestLibraryImportError', 'TestLibraryInspector',
+    'MultiTestLibraryInspector',
+    ]),
+  ('robottools.libdoc', [
+    'libdoc',
+    ]),
+  ('robottools.testrobot', [
+    'TestRobot', 'TestResult', 'KeywordCallResult',
+    ]),
+  ('robottools.utils', [
+    'normboolclass', 'normbooltype', 'normstringclass', 'normstringtype',
+    'NormalizedDict', 'normdictclass', 'normdicttype',
+    'normdictkeys', 'normdictitems', 'normdictdata', 'RobotBool',
+    ]),
+  ])
+
+__all__ = [name for names in SUBMODULE_NAMES.values() for name in names]
+
+import re
+import sys
+from types import ModuleType
+
+try:
+    import robot
+except ImportError as exc:
+    raise ImportError(
+        "%s depends on robotframework but import failed with: %s"
+        % (repr(__name__), exc))
+if tuple(int(number) for number in re.match(
+        r'(\d+)\.(\d+)(?:\.(\d+))?', robot.__version__).groups('0')
+) < (2, 8, 7):
+    raise __import__('pkg_resources').VersionConflict(
+        "%s needs robotframework>=2.8.7 but found %s in %s"
+        % (repr(__name__), robot.__version__, repr(robot)))
+
+
+# Map the lazily loaded public names to their providing submodules
+LAZY_NAMES = dict(
+    (name, modname) for modname, names in SUBMODULE_NAMES.items()
+    for name in names)
+# The subpackages, which were always imported before lazy loading
+for name in ['library', 'testrobot', 'utils']:
+    LAZY_NAMES[name] = None
+del name
+
+
+# The package metadata from zetup config,
+# loaded eagerly to check the package requirements on import
 from zetup import find_zetup_config
-from zetup.version import Version
 
 zfg = find_zetup_config(__name__)
 
@@ -39,25 +106,51 @@ __extras__ = zfg.EXTRAS
 
 ## __notebook__ = zfg.NOTEBOOKS['README']
 
-try:
-    import robot
-except ImportError as exc:
-    raise ImportError(
-        "%s depends on robotframework but import failed with: %s"
-        % (repr(__distribution__), exc))
-if Version(robot.__version__) < '2.8.7':
-    raise __import__('pkg_resources').VersionConflict(
-        "%s needs robotframework>=2.8.7 but found %s in %s"
-        % (repr(__distribution__), robot.__version__, repr(robot)))
 
-from robottools.library import *
-from robottools.library.keywords import *
-from robottools.library.session import SessionHandler
-from robottools.library.context import *
+def load(name):
+    """Import the submodule providing the lazily loaded public `name`
+       and store the value in this package's namespace.
+    """
+    module = sys.modules[__name__]
+    try:
+        modname = LAZY_NAMES[name]
+    except KeyError:
+        raise AttributeError(
+            "module %s has no attribute %s" % (repr(__name__), repr(name)))
+    # (use __import__ instead of importlib to be visible to
+    #  robottools.importtime)
+    if modname is None: # ==> subpackage
+        modname = '%s.%s' % (__name__, name)
+        __import__(modname)
+        value = sys.modules[modname]
+    else:
+        __import__(modname)
+        value = getattr(sys.modules[modname], name)
+    setattr(module, name, value)
+    return value
+
 
-from robottools.library.inspector import *
-from robottools.libdoc import libdoc
+class LazyModule(ModuleType):
+    """Module type of this package to :func:`load`
+       its public names on first attribute access.
+    """
+    def __getattr__(self, name):
+        return load(name)
 
-from robottools.testrobot import *
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(LAZY_NAMES))
 
-from .utils import *
+    def __setattr__(self, name, value):
+        # keep the libdoc() function in place of the robottools.libdoc module
+        # when the import system sets it after importing the submodule
+        if name == 'libdoc' and isinstance(value, ModuleType):
+            value = value.libdoc
+        ModuleType.__setattr__(self, name, value)
+
+
+try:
+    sys.modules[__name__].__class__ = LazyModule
+except TypeError: # PY2 or PY3 < 3.5 ==> no lazy loading
+    for name in list(__all__) + ['library', 'testrobot', 'utils']:
+        load(name)
+    del name
@@ -0,0 +1,183 @@
+# robotframework-tools
+#
+# Python Tools for Robot Framework and Test Libraries.
+#
+# Copyright (C) 2013-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# robotframework-tools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# robotframework-tools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with robotframework-tools. If not, see <http://www.gnu.org/licenses/>.
+
+"""robottools.importtime
+
+Report where the startup time of :mod:`robottools` goes::
+
+    python -m robottools.importtime [--top N] [TARGET ...]
+
+- Every `TARGET` is a module name to import,
+  optionally followed by ``:attribute`` to also access,
+  like ``robottools:TestRobot`` for loading the TestRobot subsystem.
+- The targets are measured one after another in a fresh Python process,
+  so every target only shows the additional time it needs.
+- Works like Python 3.7's ``-X importtime``,
+  but also with older Python versions.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+__all__ = ['ImportProfiler', 'main']
+
+import os
+import sys
+import subprocess
+from argparse import ArgumentParser
+from timeit import default_timer as timer
+
+# (a plain `import builtins` can find the `future` package's one on PY2)
+from six.moves import builtins
+
+
+DEFAULT_TARGETS = [
+    'robottools',
+    'robottools:testlibrary',
+    'robottools:TestLibraryInspector',
+    'robottools:TestRobot',
+    ]
+
+
+class ImportProfiler(object):
+    """Measures the time of all module imports while entered,
+       by temporarily replacing ``builtins.__import__``.
+
+    - Only imports which actually load new modules are recorded.
+    - :attr:`.records` is a list of
+      ``(depth, module name, self seconds, cumulative seconds)`` tuples
+      in the order the imports finished.
+    """
+    def __init__(self):
+        self.records = []
+        # the times of nested imports per currently running import
+        self._stack = []
+
+    def _import(self, name, globals=None, locals=None, fromlist=(),
+                level=0):
+        nmodules = len(sys.modules)
+        self._stack.append(0.0)
+        start = timer()
+        try:
+            return self._original_import(
+                name, globals, locals, fromlist, level)
+        finally:
+            cumulative = timer() - start
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += cumulative
+            if len(sys.modules) > nmodules:
+                self.records.append((
+                    len(self._stack), self._resolve(name, globals, level),
+                    cumulative - nested, cumulative))
+
+    @staticmethod
+    def _resolve(name, globals, level):
+        """Get the absolute module name of a relative import.
+        """
+        if not level or not globals:
+            return name
+        package = globals.get('__package__') or globals.get('__name__', '')
+        if level > 1:
+            package = package.rsplit('.', level - 1)[0]
+        return package + (name and '.' + name)
+
+    def __enter__(self):
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def __exit__(self, *exc):
+        builtins.__import__ = self._original_import
+
+
+def profile(target):
+    """Import the module and optional ``:attribute`` given as `target`.
+
+    :returns: The :class:`ImportProfiler` and the total seconds.
+    """
+    modname, _, attr = target.partition(':')
+    with ImportProfiler() as profiler:
+        start = timer()
+        module = __import__(modname)
+        for name in modname.split('.')[1:]:
+            module = getattr(module, name)
+        if attr:
+            getattr(module, attr)
+        total = timer() - start
+    return profiler, total
+
+
+def report(targets, top=10, file=sys.stdout):
+    """Profile the given `targets` one after another
+       and write the import tree and the `top` slowest modules
+       to `file`.
+    """
+    for target in targets:
+        profiler, total = profile(target)
+        file.write("\n%s: %.1f ms\n" % (target, total * 1e3))
+        file.write("import time: self [us] | cumulative | imported package\n")
+        for depth, name, selftime, cumulative in profiler.records:
+            file.write("import time: %9d | %10d | %s%s\n" % (
+                selftime * 1e6, cumulative * 1e6, '  ' * depth, name))
+        if top:
+            file.write("slowest by self time:\n")
+            for _, name, selftime, _ in sorted(
+                    profiler.records, key=lambda record: -record[2])[:top]:
+                file.write("  %8.1f ms  %s\n" % (selftime * 1e3, name))
+
+
+def main(args=None):
+    """Run the import time report for the command line `args`
+       in a fresh Python process.
+    """
+    parser = ArgumentParser(
+        prog='python -m robottools.importtime',
+        description="Report where the startup time of robottools goes.")
+    parser.add_argument(
+        '--top', type=int, default=10,
+        help="number of slowest modules to list per target")
+    parser.add_argument(
+        'targets', nargs='*', metavar='TARGET', default=DEFAULT_TARGETS,
+        help="module[:attribute] to import (default: %s)"
+        % ' '.join(DEFAULT_TARGETS))
+    options = parser.parse_args(args)
+
+    # run this file as script, which doesn't import robottools itself,
+    # using the same module search path
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        path or os.getcwd() for path in sys.path)
+    script = os.path.splitext(os.path.abspath(__file__))[0] + '.py'
+    return subprocess.call(
+        [sys.executable, script, '--top', str(options.top)]
+        + options.targets, env=env)
+
+
+if __name__ == '__main__':
+    if __package__:
+        # ==> python -m robottools.importtime
+        sys.exit(main())
+
+    # ==> run as script in the fresh process started by main()
+    # (don't let the robottools package directory shadow other modules)
+    del sys.path[0]
+    parser = ArgumentParser()
+    parser.add_argument('--top', type=int)
+    parser.add_argument('targets', nargs='+')
+    options = parser.parse_args()
+    report(options.targets, top=options.top)
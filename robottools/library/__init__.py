@@ -94,11 +94,11 @@ def testlibrary(
 
         # Create a property for getting the currently active context name:
         def context(self, _cls=handlercls):
-            for current in self.contexts:
-                if current.handler == _cls:
-                    return current.name
-            #TODO
-            raise RuntimeError
+            try:
+                return self.contexts[_cls].name
+            except KeyError:
+                #TODO
+                raise RuntimeError
 
         clsattrs[handlercls.__name__.lower()] = property(context)
 
@@ -117,13 +117,14 @@ def testlibrary(
 
         # give access to the handler's dictionary of running sessions
         clsattrs[handlercls.meta.plural_identifier_name] = property(
-          lambda self, h=handlercls: h.sessions)
+          lambda self, h=handlercls: h.registry_for(self).sessions)
 
         # give access to the handler's currently active session
         def session(self, h=handlercls):
-            if h.session is None:
+            session = h.registry_for(self).session
+            if session is None:
                 raise h.SessionError("No active session.")
-            return h.session
+            return session
 
         clsattrs[handlercls.meta.identifier_name] = property(session)
 
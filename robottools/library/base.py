@@ -27,25 +27,69 @@ __all__ = ['TestLibraryType']
 
 from textwrap import dedent
 
-from decorator import decorator
+from .keywords import Keyword, KeywordTemplate, KeywordsDict
+from .session import SessionRegistry
+from .context import ActiveContexts
 
-from .keywords import Keyword, KeywordsDict
 
+class MissingKeywordsDict(object):
+    """Placeholder for the instance-bound .keywords mapping
+    of a Test Library instance, whose base __init__ was not called (yet).
 
-def check_keywords(func):
-    """Decorator for Test Library methods,
-    which checks if an instance-bound .keywords mapping exists.
+    - Raises a :exc:`RuntimeError` on any access.
     """
-    def caller(func, self, *args, **kwargs):
-        if self.keywords is type(self).keywords:
-            raise RuntimeError(dedent("""
-              '%s' instance has no instance-bound .keywords mapping.
-              Was Test Library's base __init__ called?
-              """ % type(self).__name__))
+    def __init__(self, libcls):
+        self.libcls = libcls
 
-        return func(self, *args, **kwargs)
+    def error(self, *args, **kwargs):
+        raise RuntimeError(dedent("""
+          '%s' instance has no instance-bound .keywords mapping.
+          Was Test Library's base __init__ called?
+          """ % self.libcls.__name__))
 
-    return decorator(caller, func)
+    __getitem__ = __iter__ = __len__ = __dir__ = item = names = error
+
+    def __getattr__(self, name):
+        self.error()
+
+
+class LibraryKeywordsDict(KeywordsDict):
+    """Instance-bound :class:`KeywordsDict` of a Test Library,
+    which lazily creates the bound :class:`Keyword` instances
+    on first access to the Keyword functions
+    in the Test Library class' :class:`KeywordsDict` mapping.
+    """
+    def __init__(self, libinstance):
+        KeywordsDict.__init__(self)
+        self.libinstance = libinstance
+        self._funcs = type(libinstance).keywords
+
+    def __getitem__(self, name):
+        try:
+            return KeywordsDict.__getitem__(self, name)
+        except KeyError:
+            name, func = self._funcs.item(name)
+            template = type(self.libinstance)._keyword_template(
+                name, func)
+            keyword = Keyword(name, func, self.libinstance, template)
+            self[name] = keyword
+            return keyword
+
+    def __iter__(self):
+        for name in self._funcs.names():
+            yield name, self[name]
+
+    def names(self):
+        return self._funcs.names()
+
+    def __len__(self):
+        return len(self._funcs)
+
+    def __bool__(self):
+        return bool(self._funcs)
+
+    def __dir__(self):
+        return dir(self._funcs)
 
 
 class TestLibraryType(object):
@@ -55,16 +99,32 @@ class TestLibraryType(object):
     - :func:`testlibrary` dynamically creates derived classes
       to use as (a base for) a custom Test Library.
     """
+    def __new__(cls, *args, **kwargs):
+        """Create a Test Library instance
+           with a :class:`MissingKeywordsDict` placeholder
+           for the instance-bound .keywords mapping,
+           which gets replaced by the base __init__.
+
+        - So the Dynamic API methods don't need to check
+          if the base __init__ was called.
+        - Also creates the instance's own
+          :class:`robottools.library.session.SessionRegistry`
+          for every session handler.
+        """
+        self = super(TestLibraryType, cls).__new__(cls)
+        self.keywords = MissingKeywordsDict(cls)
+        self.session_registries = dict(
+            (name, SessionRegistry(hcls))
+            for name, hcls in cls.session_handlers)
+        return self
 
-    @check_keywords
     def get_keyword_names(self):
         """Get all Capitalized Keyword names.
 
         - Part of Robot Framework's Dynamic Test Library API.
         """
-        return [str(name) for name, kw in self.keywords]
+        return [str(name) for name in self.keywords.names()]
 
-    @check_keywords
     def run_keyword(self, name, args, kwargs={}):
         """Run the Keyword given by its `name`
         with the given `args` and optional `kwargs`.
@@ -74,7 +134,6 @@ class TestLibraryType(object):
         keyword = self.keywords[name]
         return keyword(*args, **kwargs)
 
-    @check_keywords
     def get_keyword_documentation(self, name):
         """Get the doc string of the Keyword given by its `name`.
 
@@ -89,14 +148,12 @@ class TestLibraryType(object):
         keyword = self.keywords[name]
         return keyword.__doc__
 
-    @check_keywords
     def get_keyword_arguments(self, name):
         """Get the arguments definition of the Keyword given by its `name`.
 
         - Part of Robot Framework's Dynamic Test Library API.
         """
-        keyword = self.keywords[name]
-        return list(keyword.args())
+        return self.keywords[name].args()
 
     def __init__(self):
         """Initializes the Test Library base.
@@ -106,17 +163,31 @@ class TestLibraryType(object):
           corresponding to the method function objects
           in the Test Library class' :class:`KeywordsDict` mapping,
           which was populated by the <Test Library class>.keyword decorator.
+          The :class:`Keyword` instances are created on first access.
         - Sets the initially active contexts.
         """
-        self.contexts = []
-        for name, handler in self.context_handlers:
-            self.contexts.append(handler.default)
+        self.contexts = ActiveContexts(
+            handler.default for name, handler in self.context_handlers)
 
-        self.keywords = KeywordsDict()
-        for name, func in type(self).keywords:
-            self.keywords[name] = Keyword(name, func, libinstance=self)
+        self.keywords = LibraryKeywordsDict(self)
+
+    @classmethod
+    def _keyword_template(cls, name, func):
+        """Get the (cached) :class:`KeywordTemplate`
+           for the Keyword `func` with given display `name`,
+           shared by all instances of the Test Library class.
+        """
+        # (look in the class' own __dict__ to not get a base class' cache)
+        templates = cls.__dict__.get('_keyword_templates')
+        if templates is None:
+            templates = {}
+            setattr(cls, '_keyword_templates', templates)
+        template = templates.get(name)
+        if template is None or template.func is not func:
+            template = templates[name] = KeywordTemplate(
+                name, func, cls.session_handlers)
+        return template
 
-    @check_keywords
     def __getattr__(self, name):
         """CamelCase access to the bound :class:`Keyword` instances.
         """
@@ -127,7 +198,6 @@ class TestLibraryType(object):
               "'%s' instance has no attribute or Keyword '%s'"
               % (type(self).__name__, name))
 
-    @check_keywords
     def __dir__(self):
         """Return the CamelCase Keyword names.
         """
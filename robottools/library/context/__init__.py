@@ -24,7 +24,7 @@
 from six import with_metaclass
 
 __all__ = [
-  'ContextHandler',
+  'ContextHandler', 'ActiveContexts',
   # From .method:
   'contextmethod']
 
@@ -52,6 +52,86 @@ class Context(object):
         return "%s.%s" % (self.handler.__name__, self.name)
 
 
+class ActiveContexts(list):
+    """The currently active :class:`Context` objects
+       of a Test Library instance.
+
+    - A ``list`` of the active :class:`Context` objects,
+      which can still be modified with all ``list`` methods.
+    - Additionally indexed by context handler class,
+      so ``context in ...`` and ``...[handlercls]`` need no linear scans.
+    """
+    def __init__(self, contexts=()):
+        list.__init__(self, contexts)
+        self._reindex()
+
+    def _reindex(self):
+        # handler class -> active context (the last one in the list wins,
+        # like when activating a new context)
+        self._active = dict((context.handler, context) for context in self)
+        # any handler with more than one context in the list?
+        self._unique = len(self._active) == len(self)
+
+    def activate(self, context):
+        """Make the given :class:`Context` the active one of its handler.
+        """
+        handler = context.handler
+        current = self._active.get(handler)
+        if current is not None:
+            list.remove(self, current)
+        list.append(self, context)
+        # list length and number of handlers change together,
+        # so `_unique` stays valid without a full `_reindex()`
+        self._active[handler] = context
+
+    def __getitem__(self, key):
+        """Get the active :class:`Context` of the given handler class
+           or the list item at the given index.
+        """
+        if isinstance(key, type):
+            return self._active[key]
+        return list.__getitem__(self, key)
+
+    def get(self, handlercls, default=None):
+        return self._active.get(handlercls, default)
+
+    def __contains__(self, context):
+        handler = getattr(context, 'handler', None)
+        if self._active.get(handler) is context:
+            return True
+        if self._unique:
+            return False
+        return list.__contains__(self, context)
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, list.__repr__(self))
+
+
+def _reindexing(name):
+    """Create an :class:`ActiveContexts` method,
+       which updates the handler index after calling the list method `name`.
+    """
+    method = getattr(list, name)
+
+    def func(self, *args):
+        result = method(self, *args)
+        self._reindex()
+        return result
+
+    func.__name__ = name
+    return func
+
+for name in [
+  'append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse',
+  '__setitem__', '__delitem__', '__iadd__', '__imul__',
+  # PY2
+  '__setslice__', '__delslice__',
+  ]:
+    if hasattr(list, name):
+        setattr(ActiveContexts, name, _reindexing(name))
+del name
+
+
 class ContextHandlerMeta(type):
     ## def __new__(metacls, clsname, bases, clsattrs):
     ##     if clsname == 'ContextHandler': # The handler base class itself
@@ -76,9 +156,12 @@ class ContextHandlerMeta(type):
         except AttributeError:
             return
         cls.contexts = []
+        # for looking up contexts by name
+        cls.contexts_by_name = {}
         for name in names:
             context = Context(name, handler=cls)
             cls.contexts.append(context)
+            cls.contexts_by_name[name] = context
             setattr(cls, name, context)
 
         cls.keywords = KeywordsDict()
@@ -87,22 +170,18 @@ class ContextHandlerMeta(type):
         switch_func = clsattrs.get('switch')
 
         def switch_context(self, name):
-            for current in self.contexts:
-                if current.handler is cls:
-                    break
-            for context in cls.contexts:
-                if context.name == name:
-                    if switch_func: # Custom switch hook
-                        try:
-                            switch_func(self, name)
-                        except Exception as exc:
-                            raise cls.ContextError(
-                                "Couldn't switch context to %s (%s: %s)"
-                                % (repr(name), qualname(type(exc)), exc))
-                    self.contexts.remove(current)
-                    self.contexts.append(context)
-                    return
-            raise cls.ContextError("Context not found: %s" % repr(name))
+            try:
+                context = cls.contexts_by_name[name]
+            except KeyError:
+                raise cls.ContextError("Context not found: %s" % repr(name))
+            if switch_func: # Custom switch hook
+                try:
+                    switch_func(self, name)
+                except Exception as exc:
+                    raise cls.ContextError(
+                        "Couldn't switch context to %s (%s: %s)"
+                        % (repr(name), qualname(type(exc)), exc))
+            self.contexts.activate(context)
 
         keyword_name = switch_context.__name__ = 'switch_' + clsname.lower()
         cls.keywords[keyword_name] = switch_context
@@ -118,7 +197,4 @@ class ContextHandler(with_metaclass(ContextHandlerMeta, object)):
             self.default = self[default]
 
     def __getitem__(self, name):
-        for context in self.contexts:
-            if context.name == name:
-                return context
-        raise KeyError(name)
+        return self.contexts_by_name[name]
@@ -28,6 +28,8 @@ of :class:`robottools.ContextHandler`-derived definitions.
 """
 __all__ = ['contextmethod']
 
+from multiprocessing.pool import ThreadPool
+
 from moretools import Lazy, LazyDict
 
 
@@ -66,7 +68,16 @@ class contextmethod(object):
       will return a ``moretools.LazyDict`` instance which will call
       the context specific implementations on first
       ``['context_name']`` access.
+    * A ``@contextmethod.combined.parallel(Handler)`` decorated method
+      will call all context specific implementations
+      at the same time in a pool of threads.
+      The pool is limited to ``workers=`` threads,
+      which defaults to :data:`contextmethod.workers`.
     """
+    #: The default maximum number of threads
+    #  of ``@contextmethod.combined.parallel`` methods
+    workers = 10
+
     def __init__(self, *handlers, **options):
         """Create a decorator for the given `handlers`.
 
@@ -77,6 +88,8 @@ class contextmethod(object):
         self.handlers = handlers
         self.combined = options.pop('combined', False)
         self.lazy = options.pop('lazy', False)
+        self.parallel = options.pop('parallel', False)
+        self.workers = int(options.pop('workers', None) or self.workers)
 
     def __call__(self, func):
         """The actual decoration logic.
@@ -84,8 +97,12 @@ class contextmethod(object):
         handlers = self.handlers
         combined = self.combined
         lazy = self.lazy
+        parallel = self.parallel
+        workers = self.workers
         # To collect the context specific method implementations
-        # decorated with @method.<context name>:
+        # decorated with @method.<context name>,
+        # which directly serves as dispatch table
+        # for the currently active contexts:
         ctxfuncs = {}
 
         # The wrapper method returned by this decorator
@@ -98,6 +115,18 @@ class contextmethod(object):
                     for context, ctxfunc in ctxfuncs.items():
                         results[context.name] = Lazy(
                           ctxfunc, self, *args, **kwargs)
+                elif parallel and ctxfuncs:
+                    items = list(ctxfuncs.items())
+                    pool = ThreadPool(min(len(items), workers))
+                    try:
+                        values = pool.map(
+                          lambda item: item[1](self, *args, **kwargs), items)
+                    finally:
+                        pool.close()
+                        pool.join()
+                    results = dict(
+                      (context.name, value)
+                      for (context, _), value in zip(items, values))
                 else:
                     results = {}
                     for context, ctxfunc in ctxfuncs.items():
@@ -109,8 +138,9 @@ class contextmethod(object):
                     results = method.result(self, results)
                 return results
             # Default behavior (only call 1 method implementation):
-            for context in self.contexts:
-                if context.handler in handlers:
+            for handler in handlers:
+                context = self.contexts.get(handler)
+                if context is not None:
                     break
             else:
                 #TODO
@@ -148,5 +178,11 @@ class lazy(combined):
         combined.__init__(self, *handlers, lazy=True)
 
 
+class parallel(combined):
+    def __init__(self, *handlers, **options):
+        combined.__init__(self, *handlers, parallel=True, **options)
+
+
 combined.lazy = lazy
+combined.parallel = parallel
 contextmethod.combined = combined
@@ -43,17 +43,75 @@ from robot.running.userkeyword import UserLibrary
 import robot.libraries
 
 from .keyword import KeywordInspector
+from .manifest import Manifest
 
 
 ROBOT_LIBRARIES_PATH = Path(robot.libraries.__file__).dirname()
-ROBOT_LIBRARIES = set()
-for path in ROBOT_LIBRARIES_PATH.walkfiles():
-    name = str(path.basename().splitext()[0])
-    if name[0].isupper():
-        ROBOT_LIBRARIES.add(name)
-del path, name
 
-ROBOT_LIBRARIES = sorted(ROBOT_LIBRARIES)
+
+class RobotLibraries(object):
+    """The sorted sequence of the names of Robot's standard Test Libraries.
+
+    - Read on first access from the cached :class:`.manifest.Manifest`,
+      which only walks the ``robot.libraries`` package directory
+      if the installed Robot Framework version is not cached yet.
+    """
+    def __init__(self, manifest=None):
+        self.manifest = manifest or Manifest()
+        self._names = None
+
+    @staticmethod
+    def discover():
+        """Find the standard library names
+           in the ``robot.libraries`` package directory.
+        """
+        names = set()
+        for path in ROBOT_LIBRARIES_PATH.walkfiles():
+            name = str(path.basename().splitext()[0])
+            if name[0].isupper():
+                names.add(name)
+        return names
+
+    @property
+    def names(self):
+        names = self._names
+        if names is None:
+            names = self._names = self.manifest.libraries(self.discover)
+        return names
+
+    def keywords(self, libname):
+        """Get the (cached) Keyword names of standard library `libname`.
+        """
+        return self.manifest.keywords(libname, lambda: (
+            keyword.name for keyword in TestLibraryInspector(libname)))
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        return self.names[index]
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __eq__(self, other):
+        return self.names == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    # unhashable like the plain list of names it replaces,
+    # because it compares equal to such lists
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.names)
+
+
+ROBOT_LIBRARIES = RobotLibraries()
 
 
 class TestLibraryImportError(ImportError):
@@ -63,6 +121,13 @@ class TestLibraryImportError(ImportError):
 class TestLibraryInspectorMeta(zetup.meta):
 
     def __getattr__(self, libname):
+        """Get a new inspector for the Test Library `libname`.
+
+        - Inspectors are not cached, because every inspector holds
+          its own stateful library instance.
+          Only the library and Keyword names are cached
+          (see :class:`RobotLibraries`).
+        """
         try:
             return TestLibraryInspector(libname)
         except TestLibraryImportError as e:
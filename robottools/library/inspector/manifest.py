@@ -0,0 +1,160 @@
+# robotframework-tools
+#
+# Python Tools for Robot Framework and Test Libraries.
+#
+# Copyright (C) 2013-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# robotframework-tools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# robotframework-tools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with robotframework-tools. If not, see <http://www.gnu.org/licenses/>.
+
+"""robottools.library.inspector.manifest
+
+A cached manifest of Robot Framework's standard Test Libraries,
+stored per installed Robot Framework version in a user cache directory,
+to skip library discovery in every new Python process.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+__all__ = ['Manifest', 'cache_dir']
+
+import os
+import sys
+import json
+from tempfile import NamedTemporaryFile
+
+import robot
+
+
+def cache_dir():
+    """Get the user cache directory of robotframework-tools.
+
+    - Can be set with the ``ROBOTTOOLS_CACHE_DIR`` environment variable.
+    - Defaults to ``$XDG_CACHE_HOME/robotframework-tools``
+      or ``~/.cache/robotframework-tools``
+      and ``%LOCALAPPDATA%\\robotframework-tools`` on Windows.
+    """
+    path = os.environ.get('ROBOTTOOLS_CACHE_DIR')
+    if path:
+        return path
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') \
+            or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'robotframework-tools')
+
+
+class Manifest(object):
+    """The names and optional Keyword names of Robot's standard libraries,
+       stored as JSON file in the user :func:`cache_dir`
+       for the installed Robot Framework and Python versions.
+
+    - Missing entries are discovered with the given functions
+      and written back to the file.
+    - Writing is done atomically and failures are ignored,
+      so the cache can be shared by many parallel processes
+      and read-only cache directories just disable it.
+    """
+    def __init__(self, path=None):
+        self._path = path
+        self._data = None
+
+    @property
+    def path(self):
+        """The manifest file path.
+
+        - Defaults to a file in the :func:`cache_dir`,
+          which is determined on first access
+          (and not already on creation of the module level instances).
+        """
+        path = self._path
+        if path is None:
+            path = self._path = os.path.join(
+                cache_dir(), 'robot-%s-py%d.%d.json' % (
+                    (robot.__version__, ) + tuple(sys.version_info[:2])))
+        return path
+
+    @property
+    def data(self):
+        """The manifest data loaded from :attr:`.path`.
+
+        - Empty if the file doesn't exist,
+          is invalid, or belongs to another Robot Framework version.
+        """
+        data = self._data
+        if data is None:
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+            except (IOError, OSError, ValueError):
+                data = {}
+            if not isinstance(data, dict) \
+                    or data.get('robot') != robot.__version__:
+                data = {}
+            data['robot'] = robot.__version__
+            data.setdefault('keywords', {})
+            self._data = data
+        return data
+
+    def save(self):
+        """Atomically write the manifest data to :attr:`.path`.
+
+        :returns: ``False`` if writing failed.
+        """
+        dirname = os.path.dirname(self.path)
+        try:
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            f = NamedTemporaryFile(
+                'w', dir=dirname, suffix='.tmp', delete=False)
+        except (IOError, OSError):
+            return False
+        try:
+            with f:
+                json.dump(self.data, f, indent=1, sort_keys=True)
+        except BaseException as exc:
+            # don't leave the temporary file behind
+            os.remove(f.name)
+            if isinstance(exc, (IOError, OSError)):
+                return False
+            raise
+        try:
+            # (os.rename doesn't replace existing files on Windows)
+            getattr(os, 'replace', os.rename)(f.name, self.path)
+        except OSError:
+            os.remove(f.name)
+            return False
+        return True
+
+    def libraries(self, discover):
+        """Get the sorted standard library names.
+
+        - Uses `discover` function if not in the manifest yet.
+        """
+        names = self.data.get('libraries')
+        if names is None:
+            names = self.data['libraries'] = sorted(discover())
+            self.save()
+        return [str(name) for name in names]
+
+    def keywords(self, libname, discover):
+        """Get the Keyword names of the standard library `libname`.
+
+        - Uses `discover` function if not in the manifest yet.
+        """
+        keywords = self.data['keywords']
+        names = keywords.get(libname)
+        if names is None:
+            names = keywords[libname] = list(discover())
+            self.save()
+        return [str(name) for name in names]
@@ -28,6 +28,8 @@ __all__ = ['Keyword',
   'KeywordName', 'KeywordsDict',
   # from .deco:
   'KeywordDecoratorType',
+  # from .argtypes:
+  'memoized', 'batch',
   # from .errors:
   'InvalidKeywordOption', 'KeywordNotDefined']
 
@@ -41,54 +43,42 @@ from moretools import dictitems, dictvalues
 from .errors import InvalidKeywordOption, KeywordNotDefined
 from .utils import KeywordName, KeywordsDict
 from .deco import KeywordDecoratorType
+from .argtypes import memoized, batch
 
 
-class Keyword(object):
-    """The Keyword handler for Test Library instances.
-
-    * Provides inspection of Keyword name, arguments, and documentation.
-    * Instances get called by Test Libraries' ``.run_keyword()`` method.
+class KeywordTemplate(object):
+    """The unbound metadata of a Keyword function,
+       shared by all bound :class:`Keyword` instances
+       of a Test Library class.
     """
-    def __init__(self, name, func, libinstance):
-        """Initialize with Keyword's display `name`,
-           the actual Keyword `func` and the Test Library instance.
+    def __init__(self, name, func, session_handlers):
+        """Precompute everything needed for choosing the Keyword call path
+           from Keyword's display `name`, the actual Keyword `func`
+           and the Test Library class' `session_handlers`.
         """
         self.name = name
         self.func = func
-        self.libinstance = libinstance
         # Get all ContextHandler-derived classes for which this Keyword
         # has context-specific implementations,
         # to implicitly provide additional context_name= switching kwargs:
         self.context_handlers = set(ctx.handler for ctx in func.contexts)
+        # Does the Keyword function support **kwargs?
+        self.kwargs = bool(func.argspec.keywords)
+        self.explicit_session_handlers = [
+            hcls for _, hcls in session_handlers if hcls.meta.auto_explicit]
+        self.explicit_context_handlers = [
+            hcls for hcls in self.context_handlers
+            if getattr(hcls, 'auto_explicit', False)]
+        self.explicit_options = frozenset(chain(
+            (hcls.meta.identifier_name
+             for hcls in self.explicit_session_handlers),
+            (hcls.__name__.lower()
+             for hcls in self.explicit_context_handlers)))
+        # The argument spec in Robot's Dynamic API style
+        self.args = tuple(self._args(session_handlers))
 
-    @property
-    def __doc__(self):
-        """The Keyword's documentation string,
-        taken from ``self.func.__doc__``.
-        """
-        doc = self.func.__doc__
-        if doc is None:
-            return None
-        if '\n' in doc:
-            first_line, rest = doc.split('\n', 1)
-            return "%s\n%s" % (first_line, dedent(rest))
-
-    @property
-    def libname(self):
-        """The Keyword's Test Library class name,
-        which also represents the Library's display name.
-        """
-        return type(self.libinstance).__name__
-
-    @property
-    def longname(self):
-        """The Keyword's full display name (**TestLibraryName.Keyword Name**).
-        """
-        return '%s.%s' % (self.libname, self.name)
-
-    def args(self):
-        """Iterate the Keyword's argument spec in Robot's Dynamic API style,
-           usable by Test Libraries' ``.get_keyword_arguments()`` method.
+    def _args(self, session_handlers):
+        """Iterate the Keyword's argument spec in Robot's Dynamic API style.
         """
         # First look for custom override args list:
         if self.func.args:
@@ -123,15 +113,123 @@ class Keyword(object):
         # to support explicit <session>= and <context>= switching
         # for single Keyword calls:
         elif any(hcls.meta.auto_explicit
-                 for hcls in dictvalues(self.libinstance.session_handlers)) \
+                 for hcls in dictvalues(session_handlers)) \
           or any(getattr(hcls, 'auto_explicit', False)
                  for hcls in self.context_handlers):
             yield '**options'
 
+
+class Keyword(object):
+    """The Keyword handler for Test Library instances.
+
+    * Provides inspection of Keyword name, arguments, and documentation.
+    * Instances get called by Test Libraries' ``.run_keyword()`` method.
+    """
+    def __init__(self, name, func, libinstance, template=None):
+        """Initialize with Keyword's display `name`,
+           the actual Keyword `func` and the Test Library instance.
+
+        - An optional :class:`KeywordTemplate` shared by
+          all instances of the Test Library class can be given.
+        """
+        self.name = name
+        self.func = func
+        self.libinstance = libinstance
+        if template is None:
+            template = KeywordTemplate(
+                name, func, libinstance.session_handlers)
+        self.context_handlers = template.context_handlers
+        # Precomputed stuff for choosing the call path
+        # - see self.__call__()
+        self._kwargs = template.kwargs
+        self._explicit_session_handlers = template.explicit_session_handlers
+        self._explicit_context_handlers = template.explicit_context_handlers
+        self._explicit_options = template.explicit_options
+        self._args = template.args
+
+    @property
+    def __doc__(self):
+        """The Keyword's documentation string,
+        taken from ``self.func.__doc__``.
+        """
+        doc = self.func.__doc__
+        if doc is None:
+            return None
+        if '\n' in doc:
+            first_line, rest = doc.split('\n', 1)
+            return "%s\n%s" % (first_line, dedent(rest))
+
+    @property
+    def libname(self):
+        """The Keyword's Test Library class name,
+        which also represents the Library's display name.
+        """
+        return type(self.libinstance).__name__
+
+    @property
+    def longname(self):
+        """The Keyword's full display name (**TestLibraryName.Keyword Name**).
+        """
+        return '%s.%s' % (self.libname, self.name)
+
+    def args(self):
+        """Get the Keyword's argument spec in Robot's Dynamic API style,
+           usable by Test Libraries' ``.get_keyword_arguments()`` method.
+
+        - Returns the tuple precomputed by :class:`KeywordTemplate`.
+        """
+        return self._args
+
     def __call__(self, *args, **kwargs):
         """Call the Keyword's actual function with the given arguments.
+
+        - Only takes the full path with explicit session and context
+          switching if any <session>= or <context>= option is given.
+        """
+        if kwargs and self._explicit_options \
+           and not self._explicit_options.isdisjoint(kwargs):
+            return self._call_explicit(args, kwargs)
+
+        return self._call(args, kwargs)
+
+    def _call(self, args, kwargs):
+        """Call the Keyword's actual function (or the implementation
+           for the currently active context) with the given `args` tuple
+           and `kwargs` dict.
         """
         func = self.func
+        # Look for arg type specs:
+        # (compiled to an .argtypes.ArgTypes pipeline by the decorator)
+        if func.argtypes:
+            args = func.argtypes.convert(args)
+        # Look for context specific implementation of the Keyword function
+        if func.contexts:
+            for context, context_func in dictitems(func.contexts):
+                if context in self.libinstance.contexts:
+                    func = context_func
+        # Does the keyword support **kwargs?
+        if self._kwargs or not kwargs:
+            return func(self.libinstance, *args, **kwargs)
+
+        argnames = self.func.argspec.args
+        # resolve **kwargs to positional args...
+        posargs = []
+        # (argspec.args start index includes self)
+        for name in argnames[1 + len(args):]:
+            if name in kwargs:
+                posargs.append(kwargs.pop(name))
+        # and turn the rest into *varargs in 'key=value' style
+        varargs = ['%s=%s' % (key, kwargs.pop(key))
+                   for key in list(kwargs) if key not in argnames]
+        return func(self.libinstance, *chain(args, posargs, varargs),
+                    # if **kwargs left ==> TypeError from Python
+                    **kwargs)
+
+    def _call_explicit(self, args, kwargs):
+        """Call the Keyword with explicit <session>= and <context>=
+           switching options in `kwargs`,
+           and switch back to the previous sessions and contexts afterwards.
+        """
         # the exception to finally reraise (if any)
         error = None
         # look for explicit <session>= and <context>= switching options
@@ -139,11 +237,8 @@ class Keyword(object):
         # session aliases and context names
         # for switching back after the Keyword call:
         current_sessions = {}
-        for _, hcls in self.libinstance.session_handlers:
-            if not hcls.meta.auto_explicit:
-                continue
+        for hcls in self._explicit_session_handlers:
             identifier = hcls.meta.identifier_name
-            plural_identifier = hcls.meta.plural_identifier_name
             try:
                 sname = kwargs.pop(identifier)
             except KeyError:
@@ -157,14 +252,12 @@ class Keyword(object):
                 # don't switch any more sessions
                 break
             # store previous session for switching back later
-            current_sessions[identifier, plural_identifier] = previous
+            current_sessions[hcls] = previous
         # only perform explicit context switching
         # if explicit session switching didn't raise any error
         current_contexts = {}
         if error is None:
-            for hcls in self.context_handlers:
-                if not getattr(hcls, 'auto_explicit', False):
-                    continue
+            for hcls in self._explicit_context_handlers:
                 identifier = hcls.__name__.lower()
                 try:
                     ctxname = kwargs.pop(identifier)
@@ -183,58 +276,24 @@ class Keyword(object):
         # only call the acutal keyword func
         # if explicit session and context switching didn't raise any error
         if error is None:
-            # Look for arg type specs:
-            if func.argtypes:
-                casted = []
-                for arg, argtype in zip(args, func.argtypes):
-                    if not isinstance(arg, argtype):
-                        arg = argtype(arg)
-                    casted.append(arg)
-                args = tuple(casted) + args[len(func.argtypes):]
-            # Look for context specific implementation of the Keyword function
-            for context, context_func in dictitems(func.contexts):
-                if context in self.libinstance.contexts:
-                    func = context_func
-            # Does the keyword support **kwargs?
-            if self.func.argspec.keywords or not kwargs:
-                try:
-                    result = func(self.libinstance, *args, **kwargs)
-                except Exception:
-                    error = sys.exc_info()
-            else:
-                # resolve **kwargs to positional args...
-                posargs = []
-                # (argspec.args start index includes self)
-                for name in self.func.argspec.args[1 + len(args):]:
-                    if name in kwargs:
-                        posargs.append(kwargs.pop(name))
-                # and turn the rest into *varargs in 'key=value' style
-                varargs = ['%s=%s' % (key, kwargs.pop(key))
-                           for key in list(kwargs)
-                           if key not in self.func.argspec.args]
-                try:
-                    result = func(self.libinstance,
-                                  *chain(args, posargs, varargs),
-                                  # if **kwargs left ==> TypeError from Python
-                                  **kwargs)
-                except:
-                    error = sys.exc_info()
+            try:
+                result = self._call(args, kwargs)
+            except:
+                error = sys.exc_info()
         # finally try to switch back contexts and sessions (in reverse order)
         # before either returning result or reraising any error catched above
         for identifier, ctxname in dictitems(current_contexts):
             switch = getattr(self.libinstance, 'switch_' + identifier)
             # don't catch anything here. just step out on error
             switch(ctxname)
-        for (identifier, plural_identifier), session in dictitems(
-                current_sessions
-        ):
-            for sname, sinstance in dictitems(getattr(
-                    self.libinstance, plural_identifier
-            )):
-                if sinstance is session:
-                    switch = getattr(self.libinstance, 'switch_' + identifier)
-                    # don't catch anything here. just step out on error
-                    switch(sname)
+        for hcls, session in dictitems(current_sessions):
+            # (only named sessions can be switched back to)
+            sname = hcls.registry_for(self.libinstance).name_of(session)
+            if sname is not None:
+                switch = getattr(self.libinstance,
+                                 'switch_' + hcls.meta.identifier_name)
+                # don't catch anything here. just step out on error
+                switch(sname)
         # was an error catched on initial session or context switching
         # or on calling the actual keyword func?
         if error is not None:
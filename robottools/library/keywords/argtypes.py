@@ -0,0 +1,129 @@
+# robotframework-tools
+#
+# Python Tools for Robot Framework and Test Libraries.
+#
+# Copyright (C) 2013-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# robotframework-tools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# robotframework-tools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with robotframework-tools. If not, see <http://www.gnu.org/licenses/>.
+
+"""robottools.library.keywords.argtypes
+
+Keyword argument type conversion for testlibrary's
+``@keyword[argtype, ...]`` decorator.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+__all__ = ['ArgTypes', 'memoized', 'batch']
+
+from .utils import lru_cache
+
+
+def converter(argtype):
+    """Get the converter function for a single `argtype`.
+
+    - Arguments which already are `argtype` instances are not converted.
+    - :class:`memoized` and :class:`batch` argtypes
+      provide their own converters.
+    """
+    if isinstance(argtype, (memoized, batch)):
+        return argtype.convert
+
+    def convert(arg):
+        if isinstance(arg, argtype):
+            return arg
+        return argtype(arg)
+
+    return convert
+
+
+class memoized(object):
+    """Marks an `argtype` as pure conversion with immutable results,
+       like ``int`` or :class:`robottools.RobotBool`,
+       whose results get cached for repeated equal arguments.
+
+    - Holds at most `maxsize` results.
+    - Unhashable arguments are converted without cache::
+
+       keyword = TestLibrary.keyword[memoized(int), memoized(RobotBool)]
+
+       @keyword
+       def some_keyword(self, number, flag):
+           ...
+    """
+    def __init__(self, argtype, maxsize=1024):
+        self.argtype = argtype
+        convert = self._convert = converter(argtype)
+        # (include the argument type in the cache key,
+        #  because equal arguments of different types
+        #  can give different results, like 1 and '1')
+        self._cached = lru_cache(maxsize=maxsize)(
+            lambda key: convert(key[1]))
+
+    def convert(self, arg):
+        try:
+            return self._cached((type(arg), arg))
+        except TypeError: # ==> unhashable
+            return self._convert(arg)
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, repr(self.argtype))
+
+
+class batch(object):
+    """Marks a list-typed argument,
+       whose items all get converted to `argtype` in one pass.
+
+    - `argtype` can also be :class:`memoized`::
+
+       keyword = TestLibrary.keyword[batch(memoized(int))]
+
+       @keyword
+       def some_keyword(self, numbers):
+           ...
+    """
+    def __init__(self, argtype):
+        self.argtype = argtype
+        self._convert = converter(argtype)
+
+    def convert(self, arg):
+        convert = self._convert
+        return [convert(item) for item in arg]
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, repr(self.argtype))
+
+
+class ArgTypes(tuple):
+    """The tuple of explicit argtypes of a Keyword,
+       compiled once to a pipeline of converter functions.
+
+    - A single (non-tuple) `argtypes` value is taken as one argtype.
+    """
+    def __new__(cls, argtypes):
+        if not isinstance(argtypes, (tuple, list)):
+            argtypes = (argtypes, )
+        self = tuple.__new__(cls, argtypes)
+        self.converters = [converter(argtype) for argtype in self]
+        return self
+
+    def convert(self, args):
+        """Convert the positional Keyword `args`.
+
+        - Additional args without explicit argtypes are left unchanged.
+        """
+        converted = tuple(convert(arg) for convert, arg in zip(
+            self.converters, args))
+        if len(args) > len(converted):
+            return converted + tuple(args[len(converted):])
+        return converted
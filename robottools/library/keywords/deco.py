@@ -42,6 +42,7 @@ from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
 from robottools.utils import normdictdata
 
 from .utils import KeywordName
+from .argtypes import ArgTypes
 from .errors import InvalidKeywordOption, KeywordNotDefined
 
 
@@ -242,9 +243,11 @@ class KeywordDecoratorType(object):
         func.__doc__ = doc
         # # Store original method argspec
         # func.argspec = argspec
-        # Store optional override args list and explicit argtypes
+        # Store optional override args list
+        # and explicit argtypes compiled to a converter pipeline
         func.args = args or self.keyword_args
-        func.argtypes = argtypes or self.keyword_argtypes
+        argtypes = argtypes or self.keyword_argtypes
+        func.argtypes = argtypes and ArgTypes(argtypes)
         # Add method to the Library's Keywords mapping
         if contexts:
             try:
@@ -27,11 +27,51 @@ from six import PY3
 
 __all__ = ['KeywordName', 'KeywordsDict']
 
+from collections import OrderedDict
+from threading import Lock
+try:
+    from functools import lru_cache
+except ImportError: # PY2
+    lru_cache = None
+
 from moretools import simpledict, camelize
 
 from robot.utils import normalize
 
 
+if lru_cache is None: # PY2
+    def lru_cache(maxsize=128):
+        """Minimal replacement for PY3's :func:`functools.lru_cache`,
+           only supporting functions with a single hashable argument.
+
+        - Drops the oldest entries instead of the least recently used,
+          so cache hits are plain dict lookups without locking.
+        """
+        def decorator(func):
+            cache = OrderedDict()
+            # for changing the cache, which is shared by all threads
+            lock = Lock()
+
+            def wrapper(arg):
+                try:
+                    return cache[arg]
+                except KeyError:
+                    pass
+                result = func(arg)
+                with lock:
+                    if arg not in cache:
+                        if len(cache) >= maxsize:
+                            cache.popitem(last=False)
+                        cache[arg] = result
+                return result
+
+            wrapper.__name__ = func.__name__
+            wrapper.__doc__ = func.__doc__
+            return wrapper
+
+        return decorator
+
+
 class KeywordName(str):
     """:class:`str` wrapper to work with Keyword names in a Robot way.
 
@@ -39,36 +79,81 @@ class KeywordName(str):
       to Capitalized Robot Style.
     * Uses :func:`robot.utils.normalize`d conversions
       (plain lowercase without spaces and underscores)
-      for comparing and hashing.
+      for comparing and hashing,
+      which are computed once and stored in :attr:`.normalized`.
     """
+    # PY2 doesn't support non-empty __slots__ for str subclasses
+    if PY3:
+        __slots__ = ['normalized']
+
     def __new__(cls, name='', convert=True):
         if convert and type(name) is not KeywordName:
             name = camelize(name, joiner=' ')
-        return str.__new__(cls, name)
-
-    @property
-    def normalized(self):
-        return normalize(str(self), ignore='_')
+        self = str.__new__(cls, name)
+        self.normalized = normalize(str(self), ignore='_')
+        return self
 
     def __eq__(self, name):
+        if type(name) is KeywordName:
+            return self.normalized == name.normalized
         return self.normalized == normalize(name, ignore='_')
 
+    def __ne__(self, name):
+        return not self == name
+
     def __hash__(self):
         return hash(self.normalized)
 
+    def __getnewargs__(self):
+        # for pickling and copying without re-camelizing
+        return (str(self), False)
+
 
 class KeywordsDict(object):
     """Store Keyword functions or :class:`robottools.Keyword` instances
     with :class:`robottools.KeywordName` keys.
     """
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _normalize(name):
+        """Get the normalized form of a raw Keyword `name`.
+
+        - Shared by all :class:`KeywordsDict` instances,
+          so names repeatedly sent by Robot skip the actual normalization.
+        """
+        return normalize(name, ignore='_')
+
     def __init__(self):
+        # keyed by the plain normalized names,
+        # so lookups don't need KeywordName.__eq__
         self._dict = {}
+        # to look up the original KeywordName keys
+        self._names = {}
+
+    def _key(self, name):
+        if type(name) is KeywordName:
+            return name.normalized
+        return self._normalize(name)
 
     def __setitem__(self, name, keyword):
-        self._dict[KeywordName(name)] = keyword
+        if type(name) is not KeywordName:
+            name = KeywordName(name)
+        self._dict[name.normalized] = keyword
+        self._names[name.normalized] = name
 
     def __getitem__(self, name):
-        return self._dict[normalize(name, ignore='_')]
+        return self._dict[self._key(name)]
+
+    def item(self, name):
+        """Get a ``(KeywordName, keyword)`` pair by any Keyword `name`.
+        """
+        key = self._key(name)
+        return self._names[key], self._dict[key]
+
+    def names(self):
+        """Iterate the :class:`robottools.KeywordName` keys.
+        """
+        return iter(self._names.values())
 
     def __getattr__(self, name):
         try:
@@ -77,7 +162,8 @@ class KeywordsDict(object):
             raise AttributeError(name)
 
     def __iter__(self):
-        return iter(self._dict.items())
+        names = self._names
+        return ((names[key], keyword) for key, keyword in self._dict.items())
 
     def __len__(self):
         return len(self._dict)
@@ -92,4 +178,4 @@ class KeywordsDict(object):
         """The Keyword names in CamelCase
         to be used with :meth:`self.__getattr__`.
         """
-        return [''.join(name.split()) for name in self._dict]
+        return [''.join(name.split()) for name in self.names()]
@@ -23,72 +23,72 @@ testlibrary()'s session handler framework.
 
 .. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
 """
-__all__ = ['SessionHandler']
+__all__ = ['SessionHandler', 'SessionRegistry']
 
-from six import with_metaclass
+from warnings import warn
 
-from moretools import dictitems
+from six import with_metaclass
 
 from .meta import SessionHandlerMeta
+from .registry import SessionRegistry
 
 
 class SessionHandler(with_metaclass(SessionHandlerMeta, object)):
     """The base class for custom Robot Test Library session handler types.
+
+    - The helper class methods work on the session registry
+      of the given `libinstance` (see :meth:`.registry_for`),
+      which is also used by the generated Keywords.
+      Without a `libinstance` they work on the handler's shared default
+      :class:`.SessionRegistry` (:attr:`.registry`),
+      which is deprecated, because the Keywords don't see those sessions.
     """
 
     @classmethod
-    def add_session(cls, session):
+    def _helper_registry(cls, libinstance):
+        """Get the registry a helper method works on.
+
+        - Warns if no `libinstance` is given.
+        """
+        if libinstance is None:
+            warn("%s helper methods without a libinstance= argument "
+                 "only work on the shared default registry, "
+                 "which is not used by the session Keywords "
+                 "of Test Library instances" % cls.__name__,
+                 DeprecationWarning, stacklevel=3)
+        return cls.registry_for(libinstance)
+
+    @classmethod
+    def add_session(cls, session, libinstance=None):
         """Helper method for adding an unnamed session to the handler
            and making it active.
 
         - Automatically closes already running unnamed sessions.
         """
-        cls.session = session
+        cls._helper_registry(libinstance).add_session(session)
 
     @classmethod
-    def add_named_session(cls, name, session):
+    def add_named_session(cls, name, session, libinstance=None):
         """Helper method for adding a named session to the handler
            and making it active.
 
         - Automatically closes running unnamed sessions.
         """
-        name = str(name)
-        cls.session = cls.sessions[name] = session
+        cls._helper_registry(libinstance).add_named_session(name, session)
 
     @classmethod
-    def switch_session(cls, name):
+    def switch_session(cls, name, libinstance=None):
         """Helper method for switching the currently active session.
 
         - Automatically closes running unnamed sessions.
         """
-        name = str(name)
-        try:
-            session = cls.sessions[name]
-        except KeyError:
-            raise cls.SessionError('Session not found: %s' % repr(name))
-        return session
+        return cls._helper_registry(libinstance).get_session(name)
 
     @classmethod
-    def close_session(cls, name=None):
+    def close_session(cls, name=None, libinstance=None):
         """Helper method for closing the currently active session.
         """
-        if name:
-            try:
-                session = cls.sessions.pop(name)
-            except KeyError:
-                raise cls.SessionError('Session not found: %s' % repr(name))
-            if session is cls.session:
-                cls.session = None
-            return session
-
-        if cls.session is None:
-            raise cls.SessionError('No active session.')
-        for name, session in list(dictitems(cls.sessions)):
-            if session is cls.session:
-                del cls.sessions[name]
-        session = cls.session
-        cls.session = None
-        return session
+        return cls._helper_registry(libinstance).close_session(name)
 
 
 # For backwards compatibility:
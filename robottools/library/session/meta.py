@@ -27,12 +27,40 @@ __all__ = ['SessionHandlerMeta']
 
 import inspect
 import re
+import sys
 from copy import deepcopy
+from functools import partial
+from multiprocessing.pool import ThreadPool
 
+from six import reraise
 from moretools import qualname, dictitems
 
 from robottools.library.keywords import KeywordsDict
 from .metaoptions import Meta
+from .registry import SessionRegistry
+
+
+def call_opener(func, libinstance, args, kwargs):
+    """Call a user-defined session opener `func`
+       with given `libinstance` and `args` and `kwargs`.
+
+    - If `func` returns a coroutine (like ``async def`` openers),
+      it gets run to completion in a new event loop.
+      So it also works in threads without an event loop.
+    """
+    session = func(libinstance, *args, **kwargs)
+    # (asyncio is only imported if needed, because it's expensive)
+    asyncio = sys.modules.get('asyncio')
+    if asyncio is None and getattr(
+            inspect, 'iscoroutine', lambda obj: False)(session):
+        import asyncio
+    if asyncio is not None and asyncio.iscoroutine(session):
+        loop = asyncio.new_event_loop()
+        try:
+            session = loop.run_until_complete(session)
+        finally:
+            loop.close()
+    return session
 
 
 class SessionHandlerMeta(type):
@@ -43,6 +71,9 @@ class SessionHandlerMeta(type):
       (using :class:`.meta.Meta`),
       the session storage, the actual Robot Keywords for session management,
       and a session exception type.
+    - The generated Keywords store the sessions
+      in a :class:`.registry.SessionRegistry`
+      per Test Library instance (see :meth:`.registry_for`).
     """
     def __new__(mcs, clsname, bases, clsattrs):
         """Generate meta information, session exception type,
@@ -63,24 +94,105 @@ class SessionHandlerMeta(type):
         excname = meta.upper_identifier_name + 'Error'
         clsattrs['SessionError'] = type(excname, (RuntimeError, ), {})
 
-        # The handler's dictionary of opened sessions
-        clsattrs['sessions'] = {}
-        # The handler's currently active session
-        clsattrs['session'] = None
-
         # For storing the handler's session management Keywords
         clsattrs['keywords'] = KeywordsDict()
 
-        return type.__new__(mcs, clsname, bases, clsattrs)
+        cls = type.__new__(mcs, clsname, bases, clsattrs)
+        # The handler's default session storage
+        # for use without a Test Library instance
+        cls.registry = SessionRegistry(cls)
+        return cls
+
+    @property
+    def sessions(cls):
+        """The dictionary of opened named sessions
+           in the handler's default :attr:`.registry`.
+        """
+        return cls.registry.sessions
+
+    @sessions.setter
+    def sessions(cls, sessions):
+        cls.registry.replace_sessions(sessions)
+
+    @property
+    def session(cls):
+        """The currently active session
+           in the handler's default :attr:`.registry`.
+        """
+        return cls.registry.session
+
+    @session.setter
+    def session(cls, session):
+        cls.registry.activate(session)
+
+    def registry_for(cls, libinstance):
+        """Get the :class:`.registry.SessionRegistry`
+           of the given Test Library instance for this handler.
+
+        - Falls back to the handler's default :attr:`.registry`
+          if `libinstance` is not a Test Library instance using this handler.
+        """
+        try:
+            return libinstance.session_registries[cls.__name__]
+        except (AttributeError, KeyError):
+            return cls.registry
+
+    def open_session_object(cls, libinstance, func, args, kwargs,
+                            check_func=None, close_func=None):
+        """Open a new session by calling the user-defined opener `func`
+           or get an idle one opened with the same arguments from the pool
+           of the `libinstance`'s registry (see :meth:`.registry_for`).
+
+        - Idle sessions are checked with an optional `check_func`
+          and closed with `close_func` if not usable anymore.
+        """
+        pool = cls.registry_for(libinstance).pool
+        if pool is None:
+            return call_opener(func, libinstance, args, kwargs)
+
+        key = pool.key(func, args, kwargs)
+        session = pool.acquire(
+            key, check=check_func and partial(check_func, libinstance),
+            close=close_func and partial(close_func, libinstance))
+        if session is None:
+            session = call_opener(func, libinstance, args, kwargs)
+            pool.register(session, key)
+        return session
+
+    def close_session_object(cls, libinstance, session, close_func=None):
+        """Close the given `session` object with the user-defined `close_func`
+           or park it in the pool of the `libinstance`'s registry
+           (see :meth:`.registry_for`).
+        """
+        close = close_func and partial(close_func, libinstance)
+        pool = cls.registry_for(libinstance).pool
+        if pool is not None:
+            pool.park(session, close=close)
+        elif close is not None:
+            close(session)
+
+    def close_idle_session_objects(cls, libinstance, close_func=None):
+        """Close all idle sessions in the pool of the `libinstance`'s
+           registry (see :meth:`.registry_for`)
+           with the user-defined `close_func`.
+        """
+        pool = cls.registry_for(libinstance).pool
+        if pool is not None:
+            pool.clear(close=close_func and partial(close_func, libinstance))
 
     #TODO: (cls, name, func) ?
-    def add_opener(cls, func, close_func=None):
+    def add_opener(cls, func, close_func=None, check_func=None):
         """Add Keywords for opening (un)named sessions
            for a user-defined session opener method `func`
            (methods whose names start with 'open').
 
         - Optional `close_func` will be called on active unnamed sessions
           when opening new sessions.
+        - Optional `check_func` will be called on idle pooled sessions
+          before reusing them (see :meth:`.open_session_object`).
+        - Also adds a Keyword for opening multiple named sessions
+          in parallel threads.
+        - `func` can also be a coroutine function (``async def``).
         """
         suffix = re.sub('^open($|_)', '', func.__name__)
         keywordname = 'open%s_' + cls.meta.identifier_name
@@ -94,16 +206,12 @@ class SessionHandlerMeta(type):
             This keyword automatically closes
             any other currently active unnamed {singular}.
             """
-            previous = cls.session
-            active = func(self, *args, **kwargs)
-            cls.add_session(active)
-            if previous is not None and close_func:
+            active = cls.open_session_object(
+                self, func, args, kwargs, check_func, close_func)
+            previous = cls.registry_for(self).add_session(active)
+            if previous is not None:
                 # explicitly close previously active session if unnamed
-                for name, session in dictitems(cls.sessions):
-                    if session is previous:
-                        break
-                else:
-                    close_func(self, previous)
+                cls.close_session_object(self, previous, close_func)
 
         open_session.__doc__ = open_session.__doc__.format(
             singular=cls.meta.verbose_name)  # , cls.meta.plural_verbose_name)
@@ -132,16 +240,12 @@ class SessionHandlerMeta(type):
             This keyword also automatically closes
             a currently active unnamed {singular}.
             """
-            previous = cls.session
-            active = func(self, *args, **kwargs)
-            cls.add_named_session(name, active)
-            if previous is not None and close_func:
+            active = cls.open_session_object(
+                self, func, args, kwargs, check_func, close_func)
+            previous = cls.registry_for(self).add_named_session(name, active)
+            if previous is not None:
                 # explicitly close previously active session if unnamed
-                for name, session in cls.sessions.items():
-                    if session is previous:
-                        break
-                else:
-                    close_func(self, previous)
+                cls.close_session_object(self, previous, close_func)
 
         open_named_session.__doc__ = open_named_session.__doc__.format(
             singular=cls.meta.verbose_name,
@@ -152,6 +256,63 @@ class SessionHandlerMeta(type):
         open_named_session.argspec = named_argspec
         cls.keywords[keywordname % '_named'] = open_named_session
 
+        def open_named_sessions(self, *sessions):
+            """Open multiple {plural} at the same time.
+
+            Every argument is a list of an alias ``name``
+            and the further arguments for `Open Named {singular}`:
+
+            ``Open Named {plural} | ${{first}} | ${{second}} | ...``
+
+            The {plural} are opened in a limited number of parallel threads
+            and registered in the given order,
+            so the last one is active afterwards.
+            If any opening fails,
+            the successfully opened {plural} are still registered
+            before the first error is raised.
+            """
+            sessions = [(session[0], list(session[1:]))
+                        for session in sessions]
+            if not sessions:
+                return
+
+            def open_one(name_args):
+                try:
+                    return cls.open_session_object(
+                        self, func, name_args[1], {},
+                        check_func, close_func), None
+                except Exception:
+                    return None, sys.exc_info()
+
+            pool = ThreadPool(min(len(sessions), cls.meta.open_workers))
+            try:
+                results = pool.map(open_one, sessions)
+            finally:
+                pool.close()
+                pool.join()
+
+            registry = cls.registry_for(self)
+            error = None
+            for (name, _), (active, exc_info) in zip(sessions, results):
+                if exc_info is not None:
+                    error = error or exc_info
+                    continue
+                previous = registry.add_named_session(name, active)
+                if previous is not None:
+                    # explicitly close previously active session if unnamed
+                    cls.close_session_object(self, previous, close_func)
+            if error is not None:
+                reraise(*error)
+
+        open_named_sessions.__doc__ = open_named_sessions.__doc__.format(
+            singular=cls.meta.verbose_name,
+            plural=cls.meta.plural_verbose_name)
+
+        keywordname = 'open_named_' + cls.meta.plural_identifier_name
+        if suffix:
+            keywordname += '_' + suffix
+        cls.keywords[keywordname] = open_named_sessions
+
     def __init__(cls, clsname, bases, clsattrs):
         """Generate the actual session management keywords
            for :class:`Handler` derived classes.
@@ -159,8 +320,10 @@ class SessionHandlerMeta(type):
         - Includes the session management helper methods of :class:`Handler`
           and user-defined session opener methods
           (whose names start with 'open').
-        - Looks for optional custom session switch/close hook methods
-          named 'switch'/'close'
+        - Looks for optional custom session switch/close/check hook methods
+          named 'switch'/'close'/'check'
+        - With ``pool = True`` in the `meta` options, also generates
+          a Keyword for closing the idle pooled sessions.
         - All Keyword names include the handler-specific
           `meta.identifier_name`.
         """
@@ -170,7 +333,7 @@ class SessionHandlerMeta(type):
             return
 
         open_funcs = []
-        switch_func = close_func = None
+        switch_func = close_func = check_func = None
         for name, func in dictitems(clsattrs):
             if name.startswith('open'):
                 open_funcs.append(func)
@@ -178,25 +341,25 @@ class SessionHandlerMeta(type):
                 switch_func = func
             elif name == 'close':
                 close_func = func
+            elif name == 'check':
+                check_func = func
         for func in open_funcs:
-            cls.add_opener(func, close_func=close_func)
+            cls.add_opener(
+                func, close_func=close_func, check_func=check_func)
 
         def switch_session(self, name):
-            previous = cls.session
-            active = cls.switch_session(name)
-            if previous is not None and close_func:
-                # explicitly close previously active session if unnamed
-                for name, session in dictitems(cls.sessions):
-                    if session is previous:
-                        break
-                else:
-                    try:
-                        close_func(self, previous)
-                    except Exception as exc:
-                        raise cls.SessionError(
-                            "Couldn't close unnamed session "
-                            "on switching to %s (%s: %s)"
-                            % (repr(name), qualname(type(exc)), exc))
+            registry = cls.registry_for(self)
+            previous_name, previous = registry.active
+            active = registry.get_session(name)
+            # explicitly close previously active session if unnamed
+            if previous is not None and previous_name is None:
+                try:
+                    cls.close_session_object(self, previous, close_func)
+                except Exception as exc:
+                    raise cls.SessionError(
+                        "Couldn't close unnamed session "
+                        "on switching to %s (%s: %s)"
+                        % (repr(name), qualname(type(exc)), exc))
             if switch_func:
                 try:
                     switch_func(self, active)
@@ -204,15 +367,34 @@ class SessionHandlerMeta(type):
                     raise cls.SessionError(
                         "Couldn't switch session to %s (%s: %s)"
                         % (repr(name), qualname(type(exc)), exc))
-            cls.session = active
+            registry.active = (str(name), active)
 
         keywordname = 'switch_' + meta.identifier_name
         cls.keywords[keywordname] = switch_session
 
         def close_session(self, name=None):
-            session = cls.close_session(name)
-            if close_func:
-                close_func(self, session)
+            session = cls.registry_for(self).close_session(name)
+            cls.close_session_object(self, session, close_func)
 
         keywordname = 'close_' + meta.identifier_name
         cls.keywords[keywordname] = close_session
+
+        if not meta.pool:
+            return
+
+        def close_idle_sessions(self):
+            """Close all idle pooled {plural}.
+
+            Closed {plural} are kept open for reuse
+            by `Open {singular}` with the same arguments.
+            Use this keyword to really close them,
+            for example in a suite teardown.
+            """
+            cls.close_idle_session_objects(self, close_func)
+
+        close_idle_sessions.__doc__ = close_idle_sessions.__doc__.format(
+            singular=cls.meta.verbose_name,
+            plural=cls.meta.plural_verbose_name)
+
+        keywordname = 'close_idle_' + meta.plural_identifier_name
+        cls.keywords[keywordname] = close_idle_sessions
@@ -46,6 +46,14 @@ class Meta(object):
           and/or explicit name variants.
         """
         self.auto_explicit = bool(getattr(options, 'auto_explicit', False))
+        self.thread_local_session = bool(
+            getattr(options, 'thread_local_session', False))
+        # idle session pool options
+        self.pool = bool(getattr(options, 'pool', False))
+        self.pool_size = int(getattr(options, 'pool_size', 10))
+        self.pool_ttl = getattr(options, 'pool_ttl', None)
+        # max number of threads for opening multiple named sessions
+        self.open_workers = int(getattr(options, 'open_workers', 10))
 
         # Check all prefix definitions and generate actual prefix strings
         prefixes = {}
@@ -0,0 +1,186 @@
+# robotframework-tools
+#
+# Python Tools for Robot Framework and Test Libraries.
+#
+# Copyright (C) 2013-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# robotframework-tools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# robotframework-tools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with robotframework-tools. If not, see <http://www.gnu.org/licenses/>.
+
+"""robottools.library.session.pool
+
+Pooling of idle sessions for reuse by session opener Keywords.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+__all__ = ['SessionPool']
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from moretools import dictitems
+
+# PY2 has no monotonic clock
+clock = getattr(time, 'monotonic', time.time)
+
+
+class SessionPool(object):
+    """Storage of idle sessions, which are parked by closing them
+       and reused by opening new sessions with the same opener arguments.
+
+    - Enabled with ``pool = True`` in a session handler's ``Meta`` options.
+    - Holds at most `maxsize` idle sessions.
+      If more get parked, the longest idle ones are closed.
+    - Idle sessions older than `ttl` seconds are closed on next access.
+    - All given `close` callbacks actually close a session.
+      Optional `check` callbacks return ``False``
+      if an idle session isn't usable anymore.
+    - Idle sessions are only closed on access or with :meth:`.clear`,
+      which is called by the generated ``Close Idle ...`` Keywords
+      of pooled session handlers.
+    - Sessions are only weakly referenced while in use (if possible),
+      so sessions dropped without parking don't stay alive.
+    """
+    def __init__(self, maxsize=10, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lock = threading.RLock()
+        # id(session) -> (opener key, parking time, session)
+        # of the idle sessions in parking order
+        self._idle = OrderedDict()
+        # id(session) -> (session reference, opener key)
+        # of all (idle and used) sessions opened by pooled openers
+        self._keys = {}
+
+    def __len__(self):
+        return len(self._idle)
+
+    @staticmethod
+    def key(func, args, kwargs):
+        """Create the hashable pool key from an opener `func`
+           and its `args` and `kwargs`.
+
+        :returns: ``None`` if any argument isn't hashable.
+        """
+        key = (func.__name__, tuple(args), tuple(sorted(dictitems(kwargs))))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def register(self, session, key):
+        """Remember the opener `key` of a newly opened `session`,
+           which will be parked on :meth:`.park`.
+        """
+        if key is None:
+            return
+        sid = id(session)
+        try:
+            ref = weakref.ref(session, lambda ref: self._forget(sid, ref))
+        except TypeError:
+            # ==> session type doesn't support weak references
+            ref = lambda: session
+        with self.lock:
+            self._keys[sid] = (ref, key)
+
+    def acquire(self, key, check=None, close=None):
+        """Get an idle session opened with given opener `key`.
+
+        - Idle sessions failing the optional `check`
+          get closed and dropped.
+
+        :returns: ``None`` if there is no usable idle session.
+        """
+        if key is None:
+            return None
+        while True:
+            with self.lock:
+                dropped = self._expire()
+                for sid, (skey, _, session) in reversed(
+                        list(dictitems(self._idle))):
+                    if skey == key:
+                        del self._idle[sid]
+                        break
+                else:
+                    session = None
+            for other in dropped:
+                self._close(other, close)
+            if session is None or check is None or check(session):
+                return session
+            self._close(session, close)
+
+    def park(self, session, close=None):
+        """Park a `session` in the pool instead of closing it.
+
+        - Sessions not opened by a pooled opener are directly closed.
+        - Closes the sessions which exceeded the pool size or TTL.
+        """
+        with self.lock:
+            ref, key = self._keys.get(id(session), (None, None))
+            if ref is not None and ref() is session:
+                self._idle.pop(id(session), None)
+                self._idle[id(session)] = (key, clock(), session)
+                dropped = self._expire()
+                while len(self._idle) > self.maxsize:
+                    _, (_, _, oldest) = self._idle.popitem(last=False)
+                    dropped.append(oldest)
+            else:
+                dropped = [session]
+        for other in dropped:
+            self._close(other, close)
+
+    def clear(self, close=None):
+        """Close all idle sessions.
+        """
+        with self.lock:
+            dropped = [session for _, _, session in self._idle.values()]
+            self._idle.clear()
+        for session in dropped:
+            self._close(session, close)
+
+    def _expire(self):
+        """Remove the idle sessions which exceeded the TTL.
+
+        - Must be called with :attr:`.lock` acquired.
+
+        :returns: The list of removed sessions to close.
+        """
+        if self.ttl is None:
+            return []
+        deadline = clock() - self.ttl
+        expired = []
+        for sid, (_, parked, session) in list(dictitems(self._idle)):
+            if parked > deadline:
+                # ==> all following ones were parked later
+                break
+            del self._idle[sid]
+            expired.append(session)
+        return expired
+
+    def _forget(self, sid, ref):
+        """Remove the `_keys` entry of a garbage collected session.
+        """
+        with self.lock:
+            if self._keys.get(sid, (None, ))[0] is ref:
+                del self._keys[sid]
+
+    def _close(self, session, close=None):
+        """Forget the given `session` and call the `close` callback.
+        """
+        with self.lock:
+            self._keys.pop(id(session), None)
+        if close is not None:
+            close(session)
@@ -0,0 +1,212 @@
+# robotframework-tools
+#
+# Python Tools for Robot Framework and Test Libraries.
+#
+# Copyright (C) 2013-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# robotframework-tools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# robotframework-tools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with robotframework-tools. If not, see <http://www.gnu.org/licenses/>.
+
+"""robottools.library.session.registry
+
+Storage of the opened and active sessions of a session handler.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+__all__ = ['SessionRegistry']
+
+import threading
+
+from moretools import dictitems
+
+from .pool import SessionPool
+
+
+class SessionRegistry(object):
+    """The thread-safe storage of the named sessions
+       and the currently active session of a :class:`.SessionHandler`.
+
+    - Every Test Library instance has its own registry per session handler.
+    - With ``thread_local_session = True`` in the handler's ``Meta`` options,
+      every thread has its own active session pointer.
+      The named sessions are still shared by all threads.
+    - Keeps a reverse index from session objects to their aliases
+      for O(1) lookups with :meth:`.name_of`.
+      So :attr:`.sessions` should not be modified directly.
+    - With ``pool = True`` in the handler's ``Meta`` options,
+      it has a :class:`.pool.SessionPool` of idle sessions
+      as :attr:`.pool`.
+    """
+    def __init__(self, handlercls):
+        self.handlercls = handlercls
+        self.thread_local = handlercls.meta.thread_local_session
+        # the opened named sessions
+        self.sessions = {}
+        # id(session) -> [alias names] of the named sessions
+        # (session objects are not required to be hashable)
+        self._names = {}
+        self.lock = threading.RLock()
+        # the (name, session) pair of the active session
+        # (name is None for unnamed sessions)
+        self._active = (None, None)
+        self._local = threading.local()
+        meta = handlercls.meta
+        self.pool = None
+        if meta.pool:
+            self.pool = SessionPool(maxsize=meta.pool_size, ttl=meta.pool_ttl)
+
+    @property
+    def active(self):
+        """The ``(name, session)`` pair of the currently active session.
+
+        - `name` is ``None`` for unnamed sessions.
+        - Is ``(None, None)`` if there is no active session.
+        """
+        if self.thread_local:
+            active = getattr(self._local, 'active', (None, None))
+        else:
+            active = self._active
+        name, session = active
+        if name is not None and self.sessions.get(name) is not session:
+            # ==> was closed by another thread in the meantime
+            return (None, None)
+        return active
+
+    @active.setter
+    def active(self, name_session):
+        if self.thread_local:
+            self._local.active = name_session
+        else:
+            self._active = name_session
+
+    @property
+    def session(self):
+        """The currently active session or ``None``.
+        """
+        return self.active[1]
+
+    def add_session(self, session):
+        """Add an unnamed `session` and make it active.
+
+        :returns: The previously active session if it was unnamed
+                  (and should therefore be closed) or ``None``.
+        """
+        with self.lock:
+            name, previous = self.active
+            self.active = (None, session)
+        if name is None:
+            return previous
+
+    def add_named_session(self, name, session):
+        """Add a `session` with alias `name` and make it active.
+
+        :returns: The previously active session if it was unnamed
+                  (and should therefore be closed) or ``None``.
+        """
+        name = str(name)
+        with self.lock:
+            previous_name, previous = self.active
+            self._remove_name(name)
+            self.sessions[name] = session
+            self._names.setdefault(id(session), []).append(name)
+            self.active = (name, session)
+        if previous_name is None:
+            return previous
+
+    def _remove_name(self, name):
+        """Remove the named session with alias `name` (if existing)
+           and its reverse index entry.
+
+        :returns: The removed session or ``None``.
+        """
+        session = self.sessions.pop(name, None)
+        if session is not None:
+            names = self._names[id(session)]
+            names.remove(name)
+            if not names:
+                del self._names[id(session)]
+        return session
+
+    def name_of(self, session):
+        """Get an alias name of the given `session` object.
+
+        :returns: ``None`` if `session` is unnamed.
+        """
+        names = self._names.get(id(session))
+        if names:
+            return names[0]
+
+    def replace_sessions(self, sessions):
+        """Replace all named sessions with the given
+           ``{name: session}`` mapping.
+
+        - Keeps the active session pointer,
+          which becomes unnamed if its alias is gone.
+        """
+        with self.lock:
+            self.sessions = {}
+            self._names = {}
+            for name, session in dictitems(dict(sessions)):
+                name = str(name)
+                self.sessions[name] = session
+                self._names.setdefault(id(session), []).append(name)
+            if self.thread_local:
+                _, session = getattr(self._local, 'active', (None, None))
+            else:
+                _, session = self._active
+            self.active = (self.name_of(session), session)
+
+    def activate(self, session):
+        """Make the given `session` object active
+           (or none with ``None``).
+        """
+        with self.lock:
+            if session is None:
+                self.active = (None, None)
+            else:
+                self.active = (self.name_of(session), session)
+
+    def get_session(self, name):
+        """Get the named session with alias `name`.
+        """
+        name = str(name)
+        try:
+            return self.sessions[name]
+        except KeyError:
+            raise self.handlercls.SessionError(
+                'Session not found: %s' % repr(name))
+
+    def close_session(self, name=None):
+        """Remove the named session with alias `name`
+           or the currently active session.
+
+        :returns: The removed session.
+        """
+        with self.lock:
+            if name:
+                name = str(name)
+                session = self._remove_name(name)
+                if session is None:
+                    raise self.handlercls.SessionError(
+                        'Session not found: %s' % repr(name))
+                if self.active[1] is session:
+                    self.active = (None, None)
+                return session
+
+            session = self.session
+            if session is None:
+                raise self.handlercls.SessionError('No active session.')
+            for name in list(self._names.get(id(session), ())):
+                self._remove_name(name)
+            self.active = (None, None)
+            return session
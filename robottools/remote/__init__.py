@@ -30,13 +30,29 @@ from robottools import __version__, __requires__, __extras__
 __requires__ += __extras__['remote'].checked
 del __extras__
 
+import sys
+import threading
+from multiprocessing.pool import ThreadPool
 
+import robotremoteserver
 from robotremoteserver import RobotRemoteServer
+from six.moves.xmlrpc_server import SimpleXMLRPCServer
 
 from robottools import TestRobot, TestLibraryInspector, testlibrary
 from robottools.testrobot import Keyword
 
+from robottools.testrobot.streams import ThreadLocalStream
+
 from .library import RemoteLibrary
+from .transport import RemoteRequestHandler, transport_options
+
+
+# RemoteRobot extends the XML-RPC server of robotremoteserver 1.0.x,
+# whose RobotRemoteServer directly is the SimpleXMLRPCServer.
+# Since 1.1, it only wraps a separate server instance,
+# so the process_request(), finish_request() and _register_functions()
+# overrides below would not be used anymore:
+LEGACY_SERVER = issubclass(RobotRemoteServer, SimpleXMLRPCServer)
 
 
 # Additional base for RemoteRobot, to handle its own Keywords:
@@ -53,11 +69,15 @@ class RemoteRobot(TestRobot, RobotRemoteServer, TestLibrary):
 
     - Can handle multiple Test Libraries.
     - Usable with Robot Framework's standard 'Remote' Library.
+    - Can serve multiple clients in parallel with a pool of `workers`.
+    - Supports the opt-in compact transport
+      of :mod:`robottools.remote.transport`.
     """
     def __init__(
       self, libraries, host='127.0.0.1', port=8270, port_file=None,
       allow_stop=True, allow_import=None,
       register_keywords=True, introspection=True,
+      workers=None, locked_libraries=None,
       ):
         """Takes a sequence of Test Library names to import,
            RobotRemoteServer's additional __init__ options
@@ -69,24 +89,154 @@ class RemoteRobot(TestRobot, RobotRemoteServer, TestLibrary):
           directly as remote methods besides Dynamic Robot API methods?
         :param introspection: Call
           SimpleXMLRPCServer.register_introspection_functions()?
+        :param workers: Number of threads for handling requests in parallel.
+          By default, requests are handled one after another.
+        :param locked_libraries: Sequence of Test Library names,
+          whose Keywords are never run in parallel with workers.
+          Libraries can also declare this themselves
+          with ``ROBOT_LIBRARY_THREAD_SAFE = False``.
         """
         TestRobot.__init__(self, name='Remote', BuiltIn=False)
         TestLibrary.__init__(self)
         self.register_keywords = bool(register_keywords)
         self.introspection = bool(introspection)
+        self.workers = workers and int(workers)
+        self.locked_libraries = set(locked_libraries or [])
+        # the .library.RemoteLibrary proxy with the Keyword metadata cache
+        # - created after importing the initial `libraries`
+        self._library = None
+        # the locks of libraries which are not thread-safe
+        # - see self._library_lock()
+        self._library_locks = {}
+        self._library_locks_lock = threading.Lock()
         for lib in libraries:
             self.Import(lib)
         self.allow_import = list(allow_import or [])
-        # Initialize the RobotRemoteServer base
-        # with a .library.RemoteLibrary proxy
-        # (RobotRemoteServer only accepts a single library instance)
-        RobotRemoteServer.__init__(
-          self, RemoteLibrary(robot=self),
-          host, port, port_file, allow_stop)
+        self._serve(host, port, port_file, allow_stop)
+
+    def _serve(self, host, port, port_file, allow_stop):
+        """Serve with the RobotRemoteServer base until stopped.
+
+        - Needs robotremoteserver 1.0.x. See :data:`LEGACY_SERVER`.
+        """
+        if not LEGACY_SERVER:
+            raise RuntimeError(
+                "%s needs robotremoteserver 1.0.x for serving "
+                "(with workers=%s, locked_libraries=%s), "
+                "but found robotremoteserver %s. "
+                "Use robottools.remote.aio.AsyncRemoteRobot instead."
+                % (type(self).__name__, self.workers,
+                   sorted(self.locked_libraries),
+                   getattr(robotremoteserver, '__version__', '?')))
+        # the pool of worker threads handling requests (if any)
+        self._pool = None
+        if self.workers:
+            self._pool = ThreadPool(self.workers)
+            # RobotRemoteServer captures Keyword output
+            # by replacing sys.stdout and sys.stderr
+            # - see self._intercept_std_streams()
+            streams = ThreadLocalStream.install()
+        try:
+            # Initialize the RobotRemoteServer base
+            # with a .library.RemoteLibrary proxy
+            # (RobotRemoteServer only accepts a single library instance)
+            # - serves until stopped
+            RobotRemoteServer.__init__(
+              self, RemoteLibrary(robot=self),
+              host, port, port_file, allow_stop)
+        finally:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                sys.stdout, sys.stderr = streams
+
+    def finish_request(self, request, client_address):
+        """Handle the `request` with a
+           :class:`.transport.RemoteRequestHandler`.
+        """
+        # (RobotRemoteServer doesn't take a request handler class)
+        RemoteRequestHandler(request, client_address, self)
+
+    def process_request(self, request, client_address):
+        """Let a worker thread handle the `request` if there are `workers`.
+        """
+        if self._pool is None:
+            return RobotRemoteServer.process_request(
+                self, request, client_address)
+
+        self._pool.apply_async(
+            self._process_request_worker, (request, client_address))
+
+    def _process_request_worker(self, request, client_address):
+        # (adapted from socketserver.ThreadingMixIn.process_request_thread)
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def _intercept_std_streams(self):
+        if self._pool is None:
+            return RobotRemoteServer._intercept_std_streams(self)
+
+        sys.stdout.intercept()
+        sys.stderr.intercept()
+
+    def _restore_std_streams(self):
+        if self._pool is None:
+            return RobotRemoteServer._restore_std_streams(self)
+
+        stdout = sys.stdout.restore()
+        stderr = sys.stderr.restore()
+        # (adapted from RobotRemoteServer._restore_std_streams)
+        if stdout and stderr:
+            if not stderr.startswith((
+                    '*TRACE*', '*DEBUG*', '*INFO*', '*HTML*',
+                    '*WARN*', '*ERROR*')):
+                stderr = '*INFO* %s' % stderr
+            if not stdout.endswith('\n'):
+                stdout += '\n'
+        return stdout + stderr
+
+    def _library_lock(self, library):
+        """Get the lock for running Keywords of the given RFW `library`
+           or ``None`` if the library is thread-safe
+           or there are no `workers`.
+        """
+        if self._pool is None:
+            return None
+
+        #HACK: RFW doesn't provide public access to the library class
+        libcode = getattr(library, '_libcode', None)
+        if library.name not in self.locked_libraries and getattr(
+                libcode, 'ROBOT_LIBRARY_THREAD_SAFE', True):
+            return None
+
+        with self._library_locks_lock:
+            try:
+                return self._library_locks[library.name]
+            except KeyError:
+                lock = self._library_locks[library.name] = threading.RLock()
+                return lock
+
+    def _locked(self, keyword, func):
+        """Wrap the `func` running a TestRobot `keyword`
+           with its library's lock if necessary.
+        """
+        lock = self._library_lock(keyword.library)
+        if lock is None:
+            return func
+
+        def locked(*args, **kwargs):
+            with lock:
+                return func(*args, **kwargs)
+
+        return locked
 
     def _register_keyword(self, name, keyword):
         for funcname, func in [
-          (name, keyword),
+          (name, self._locked(keyword, keyword)),
           (name + '.__repr__', keyword.__repr__),
           # To support IPython's ...? help system on xmlrpc.client side:
           (name + '.getdoc', lambda: keyword.__doc__),
@@ -100,6 +250,9 @@ class RemoteRobot(TestRobot, RobotRemoteServer, TestLibrary):
 
     def _register_functions(self):
         RobotRemoteServer._register_functions(self)
+        self.register_function(self.get_keyword_tags)
+        self.register_function(self.get_library_information)
+        self.register_function(self.get_transport_options)
         if self.register_keywords:
             for lib in self._libraries.values():
                 self._register_library_keywords(lib)
@@ -110,23 +263,76 @@ class RemoteRobot(TestRobot, RobotRemoteServer, TestLibrary):
         return (self._library.get_keyword_names()
                 + TestLibrary.get_keyword_names(self))
 
+    def get_keyword_arguments(self, name):
+        try:
+            return self._library.get_keyword_arguments(name)
+        except KeyError:
+            # ==> extra RemoteRobot Keyword
+            return list(TestLibrary.get_keyword_arguments(self, name))
+
     def get_keyword_documentation(self, name):
-        return self._library.get_keyword_documentation(name)
+        try:
+            return self._library.get_keyword_documentation(name)
+        except KeyError:
+            # ==> extra RemoteRobot Keyword
+            return TestLibrary.get_keyword_documentation(self, name)
+
+    def get_keyword_tags(self, name):
+        try:
+            return self._library.get_keyword_tags(name)
+        except KeyError:
+            # ==> extra RemoteRobot Keyword
+            return []
+
+    def get_library_information(self):
+        """Get the names, arguments, docs and tags of all Keywords
+           in a single response, instead of one request per Keyword
+           and metadata item.
+
+        - Returns a Keyword name -> ``{'args': ..., 'doc': ..., 'tags': ...}``
+          mapping like Robot Framework 4's Remote protocol.
+        - Used by the :class:`robottools.remote.client.Remote` client.
+        """
+        information = self._library.get_library_information()
+        for name in TestLibrary.get_keyword_names(self):
+            # ==> extra RemoteRobot Keywords
+            information[name] = {
+                'args': list(TestLibrary.get_keyword_arguments(self, name)),
+                'doc': TestLibrary.get_keyword_documentation(self, name)
+                or '',
+                'tags': [],
+                }
+        return information
+
+    def get_transport_options(self):
+        """Get the content types and encodings supported by the server,
+           for negotiating the compact transport
+           of :mod:`robottools.remote.transport` on connect.
+        """
+        return transport_options()
+
+    def Import(self, lib, args=None, alias=None):
+        """Import a Test Library with an optional `alias` name
+           and update the cached Keyword metadata.
+        """
+        lib = TestRobot.Import(self, lib, args, alias)
+        if self._library is not None:
+            self._library.update()
+        return lib
 
     def _get_keyword(self, name):
         try:
-            # find Keyword in loaded Libraries via TestRobot base
-            keyword = self[name]
+            # find Keyword in loaded Libraries via the metadata cache
+            keyword = self._library.spec(name).keyword
         except KeyError:
             try:
                 # find in extra RemoteRobot Keywords
                 return self.keywords[name]
             except KeyError:
                 return None
-        # make sure that self[name] is not a Library
-        # and return TestRobot Keywords in debug mode
+        # return TestRobot Keywords in debug mode
         # to get actual exceptions from Keyword functions
-        return keyword.debug if isinstance(keyword, Keyword) else None
+        return self._locked(keyword, keyword.debug)
 
     def _arguments_from_kw(self, keyword):
         if isinstance(keyword, Keyword):
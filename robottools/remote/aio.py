@@ -0,0 +1,425 @@
+# robotframework-tools
+#
+# Python Tools for Robot Framework and Test Libraries.
+#
+# Copyright (C) 2013-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# robotframework-tools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# robotframework-tools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with robotframework-tools. If not, see <http://www.gnu.org/licenses/>.
+
+"""robottools.remote.aio
+
+An asyncio based alternative to RemoteRobot's blocking
+``SimpleXMLRPCServer`` base (Python 3.5+ only):
+
+- Speaks the same Robot Remote protocol (XML-RPC over HTTP),
+  so Robot Framework's standard 'Remote' Library can be used as client.
+- Handles any number of concurrent connections in a single thread.
+- Runs synchronous Keywords in a thread pool executor
+  and awaits the coroutines returned by ``async def`` Keywords
+  directly in the event loop.
+- Supports the compact transport of :mod:`robottools.remote.transport`.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+__all__ = ['AsyncRemoteRobot']
+
+import re
+import sys
+import asyncio
+import inspect
+import traceback
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from xmlrpc.client import Binary, Fault, dumps, loads
+from xmlrpc.server import SimpleXMLRPCDispatcher
+
+from robot.utils import normalize
+
+from robottools.testrobot.streams import ThreadLocalStream
+
+from . import RemoteRobot
+from .library import RemoteLibrary
+from .transport import (
+    MSGPACK_CONTENT_TYPE, XMLRPC_CONTENT_TYPE,
+    compress, decompress, dumps_response, loads_request, media_type, msgpack)
+
+
+# exceptions whose names are not included in Keyword error messages
+# (like in robotremoteserver)
+GENERIC_EXCEPTIONS = (AssertionError, RuntimeError, Exception)
+
+# the paths which are accepted for XML-RPC requests
+RPC_PATHS = ('/', '/RPC2')
+
+# (Python < 3.7 only has Task.current_task)
+current_task = getattr(asyncio, 'current_task', None) \
+    or asyncio.Task.current_task
+
+# characters which are not allowed in XML
+# - strings containing them are sent as binary (like in robotremoteserver)
+NON_XML_CHARS = re.compile('[\x00-\x08\x0B\x0C\x0E-\x1F\uFFFE\uFFFF]')
+
+
+def result_value(value):
+    """Convert a Keyword return `value` to XML-RPC compatible types
+       like robotremoteserver does.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        if NON_XML_CHARS.search(value):
+            return Binary(value.encode('utf-8'))
+        return value
+    if isinstance(value, (bool, float)):
+        return value
+    if isinstance(value, int):
+        # (XML-RPC only supports 32 bit integers)
+        if -2 ** 31 <= value < 2 ** 31:
+            return value
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return Binary(bytes(value))
+    if isinstance(value, Mapping):
+        return dict((str(key), result_value(item))
+                    for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return [result_value(item) for item in value]
+    return str(value)
+
+
+def error_message(exc):
+    """Get the Robot error message of a Keyword exception `exc`.
+    """
+    name = type(exc).__name__
+    message = str(exc)
+    if type(exc) in GENERIC_EXCEPTIONS \
+       or getattr(exc, 'ROBOT_SUPPRESS_NAME', False):
+        return message or name
+    return message and '%s: %s' % (name, message) or name
+
+
+def keyword_result(value=None, exc=None, output=''):
+    """Create the Robot Remote protocol's ``run_keyword`` result
+       from the Keyword return `value` or exception `exc`
+       and the Keyword `output`.
+    """
+    result = {'status': 'PASS'}
+    if exc is None:
+        try:
+            value = result_value(value)
+        except Exception as e:
+            exc = e
+        else:
+            if value != '':
+                result['return'] = value
+    if exc is not None:
+        result['status'] = 'FAIL'
+        result['error'] = error_message(exc)
+        tb = ''.join(traceback.format_tb(exc.__traceback__)).rstrip()
+        if tb:
+            result['traceback'] = \
+                'Traceback (most recent call last):\n' + tb
+        if getattr(exc, 'ROBOT_CONTINUE_ON_FAILURE', False):
+            result['continuable'] = True
+        if getattr(exc, 'ROBOT_EXIT_ON_FAILURE', False):
+            result['fatal'] = True
+    if output:
+        result['output'] = result_value(output)
+    return result
+
+
+class AsyncRemoteRobot(RemoteRobot, SimpleXMLRPCDispatcher):
+    """A :class:`robottools.remote.RemoteRobot`
+       serving with an asyncio event loop instead of its
+       blocking RobotRemoteServer base.
+
+    - Output of ``async def`` Keyword bodies is not captured,
+      because they run in the event loop's thread.
+    """
+    def __init__(
+      self, libraries, host='127.0.0.1', port=8270, port_file=None,
+      allow_stop=True, allow_import=None,
+      register_keywords=True, introspection=True,
+      workers=None, locked_libraries=None, serve=True,
+      ):
+        """Takes the same args as :class:`robottools.remote.RemoteRobot`
+           and optional:
+
+        :param workers: Size of the thread pool executor
+          for running synchronous Keywords.
+          Defaults to :class:`concurrent.futures.ThreadPoolExecutor`'s
+          default size.
+        :param serve: Serve immediately until stopped?
+          Otherwise use ``await robot.serve()`` in a running event loop.
+        """
+        self._serve_now = serve
+        RemoteRobot.__init__(
+          self, libraries, host=host, port=port, port_file=port_file,
+          allow_stop=allow_stop, allow_import=allow_import,
+          register_keywords=register_keywords, introspection=introspection,
+          workers=workers, locked_libraries=locked_libraries)
+
+    def _serve(self, host, port, port_file, allow_stop):
+        SimpleXMLRPCDispatcher.__init__(self, allow_none=False, encoding=None)
+        self._library = RemoteLibrary(robot=self)
+        self._address = (host, int(port))
+        self._port_file = port_file
+        self._allow_stop = allow_stop
+        self._pool = ThreadPoolExecutor(self.workers or None)
+        self._server = None
+        self._stopped = None
+        # the tasks handling client connections
+        # and the writers of the idle ones waiting for the next request
+        self._connections = set()
+        self._idle = set()
+        self._register_functions()
+        if self._serve_now:
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self.serve())
+            finally:
+                loop.close()
+
+    def _register_functions(self):
+        for func in [
+          self.get_keyword_names,
+          self.get_keyword_arguments,
+          self.get_keyword_documentation,
+          self.get_keyword_tags,
+          self.get_library_information,
+          self.get_transport_options,
+          self.stop_remote_server,
+          ]:
+            self.register_function(func)
+        if self.register_keywords:
+            for lib in self._libraries.values():
+                self._register_library_keywords(lib)
+        if self.introspection:
+            self.register_introspection_functions()
+
+    @property
+    def server_address(self):
+        """The actual ``(host, port)`` the server is listening on.
+        """
+        if self._server is None:
+            return self._address
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self):
+        """Start listening in the running event loop.
+
+        :returns: The actual port number.
+        """
+        loop = asyncio.get_event_loop()
+        self._loop = loop
+        self._stopped = asyncio.Event()
+        self._server = await asyncio.start_server(
+            self._handle_connection, *self._address)
+        port = self.server_address[1]
+        if self._port_file:
+            with open(self._port_file, 'w') as f:
+                f.write(str(port))
+        return port
+
+    async def serve(self):
+        """Start listening and serve until stopped.
+
+        - Streams are intercepted per thread while serving.
+          See :class:`robottools.testrobot.streams.ThreadLocalStream`.
+        - On stop, idle client connections are closed
+          and busy ones after sending their current response.
+        """
+        streams = ThreadLocalStream.install()
+        try:
+            await self.start()
+            await self._stopped.wait()
+        finally:
+            if self._server is not None:
+                self._server.close()
+                for writer in list(self._idle):
+                    writer.close()
+                if self._connections:
+                    await asyncio.wait(list(self._connections))
+                await self._server.wait_closed()
+            self._pool.shutdown()
+            sys.stdout, sys.stderr = streams
+
+    def stop_remote_server(self):
+        """Stop serving if allowed.
+        """
+        if not self._allow_stop:
+            return False
+
+        if self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        return True
+
+    def _get_keyword(self, name):
+        if normalize(name, ignore='_') == 'stopremoteserver':
+            return self.stop_remote_server
+
+        return RemoteRobot._get_keyword(self, name)
+
+    def _run_keyword_sync(self, keyword, args, kwargs):
+        """Run a `keyword` function in the current executor thread.
+
+        :returns: The return value, the exception (if any),
+          and the captured output.
+        """
+        self._intercept_std_streams()
+        try:
+            value, exc = keyword(*args, **kwargs), None
+        except Exception as e:
+            value, exc = None, e
+        finally:
+            output = self._restore_std_streams()
+        return value, exc, output
+
+    async def run_keyword_async(self, name, args, kwargs=None):
+        """The Robot Remote protocol's ``run_keyword``.
+
+        - The Keyword gets run in the thread pool executor.
+        - If it returns an awaitable, like ``async def`` Keywords do,
+          it gets awaited in the event loop.
+        """
+        keyword = self._get_keyword(name)
+        if keyword is None:
+            return keyword_result(exc=RuntimeError(
+                "No Keyword named '%s'." % name))
+
+        value, exc, output = await self._loop.run_in_executor(
+            self._pool, self._run_keyword_sync, keyword, args, kwargs or {})
+        if exc is None and inspect.isawaitable(value):
+            try:
+                value = await value
+            except Exception as e:
+                exc = e
+        return keyword_result(value, exc, output)
+
+    async def dispatch(self, method, params):
+        """Call the remote `method` with XML-RPC `params`.
+
+        - All methods besides ``run_keyword``
+          are run in the thread pool executor.
+        """
+        if method == 'run_keyword':
+            return await self.run_keyword_async(*params)
+
+        return await self._loop.run_in_executor(
+            self._pool, self._dispatch, method, params)
+
+    async def _msgpack_dispatch_async(self, data):
+        """Handle a msgpack request `data` and return the response data.
+        """
+        try:
+            params, method = loads_request(data)
+            return dumps_response(await self.dispatch(method, params))
+        except Fault as fault:
+            return dumps_response(fault=fault)
+        except Exception as exc:
+            return dumps_response(fault=Fault(1, '%s:%s' % (type(exc), exc)))
+
+    async def _marshaled_dispatch_async(self, data):
+        """Handle an XML-RPC request `data` and return the response data.
+
+        - Adapted from ``SimpleXMLRPCDispatcher._marshaled_dispatch``.
+        """
+        try:
+            params, method = loads(data, use_builtin_types=True)
+            response = (await self.dispatch(method, params), )
+            response = dumps(
+                response, methodresponse=True,
+                allow_none=self.allow_none, encoding=self.encoding)
+        except Fault as fault:
+            response = dumps(
+                fault, allow_none=self.allow_none, encoding=self.encoding)
+        except Exception as exc:
+            response = dumps(
+                Fault(1, '%s:%s' % (type(exc), exc)),
+                allow_none=self.allow_none, encoding=self.encoding)
+        return response.encode(self.encoding or 'utf-8', 'xmlcharrefreplace')
+
+    async def _handle_connection(self, reader, writer):
+        """Handle the HTTP requests of a client connection
+           until the client closes it.
+        """
+        task = current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                self._idle.add(writer)
+                try:
+                    request = await reader.readline()
+                finally:
+                    self._idle.discard(writer)
+                if not request.strip():
+                    break
+
+                method, path, version = request.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(
+                    int(headers.get('content-length', 0)))
+
+                content_type, encoding = XMLRPC_CONTENT_TYPE, None
+                if method != 'POST':
+                    status, data = '501 Unsupported method', b''
+                elif path not in RPC_PATHS:
+                    status, data = '404 Not Found', b''
+                else:
+                    try:
+                        body = decompress(
+                            body, headers.get('content-encoding'))
+                    except ValueError:
+                        status, data = '400 Bad Request', b''
+                    else:
+                        status = '200 OK'
+                        if msgpack is not None and media_type(headers.get(
+                                'content-type')) == MSGPACK_CONTENT_TYPE:
+                            content_type = MSGPACK_CONTENT_TYPE
+                            data = await self._msgpack_dispatch_async(body)
+                        else:
+                            data = await self._marshaled_dispatch_async(body)
+                        data, encoding = compress(
+                            data, headers.get('accept-encoding'))
+                keep_alive = version == 'HTTP/1.1' and headers.get(
+                    'connection', '').lower() != 'close' \
+                    and not self._stopped.is_set()
+                writer.write((
+                    'HTTP/1.1 %s\r\n'
+                    'Content-Type: %s\r\n'
+                    '%s'
+                    'Content-Length: %d\r\n'
+                    '%s\r\n' % (
+                        status, content_type,
+                        encoding and 'Content-Encoding: %s\r\n' % encoding
+                        or '',
+                        len(data),
+                        '' if keep_alive else 'Connection: close\r\n')
+                ).encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+            self._connections.discard(task)
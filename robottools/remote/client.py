@@ -0,0 +1,206 @@
+# robotframework-tools
+#
+# Python Tools for Robot Framework and Test Libraries.
+#
+# Copyright (C) 2013-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# robotframework-tools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# robotframework-tools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with robotframework-tools. If not, see <http://www.gnu.org/licenses/>.
+
+"""robottools.remote.client
+
+An extended version of Robot Framework's standard 'Remote' client library.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+__all__ = ['Remote']
+
+from six.moves.xmlrpc_client import Error, Fault, ServerProxy
+
+import robot.libraries.Remote
+from robot.utils import timestr_to_secs
+
+from robottools import RobotBool
+
+from . import transport
+
+
+class Remote(robot.libraries.Remote.Remote):
+    """Robot Framework's standard 'Remote' client library,
+       which gets the names, arguments, docs and tags of all Keywords
+       with a single ``get_library_information`` call
+       if the server supports it, like :class:`.RemoteRobot` does.
+
+    - Otherwise falls back to the standard calls per Keyword.
+    - Can negotiate the compact transport
+      of :mod:`robottools.remote.transport` on connect.
+    - Import it in Robot scripts as ``robottools.remote.client.Remote``.
+    """
+    def __init__(
+      self, uri='http://127.0.0.1:8270', timeout=None,
+      binary=False, compress=False,
+      ):
+        """Takes the same args as the standard 'Remote' library
+           and these optional extra args,
+           which only take effect if also supported by the server:
+
+        :param binary: Use the msgpack encoding instead of XML-RPC?
+          Needs the ``msgpack`` package on both sides.
+        :param compress: gzip large requests and responses?
+        """
+        # (Robot < 2.8.6 has no timeout arg)
+        robot.libraries.Remote.Remote.__init__(
+            self, *(uri, ) if timeout is None else (uri, timeout))
+        self.binary = self._bool(binary) and transport.msgpack is not None
+        self.compress = self._bool(compress)
+        self._timeout = timeout and timestr_to_secs(timeout)
+        # the transport.ServerProxy replacing the standard XML-RPC proxy
+        # or False if not negotiated with the server (yet)
+        self._transport = None
+        # the cached get_library_information() result
+        # or False if not supported by the server
+        self._information = None
+
+    @staticmethod
+    def _bool(value):
+        """Convert a (string) arg from Robot scripts to bool.
+        """
+        return bool(RobotBool(RobotBool.normalize(value)))
+
+    def _call(self, method, *args):
+        """Call a remote `method`, which is not supported
+           by the standard library's XML-RPC client.
+        """
+        #HACK: the standard library's XML-RPC client
+        # doesn't provide public access to its server proxy
+        server = self._client._server
+        if isinstance(server, (ServerProxy, transport.ServerProxy)):
+            return getattr(server, method)(*args)
+
+        # ==> Robot >= 3.1 creates a new server proxy per call
+        with server as proxy:
+            return getattr(proxy, method)(*args)
+
+    def _connect(self):
+        """Negotiate the compact transport with the server
+           if `binary` encoding or `compress` was requested.
+        """
+        if self._transport is not None:
+            return
+
+        if not (self.binary or self.compress):
+            self._transport = False
+            return
+
+        try:
+            options = self._call('get_transport_options')
+        except Fault:
+            # ==> method not supported by the server
+            self._transport = False
+            return
+        except (Error, EnvironmentError):
+            # ==> retry on next call
+            return
+
+        binary = self.binary and transport.MSGPACK_CONTENT_TYPE in \
+            options.get('content_types', ())
+        compress = self.compress and 'gzip' in \
+            options.get('content_encodings', ())
+        self._transport = False
+        if binary or compress:
+            proxy = transport.ServerProxy(
+                self._uri, binary=binary, compress=compress,
+                timeout=self._timeout)
+            try:
+                #HACK: replace the standard library's XML-RPC server proxy
+                self._client._server = proxy
+            except AttributeError:
+                # ==> Robot >= 3.1 (read-only, see self._call())
+                return
+
+            self._transport = proxy
+
+    def _get_library_information(self):
+        return self._call('get_library_information')
+
+    def get_library_information(self):
+        """Get the Keyword name -> ``{'args': ..., 'doc': ..., 'tags': ...}``
+           mapping of all remote Keywords.
+
+        - Only requested once from the server.
+
+        :returns: ``None`` if not supported by the server
+          or if the server is not reachable (yet).
+        """
+        information = self._information
+        if information is None:
+            self._connect()
+            try:
+                information = self._get_library_information()
+            except Fault:
+                # ==> method not supported by the server
+                information = False
+            except (Error, EnvironmentError):
+                # ==> let the standard calls handle connection problems
+                return None
+
+            self._information = information
+        return information or None
+
+    def _keyword_information(self, name):
+        """Get the information dict of the remote Keyword `name`
+           or ``None`` if not available.
+        """
+        information = self.get_library_information()
+        if information is None:
+            return None
+
+        return information.get(name)
+
+    def get_keyword_names(self, attempts=2):
+        information = self.get_library_information()
+        if information is None:
+            return robot.libraries.Remote.Remote.get_keyword_names(
+                self, attempts)
+
+        # (Robot 4's Remote protocol also has
+        #  '__intro__' and '__init__' entries for library docs)
+        return [name for name in information if not name.startswith('__')]
+
+    def get_keyword_arguments(self, name):
+        information = self._keyword_information(name)
+        if information is None:
+            return robot.libraries.Remote.Remote.get_keyword_arguments(
+                self, name)
+
+        return information.get('args', ['*args'])
+
+    def get_keyword_tags(self, name):
+        information = self._keyword_information(name)
+        if information is None:
+            return robot.libraries.Remote.Remote.get_keyword_tags(self, name)
+
+        return information.get('tags')
+
+    def get_keyword_documentation(self, name):
+        information = self._keyword_information(name)
+        if information is None:
+            return robot.libraries.Remote.Remote.get_keyword_documentation(
+                self, name)
+
+        return information.get('doc')
+
+    def run_keyword(self, name, args, kwargs):
+        self._connect()
+        return robot.libraries.Remote.Remote.run_keyword(
+            self, name, args, kwargs)
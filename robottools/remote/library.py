@@ -23,9 +23,27 @@ RemoteRobot's library proxy for RobotRemoteServer base.
 
 .. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
 """
-__all__ = ['RemoteLibrary']
+__all__ = ['RemoteLibrary', 'KeywordSpec']
+
+from collections import namedtuple, OrderedDict
 
 from robottools import TestLibraryInspector
+from robottools.testrobot import Keyword
+
+
+# the cached metadata of a Keyword served by RemoteRobot
+# - `keyword` is the robottools.testrobot.Keyword instance
+KeywordSpec = namedtuple(
+    'KeywordSpec', ['keyword', 'arguments', 'doc', 'tags'])
+
+
+def keyword_spec(keyword):
+    """Create the :class:`KeywordSpec` of a TestRobot `keyword`.
+    """
+    return KeywordSpec(
+        keyword, list(keyword.arguments), keyword.doc,
+        # (Robot < 2.9 has no Keyword tags)
+        list(getattr(keyword, 'tags', ())))
 
 
 class RemoteLibrary(object):
@@ -34,32 +52,103 @@ class RemoteLibrary(object):
        which only accepts a single Test Library.
 
     - Provides a Dynamic Test Library API.
+    - Serves Keyword names, arguments, docs and tags from a cache,
+      which is (re)built by :meth:`.update`
+      on every :meth:`.RemoteRobot.Import`
+      and after library changes done by Robot itself.
     """
     def __init__(self, robot):
         """Initialize with a :class:`.RemoteRobot` instance.
         """
         self.robot = robot
+        self.update()
+
+    def update(self):
+        """(Re)build the Keyword metadata cache
+           from the currently imported Test Libraries.
+        """
+        libraries = self.robot._libraries
+        specs = OrderedDict()
+        for lib in libraries.values():
+            for inspector in TestLibraryInspector(lib):
+                name = inspector.name
+                if name in specs:
+                    continue
+
+                specs[name] = keyword_spec(self.robot[name])
+        self._specs = specs
+        # the get_library_information() result built from the specs
+        self._information = None
+        # the Keyword handler index the cache was built from
+        # - gets replaced on any library change (see self.specs)
+        self._handlers = libraries.handlers
+
+    @property
+    def specs(self):
+        """The Keyword name -> :class:`KeywordSpec` mapping.
+        """
+        if self._handlers is not self.robot._libraries.handlers:
+            self.update()
+        return self._specs
+
+    def spec(self, name):
+        """Get the :class:`KeywordSpec` of the Keyword `name`.
+
+        - Falls back to looking up the Keyword in the imported libraries
+          if `name` is not exactly as listed by :meth:`.get_keyword_names`.
+
+        :raises KeyError: If no Keyword was found.
+        """
+        try:
+            return self.specs[name]
+        except KeyError:
+            keyword = self.robot[name]
+            if not isinstance(keyword, Keyword):
+                # ==> a Test Library
+                raise KeyError(name)
+
+            return keyword_spec(keyword)
 
     def get_keyword_names(self):
-        return [keyword.name for lib in self.robot._libraries.values()
-                for keyword in TestLibraryInspector(lib)]
+        return list(self.specs)
 
     def get_keyword_arguments(self, name):
-        keyword = self.robot[name]
-        return list(keyword.arguments)
+        return self.spec(name).arguments
 
     def get_keyword_documentation(self, name):
-        keyword = self.robot[name]
-        return keyword.doc
+        return self.spec(name).doc
+
+    def get_keyword_tags(self, name):
+        return self.spec(name).tags
+
+    def get_library_information(self):
+        """Get the arguments, docs and tags of all Keywords at once
+           as Keyword name -> ``{'args': ..., 'doc': ..., 'tags': ...}``
+           mapping, like Robot Framework 4's Remote protocol.
+
+        - Returns a new dict, which can be extended by the caller.
+        """
+        specs = self.specs
+        information = self._information
+        if information is None:
+            information = self._information = dict(
+                (name, {'args': spec.arguments, 'doc': spec.doc,
+                        'tags': spec.tags})
+                for name, spec in specs.items())
+        # (XML-RPC can only marshal plain dicts)
+        return dict(information)
 
     def run_keyword(self, name, *args, **kwargs):
-        keyword = self.robot[name]
+        keyword = self.spec(name).keyword
         return keyword(*args, **kwargs)
 
     def __getattr__(self, name):
         """Makes Keywords also directly available as methods.
         """
+        if name.startswith('_'):
+            raise AttributeError(name)
+
         try:
-            return self.robot[name]
+            return self.spec(name).keyword
         except KeyError:
             raise AttributeError(name)
@@ -0,0 +1,351 @@
+# robotframework-tools
+#
+# Python Tools for Robot Framework and Test Libraries.
+#
+# Copyright (C) 2013-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# robotframework-tools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# robotframework-tools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with robotframework-tools. If not, see <http://www.gnu.org/licenses/>.
+
+"""robottools.remote.transport
+
+An opt-in compact transport for the Robot Remote protocol,
+which clients negotiate on connect via ``get_transport_options``:
+
+- gzip compression of request and response bodies
+  larger than :data:`GZIP_THRESHOLD` bytes.
+- msgpack encoding instead of XML-RPC,
+  which sends byte strings as they are instead of base64 encoded.
+  Needs the optional ``msgpack`` package on both sides.
+
+Clients which don't ask for it,
+like Robot Framework's standard 'Remote' library,
+keep talking plain XML-RPC.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+__all__ = [
+  'XMLRPC_CONTENT_TYPE', 'MSGPACK_CONTENT_TYPE', 'GZIP_THRESHOLD',
+  'transport_options', 'compress', 'decompress',
+  'RemoteRequestHandler', 'ServerProxy',
+  ]
+
+import zlib
+import errno
+
+from six import text_type as unicode
+from six.moves import http_client
+from six.moves.urllib.parse import urlsplit
+from six.moves.xmlrpc_client import (
+    Binary, Fault, ProtocolError, ResponseError, dumps, loads)
+from six.moves.xmlrpc_server import SimpleXMLRPCRequestHandler
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+XMLRPC_CONTENT_TYPE = 'text/xml'
+MSGPACK_CONTENT_TYPE = 'application/x-msgpack'
+
+# bodies up to this size are not worth compressing
+# (like SimpleXMLRPCRequestHandler.encode_threshold)
+GZIP_THRESHOLD = 1400
+
+
+def transport_options():
+    """The ``get_transport_options`` result of the Remote servers:
+       The supported content types and content encodings.
+    """
+    content_types = [XMLRPC_CONTENT_TYPE]
+    if msgpack is not None:
+        content_types.append(MSGPACK_CONTENT_TYPE)
+    return {
+        'content_types': content_types,
+        'content_encodings': ['gzip'],
+        'gzip_threshold': GZIP_THRESHOLD,
+        }
+
+
+def media_type(content_type):
+    """Get the plain media type of an HTTP ``Content-Type`` header value.
+    """
+    return (content_type or '').split(';')[0].strip().lower()
+
+
+def accepts_gzip(accept_encoding):
+    """Does the HTTP ``Accept-Encoding`` header value accept gzip?
+    """
+    for coding in (accept_encoding or '').split(','):
+        coding, _, params = coding.partition(';')
+        if coding.strip().lower() == 'gzip':
+            return params.replace(' ', '') not in ('q=0', 'q=0.0')
+
+    return False
+
+
+def compress(data, accept_encoding):
+    """gzip `data` if it is larger than :data:`GZIP_THRESHOLD`
+       and the HTTP ``Accept-Encoding`` header value accepts it.
+
+    :returns: The data and the ``Content-Encoding`` (or ``None``).
+    """
+    if len(data) <= GZIP_THRESHOLD or not accepts_gzip(accept_encoding):
+        return data, None
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(), 'gzip'
+
+
+def decompress(data, content_encoding):
+    """Decode `data` according to its HTTP ``Content-Encoding``.
+
+    :raises ValueError: On unsupported or invalid encodings.
+    """
+    content_encoding = (content_encoding or 'identity').strip().lower()
+    if content_encoding == 'identity':
+        return data
+
+    if content_encoding != 'gzip':
+        raise ValueError(
+            "Unsupported Content-Encoding: %s" % content_encoding)
+
+    try:
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+    except zlib.error as e:
+        raise ValueError("Invalid gzip data: %s" % e)
+
+
+def stale_connection_error(exc):
+    """Does the exception `exc` from sending a request
+       over an already open keep-alive connection
+       mean that the server closed the connection
+       before sending any response data?
+
+    - Only then the request can safely be sent again.
+      Other errors, like timeouts, might happen after the server
+      already started processing the request.
+    """
+    if isinstance(exc, http_client.BadStatusLine):
+        # (includes RemoteDisconnected of Python 3.5+)
+        return exc.line in ('', "''")
+
+    return isinstance(exc, EnvironmentError) and exc.errno in (
+        errno.ECONNRESET, errno.ECONNABORTED, errno.EPIPE)
+
+
+def _msgpack_default(value):
+    """Convert the XML-RPC specific types for msgpack.
+    """
+    if isinstance(value, Binary):
+        return value.data
+
+    # like xmlrpc DateTime
+    return unicode(value)
+
+
+def dumps_msgpack(value):
+    return msgpack.packb(value, use_bin_type=True, default=_msgpack_default)
+
+
+def loads_msgpack(data):
+    return msgpack.unpackb(data, raw=False)
+
+
+def dumps_request(method, params, content_type):
+    """Encode a remote `method` call with `params` as request body.
+    """
+    if content_type == MSGPACK_CONTENT_TYPE:
+        return dumps_msgpack([method, list(params)])
+
+    return dumps(tuple(params), method, encoding='utf-8').encode('utf-8')
+
+
+def loads_request(data):
+    """Decode a msgpack request body.
+
+    :returns: The ``(params, method)`` pair like ``xmlrpc.client.loads``.
+    """
+    method, params = loads_msgpack(data)
+    return tuple(params), method
+
+
+def dumps_response(result=None, fault=None):
+    """Encode a remote method's `result` or `fault` as msgpack response body.
+    """
+    if fault is not None:
+        return dumps_msgpack({'fault': {
+            'faultCode': fault.faultCode,
+            'faultString': fault.faultString}})
+
+    return dumps_msgpack({'result': result})
+
+
+def loads_response(data, content_type):
+    """Decode a response body.
+
+    :raises xmlrpc.client.Fault: If the remote method failed.
+    """
+    if media_type(content_type) == MSGPACK_CONTENT_TYPE:
+        try:
+            response = loads_msgpack(data)
+        except Exception as e:
+            raise ResponseError("Invalid msgpack response: %s" % e)
+        if 'fault' in response:
+            raise Fault(**response['fault'])
+
+        return response['result']
+
+    (result, ), _ = loads(data)
+    return result
+
+
+class RemoteRequestHandler(SimpleXMLRPCRequestHandler):
+    """Extends the request handler of RemoteRobot's SimpleXMLRPCServer base
+       with the msgpack encoding.
+
+    - The base already gzips large XML-RPC responses
+      for clients accepting it and decodes gzipped requests.
+    """
+    def do_POST(self):
+        content_type = media_type(self.headers.get('content-type'))
+        if content_type != MSGPACK_CONTENT_TYPE or msgpack is None:
+            return SimpleXMLRPCRequestHandler.do_POST(self)
+
+        if not self.is_rpc_path_valid():
+            self.report_404()
+            return
+
+        try:
+            data = self.rfile.read(int(self.headers['content-length']))
+            data = self.decode_request_content(data)
+            if data is None:
+                # ==> error response was already sent
+                return
+
+            try:
+                params, method = loads_request(data)
+                response = dumps_response(
+                    self.server._dispatch(method, params))
+            except Fault as fault:
+                response = dumps_response(fault=fault)
+            except Exception as exc:
+                # (like SimpleXMLRPCDispatcher._marshaled_dispatch)
+                response = dumps_response(fault=Fault(
+                    1, '%s:%s' % (type(exc), exc)))
+        except Exception:
+            self.send_response(500)
+            self.send_header('Content-length', '0')
+            self.end_headers()
+            return
+
+        response, encoding = compress(
+            response, self.headers.get('accept-encoding'))
+        self.send_response(200)
+        self.send_header('Content-type', MSGPACK_CONTENT_TYPE)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+
+class ServerProxy(object):
+    """A client for the compact transport,
+       usable like ``xmlrpc.client.ServerProxy``.
+
+    - Keeps its HTTP connection open between calls.
+    """
+    def __init__(self, uri, binary=True, compress=True, timeout=None):
+        """Create a proxy for the Remote server at `uri`.
+
+        :param binary: Use the msgpack encoding instead of XML-RPC?
+        :param compress: gzip large requests and accept gzipped responses?
+        :param timeout: Optional socket timeout in seconds.
+        """
+        parts = urlsplit(uri)
+        self._connection_class = http_client.HTTPSConnection \
+            if parts.scheme == 'https' else http_client.HTTPConnection
+        self._host = parts.netloc
+        self._path = parts.path or '/RPC2'
+        self.content_type = MSGPACK_CONTENT_TYPE if binary \
+            else XMLRPC_CONTENT_TYPE
+        self.compress = bool(compress)
+        self.timeout = timeout
+        self._connection = None
+
+    def _request(self, method, params):
+        body = dumps_request(method, params, self.content_type)
+        headers = {'Content-Type': self.content_type}
+        if self.compress:
+            headers['Accept-Encoding'] = 'gzip'
+            if len(body) > GZIP_THRESHOLD:
+                body, headers['Content-Encoding'] = compress(body, 'gzip')
+        # an already open connection might have been closed by the server
+        # - then retry once with a new one
+        while True:
+            reused = self._connection is not None
+            if not reused:
+                self._connection = self._connection_class(
+                    self._host, timeout=self.timeout)
+            try:
+                self._connection.request('POST', self._path, body, headers)
+                response = self._connection.getresponse()
+            except (http_client.HTTPException, EnvironmentError) as exc:
+                self.close()
+                if reused and stale_connection_error(exc):
+                    continue
+
+                raise
+
+            break
+
+        try:
+            data = response.read()
+        except Exception:
+            self.close()
+            raise
+
+        if response.status != 200:
+            self.close()
+            raise ProtocolError(
+                self._host + self._path, response.status, response.reason,
+                dict(response.getheaders()))
+
+        if response.version < 11 \
+                or response.getheader('connection', '').lower() == 'close':
+            self.close()
+        try:
+            data = decompress(data, response.getheader('content-encoding'))
+        except ValueError as e:
+            raise ResponseError(str(e))
+
+        return loads_response(data, response.getheader('content-type'))
+
+    def close(self):
+        """Close the HTTP connection (reopened on the next call).
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        return lambda *params: self._request(name, params)
+
+    def __repr__(self):
+        return '<%s for %s%s (%s)>' % (
+            type(self).__name__, self._host, self._path, self.content_type)
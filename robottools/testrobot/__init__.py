@@ -25,17 +25,19 @@ Provides the interactive TestRobot interface.
 """
 __all__ = [
     'TestRobot',
-    'TestResult', # from .result
+    'TestResult', 'KeywordCallResult', # from .result
 ]
 
 from six import reraise
 from inspect import getargspec
 from functools import partial
+from contextlib import contextmanager
 
 import zetup
-from moretools import isidentifier, isdict
+from moretools import isidentifier, isdict, dictitems
 
-from robot.errors import DataError
+from robot.errors import DataError, ExecutionFailed
+import robot.running
 from robot.conf import RobotSettings
 from robot.running.model import TestSuite
 from robot.running.namespace import Namespace
@@ -51,9 +53,12 @@ from robottools import TestLibraryInspector
 from .variables import variablesclass
 from .output import Output
 from .context import Context
+from .libraries import LibrariesDict
 from .library import TestLibrary
+from .handler import Handler
 from .keyword import Keyword
-from .result import TestResult
+from .result import TestResult, KeywordCallResult
+from .parallel import run_parallel
 
 
 class TestRobot(zetup.object):
@@ -75,6 +80,9 @@ class TestRobot(zetup.object):
         """
         self.name = name
         self.debug = False
+        # the (lib, args, alias) of all Test Libraries imported by name
+        # - used for creating the worker TestRobots of parallel .Run()s
+        self._imports = []
         try:
             GLOBAL_VARIABLES
         except NameError:
@@ -107,6 +115,9 @@ class TestRobot(zetup.object):
             else:
                 # Robot 2.9
                 self._namespace = namespace()
+        #HACK: Replace the Namespace's libraries dict
+        # to keep the Keyword index in sync with any (re)imports
+        self._libraries = LibrariesDict(self._libraries)
 
         if BuiltIn:
             self.Import('BuiltIn')
@@ -122,6 +133,44 @@ class TestRobot(zetup.object):
         except AttributeError: # Robot 2.9
             return self._namespace._kw_store.libraries
 
+    @_libraries.setter
+    def _libraries(self, libraries):
+        if hasattr(self._namespace, '_testlibs'):
+            self._namespace._testlibs = libraries
+        else: # Robot 2.9
+            self._namespace._kw_store.libraries = libraries
+
+    def _get_handler(self, name):
+        """Get the RFW handler of a Keyword from any imported Test Library
+           by its (normalized) `name`.
+
+        - Uses the libraries' Keyword name -> handler index
+          and only falls back to scanning all libraries
+          for Keywords with embedded arguments.
+        - The returned handler is already wrapped with
+          :class:`robottools.testrobot.handler.Handler`
+          (except for Keywords with embedded arguments).
+
+        :raises KeyError: If no Keyword was found.
+        """
+        try:
+            handler = self._libraries.handlers[name]
+        except KeyError:
+            for lib in self._libraries.values():
+                try:
+                    handler = TestLibrary(lib)[name]._handler
+                except KeyError:
+                    pass
+                else:
+                    break
+            else:
+                raise KeyError(name)
+        # (Keywords with embedded arguments take no further arguments)
+        if not isinstance(handler, Handler) \
+                and not hasattr(handler, 'name_regexp'):
+            handler.__class__ = Handler[handler.__class__]
+        return handler
+
     @property
     def __doc__(self):
         """Dynamic doc string, listing imported Test Libraries.
@@ -137,28 +186,127 @@ class TestRobot(zetup.object):
             #HACK: `with` adds Context to robot.running.EXECUTION_CONTEXTS
             # and registers Output to robot.output.LOGGER
             with self._context:
-                lib = self._context.importer.import_library(
+                robotlib = self._context.importer.import_library(
                     lib, args and list(args), alias, None)
-                self._libraries[alias or lib.name] = lib
-                lib = TestLibraryInspector(lib)
+                self._libraries[alias or robotlib.name] = robotlib
+                self._imports.append((lib, args, alias))
+                lib = TestLibraryInspector(robotlib)
                 ## lib = TestLibraryInspector(lib, *(args or ()))
         # Put lib in testrobot's TestLibrary wrapper
         #  for calling Keywords with TestRobot's context:
         return TestLibrary(lib._library, context=self._context)
 
+    @contextmanager
+    def session(self):
+        """Keep the TestRobot's execution context installed
+           for all Keyword calls in a ``with`` block::
+
+              with robot.session():
+                  for value in values:
+                      robot.ShouldBeTrue(value)
+
+        - Normally, every single Keyword call sets up Robot's global
+          execution context and output registration and tears them down
+          afterwards. In session mode this is only done once
+          for the whole block.
+        """
+        with self._context:
+            yield self
+
+    def run_many(self, calls, stop_on_failure=False):
+        """Run a batch of Keyword `calls` in a row
+           with the TestRobot's execution context installed only once.
+
+        - All Keywords are looked up before running the first one.
+          With Robot >= 3.0, their runners are also created up front
+          and run directly, without resolving the Keyword names again.
+
+        :param calls: A sequence of ``(name, args, kwargs)`` tuples.
+        :param stop_on_failure: Don't run any further Keywords
+          after the first FAIL?
+        :returns: A list of :class:`robottools.KeywordCallResult`
+          for every Keyword that was run.
+        :raises KeyError: If any Keyword can't be found.
+        """
+        steps = []
+        for name, args, kwargs in calls:
+            try:
+                handler = self._get_handler(name)
+            except KeyError:
+                raise KeyError("No Keyword named '%s'." % name)
+            if hasattr(handler, 'name_regexp'):
+                # ==> Keyword with embedded arguments,
+                # which keeps the called name and takes no further args
+                kwname = name
+                args = list(args) + [
+                    '%s=%s' % item for item in dictitems(kwargs or {})]
+            else:
+                kwname = handler.name
+                # the (args, kwargs) pair is resolved by .handler.Handler
+                args = (tuple(args), dict(kwargs or {}))
+            step = robot.running.Keyword(name, args=args)
+            runner = None
+            if hasattr(handler, 'create_runner'): # Robot >= 3.0
+                runner = handler.create_runner(name)
+            steps.append((kwname, step, runner))
+        results = []
+        with self._context as ctx:
+            for kwname, step, runner in steps:
+                try:
+                    if runner is not None:
+                        value = runner.run(step, ctx)
+                    else:
+                        value = step.run(ctx)
+                except ExecutionFailed as exc:
+                    results.append(
+                        KeywordCallResult(kwname, False, None, exc))
+                    if stop_on_failure:
+                        break
+                else:
+                    results.append(
+                        KeywordCallResult(kwname, True, value, None))
+        return results
+
     def Run(self, path, **options):
+        """Run the test suite from `path` with optional Robot `options`.
+
+        - With ``workers=N``, the suite is split into its child suites
+          or tests, which are run in a pool of `N` processes,
+          each having its own TestRobot with the same Test Library imports.
+          Setup and teardown of the top level suite are run once per part.
+          The results are finally merged.
+        - With ``debug=True``, the exception of the first failing Keyword
+          is reraised (not supported with `workers`).
+
+        :returns: :class:`robottools.TestResult`
+        """
         debug = options.pop('debug', self.debug)
-        # post processed options
-        settings = RobotSettings(**options)
+        workers = options.pop('workers', None)
+        if workers:
+            if debug:
+                raise ValueError(
+                    "TestRobot.Run() doesn't support debug=True "
+                    "with workers=%s" % repr(workers))
+            result = run_parallel(self, path, workers, options)
+            return TestResult(result, **options)
+
         builder = TestSuiteBuilder()
         suite = builder.build(path)
+        result = self._run_suite(suite, **options)
+        if debug and result.return_code:
+            reraise(*self._output._last_fail_exc)
+        return TestResult(result, **options)
+
+    def _run_suite(self, suite, **options):
+        """Run a built test `suite` with optional Robot `options`
+           and return the ``robot.result.Result``.
+        """
+        # post processed options
+        settings = RobotSettings(**options)
         with self._context:
             runner = Runner(self._output, settings)
             suite.visit(runner)
-            result = runner.result
-            if debug and result.return_code:
-                reraise(*self._output._last_fail_exc)
-            return TestResult(runner.result, **options)
+            return runner.result
 
     def __getitem__(self, name):
         """Get variables (with $/@{...} syntax),
@@ -171,22 +319,22 @@ class TestRobot(zetup.object):
                 return self._variables[name]
             except DataError as e:
                 raise KeyError(str(e))
-        for alias, lib in self._libraries.items():
+        try:
+            lib = self._libraries[name]
+        except KeyError:
+            pass
+        else:
             # Put lib in testrobot's TestLibrary wrapper
             #  for calling Keywords with TestRobot's context:
-            lib = TestLibrary(lib, context=self._context)
-            if alias == name:
-                return lib
-            try:
-                keyword = lib[name]
-            except KeyError:
-                pass
-            else:
-                keyword = Keyword(keyword._handler, context=self._context)
-                if self.debug:
-                    return keyword.debug
-                return keyword
-        raise KeyError("No Test Library or Keyword named '%s'." % name)
+            return TestLibrary(lib, context=self._context)
+        try:
+            handler = self._get_handler(name)
+        except KeyError:
+            raise KeyError("No Test Library or Keyword named '%s'." % name)
+        keyword = Keyword(handler, context=self._context)
+        if self.debug:
+            return keyword.debug
+        return keyword
 
     def __getattr__(self, name):
         """Get Robot Variables, Test Libraries and Keywords by name.
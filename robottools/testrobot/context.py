@@ -19,16 +19,160 @@
 
 """robottools.testrobot.context
 
+The execution context of :class:`robottools.TestRobot`.
+
+Robot Framework keeps its execution context in process-global objects.
+To be able to run different TestRobot instances in parallel threads,
+these objects get patched by :func:`install_patches`
+to hold their state per thread:
+
+- ``robot.running.EXECUTION_CONTEXTS``
+- ``robot.running.namespace.IMPORTER``
+- ``robot.output.librarylogger.LOGGING_THREADS``
+
+Threads which never entered a TestRobot :class:`Context`
+still share the original global state.
+
+Robot's output capturing of Keywords,
+which replaces the global ``sys.stdout`` and ``sys.stderr``,
+also gets patched to only redirect the current thread
+if they are :class:`robottools.testrobot.streams.ThreadLocalStream`
+instances.
+
+The patches are process-wide and also affect
+normal Robot runs in the same process.
+So they are not installed on import,
+but only when a TestRobot :class:`Context` is entered the first time.
+
 .. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
 """
-__all__ = ['Context']
+__all__ = ['Context', 'install_patches']
+
+import sys
+import threading
 
 from robot.errors import DataError
 from robot.running import EXECUTION_CONTEXTS
+from robot.running.context import ExecutionContexts
 import robot.running.namespace
 from robot.running.namespace import Importer
+import robot.output.librarylogger
+from robot.running.outputcapture import PythonCapturer
+
+from .streams import ThreadLocalStream
+
+
+class ThreadLocalExecutionContexts(ExecutionContexts):
+    """Replacement class for the global
+       ``robot.running.EXECUTION_CONTEXTS`` instance,
+       which holds a separate stack of execution contexts
+       for every thread that entered a TestRobot :class:`Context`.
+    """
+    @property
+    def _contexts(self):
+        try:
+            return self._local.contexts
+        except AttributeError:
+            return self._shared_contexts
+
+    @_contexts.setter
+    def _contexts(self, contexts):
+        self._local.contexts = contexts
+
+
+class ThreadLocalImporter(object):
+    """Replacement for the global ``robot.running.namespace.IMPORTER``,
+       delegating to a separate importer
+       for every thread that entered a TestRobot :class:`Context`.
+    """
+    def __init__(self, shared):
+        self._shared = shared
+        self._local = threading.local()
+
+    @property
+    def importer(self):
+        return getattr(self._local, 'importer', None) or self._shared
+
+    @importer.setter
+    def importer(self, importer):
+        self._local.importer = importer
+
+    def __getattr__(self, name):
+        return getattr(self.importer, name)
+
+
+class LoggingThreads(tuple):
+    """Replacement for ``robot.output.librarylogger.LOGGING_THREADS``,
+       the names of the threads whose library log messages are processed.
 
-from .keyword import Keyword
+    - Additionally lets through the messages of any thread
+      that currently runs inside a TestRobot :class:`Context`.
+    """
+    def __contains__(self, name):
+        return tuple.__contains__(self, name) \
+            or isinstance(EXECUTION_CONTEXTS.top, Context)
+
+
+def thread_local_stream_setter(name):
+    """Create a replacement for ``PythonCapturer._set_stdout``
+       or ``._set_stderr``, which redirects the ``sys.<name>`` stream
+       only for the current thread
+       if it is a :class:`robottools.testrobot.streams.ThreadLocalStream`.
+    """
+    def set_stream(self, stream):
+        current = getattr(sys, name)
+        if not isinstance(current, ThreadLocalStream):
+            setattr(sys, name, stream)
+        # PythonCapturer restores the stream it replaced on release
+        elif stream is current:
+            current.pop()
+        else:
+            current.push(stream)
+
+    set_stream.__name__ = '_set_%s' % name
+    return set_stream
+
+
+# are the patches installed? - see install_patches()
+_patched = False
+_patches_lock = threading.Lock()
+
+
+def install_patches():
+    """Make Robot's global execution context stuff thread-local.
+
+    - Patches the process-wide objects listed in the module docs.
+    - Only does something on the first call
+      and is automatically called on entering a :class:`Context`.
+    """
+    global _patched
+    if _patched:
+        return
+
+    with _patches_lock:
+        if _patched:
+            return
+
+        #HACK:
+        if not isinstance(EXECUTION_CONTEXTS, ThreadLocalExecutionContexts):
+            EXECUTION_CONTEXTS._local = threading.local()
+            EXECUTION_CONTEXTS._shared_contexts = EXECUTION_CONTEXTS._contexts
+            del EXECUTION_CONTEXTS._contexts
+            EXECUTION_CONTEXTS.__class__ = ThreadLocalExecutionContexts
+
+        namespace = robot.running.namespace
+        if not isinstance(namespace.IMPORTER, ThreadLocalImporter):
+            namespace.IMPORTER = ThreadLocalImporter(namespace.IMPORTER)
+
+        librarylogger = robot.output.librarylogger
+        if hasattr(librarylogger, 'LOGGING_THREADS') and not isinstance(
+                librarylogger.LOGGING_THREADS, LoggingThreads):
+            librarylogger.LOGGING_THREADS = LoggingThreads(
+                librarylogger.LOGGING_THREADS)
+
+        PythonCapturer._set_stdout = thread_local_stream_setter('stdout')
+        PythonCapturer._set_stderr = thread_local_stream_setter('stderr')
+        _patched = True
 
 
 class Context(object):
@@ -39,25 +183,56 @@ class Context(object):
         self.test = None
         self.importer = Importer()
         self.timeouts = set()
+        # per thread: how often the context was entered without exiting yet
+        # and the global stuff to restore on final exit
+        self._local = threading.local()
 
     def __enter__(self):
         """Prepare the TestRobot's context
            and set global stuff in the ``robot`` packages
            for running Tests and Keywords.
+
+        - Can be nested. Only the outermost ``with`` does the actual work,
+          which is used by :meth:`robottools.TestRobot.session`.
+        - The global stuff is only set for the current thread.
+          A single TestRobot instance can be used
+          by multiple threads at the same time,
+          which all enter its context separately.
         """
+        install_patches()
+        local = self._local
+        local.depth = getattr(local, 'depth', 0) + 1
+        if local.depth > 1:
+            return self
+
+        importer = robot.running.namespace.IMPORTER
+        local.previous = (importer.importer, EXECUTION_CONTEXTS._contexts)
         #HACK: For internal use by Robot BuiltIn Library
-        robot.running.namespace.IMPORTER = self.importer
+        # (only affects the current thread)
+        importer.importer = self.importer
         EXECUTION_CONTEXTS._contexts = [self]
         #HACK: Registers output to LOGGER
         self.output.__enter__()
         return self
 
     def __exit__(self, *exc):
+        local = self._local
+        local.depth -= 1
+        if local.depth:
+            return
+
         #HACK: Unregisters output from LOGGER
         self.output.__exit__(*exc)
         #HACK:
-        EXECUTION_CONTEXTS._contexts = []
-        robot.running.namespace.IMPORTER = None
+        robot.running.namespace.IMPORTER.importer, \
+            EXECUTION_CONTEXTS._contexts = local.previous
+        local.previous = None
+
+    @property
+    def active(self):
+        """Is the context currently entered by the current thread?
+        """
+        return getattr(self._local, 'depth', 0) > 0
 
     @property
     def variables(self):
@@ -77,13 +252,10 @@ class Context(object):
 
     def get_handler(self, name):
         try:
-            keyword = self.testrobot[name]
-            if type(keyword) is not Keyword:
-                raise KeyError(name)
+            return self.testrobot._get_handler(name)
         except KeyError:
             raise DataError("TestRobot %s has no Keyword named %s" % (
                 repr(self.testrobot.name), repr(name)))
-        return keyword._handler
 
     def get_runner(self, name):
         handler = self.get_handler(name)
@@ -26,18 +26,40 @@ Making ``robot.running.handlers`` work better with
 """
 __all__ = ['Handler']
 
+from weakref import WeakValueDictionary
 from six import with_metaclass
 
 from moretools import isstring, isdict, dictitems
 
 
 class HandlerMeta(type):
-
-    def __getitem__(cls, handlercls):
+    """Creates and caches the :class:`Handler` wrapper classes
+       for classes from ``robot.running.handlers``.
+    """
+    def __init__(cls, clsname, bases, clsattrs):
+        type.__init__(cls, clsname, bases, clsattrs)
+        # The wrapper classes only stay cached as long as there are
+        # wrapped handler instances left, so that classes
+        # from unloaded Test Libraries can be garbage collected
+        cls._wrapper_classes = WeakValueDictionary()
+
+    def _create(cls, handlercls):
+        """Create a new wrapper class for `handlercls`.
+        """
         return type('Handler', (cls, handlercls), {
             '_resolve_arguments': handlercls.resolve_arguments,
         })
 
+    def __getitem__(cls, handlercls):
+        """Get the (cached) wrapper class for `handlercls`.
+        """
+        try:
+            return cls._wrapper_classes[handlercls]
+        except KeyError:
+            wrappercls = cls._wrapper_classes[handlercls] \
+                = cls._create(handlercls)
+            return wrappercls
+
 
 class Handler(with_metaclass(HandlerMeta, object)):
     """A wrapper base class for instances of classes
@@ -19,11 +19,20 @@
 
 """robottools.testrobot.keyword
 
+Debugging Keywords (``TestRobot.debug = True``) need monkey patches
+of Robot Framework's Keyword runners to raise the actual exceptions
+of Keyword FAILs. These patches are process-wide,
+so they are only installed while any thread runs a :class:`DebugKeyword`
+and get removed again when the last one has finished.
+Other threads running normal Keywords at the same time
+are not affected by them.
+
 .. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
 """
-__all__ = ['Keyword']
+__all__ = ['Keyword', 'install_debug_patches', 'uninstall_debug_patches']
 
 import sys
+import threading
 from six import reraise, text_type as unicode
 
 from robot.errors import HandlerExecutionFailed, ExecutionFailed
@@ -34,7 +43,8 @@ try: # Robot 3.0
 except ImportError:
     StatusReporter = None
 else:
-    _get_failure = StatusReporter._get_failure
+    # (the plain function, to also restore it as such on PY2)
+    _get_failure = vars(StatusReporter)['_get_failure']
 try: # Robot 2.9
     from robot.running.keywordrunner import NormalRunner
 except ImportError:
@@ -68,6 +78,17 @@ def debug_fail(context, exc_info=None):
     reraise(exc_type, exc, traceback)
 
 
+# which threads currently run a DebugKeyword
+# - the monkey patches below only change behavior for those threads,
+#   so other threads can run normal Keywords at the same time
+DEBUGGING = threading.local()
+
+# the number of currently running DebugKeywords in all threads
+# - the monkey patches below are only installed while it's not zero
+_debugging_count = 0
+_debugging_lock = threading.Lock()
+
+
 if NormalRunner: # Robot 2.9
     #HACK
     class DebugNormalRunner(NormalRunner):
@@ -76,6 +97,9 @@ if NormalRunner: # Robot 2.9
         to catch the exception that caused a Keyword FAIL for debugging.
         """
         def _get_and_report_failure(self):
+            if not getattr(DEBUGGING, 'active', False):
+                return NormalRunner._get_and_report_failure(self)
+
             debug_fail(self._context)
 
 
@@ -86,6 +110,9 @@ if StatusReporter: # Robot 3.0
         :meth:`robot.running.statusreporter.StatusReporter._get_failure`
         to catch the exception that caused a Keyword FAIL for debugging.
         """
+        if not getattr(DEBUGGING, 'active', False):
+            return _get_failure(self, exc_type, exc, traceback, context)
+
         if exc is None:
             return None
 
@@ -104,24 +131,59 @@ class DebugKeyword(robot.running.Keyword):
 
     # Robot >= 2.9
     def __enter__(self):
-        if NormalRunner:
-            # Robot 2.9
-            # HACK: monkey-patch robot.running's NormalRunner
-            # to catch the Keyword exception
-            robot.running.keywordrunner.NormalRunner = DebugNormalRunner
-        if StatusReporter:
-            # Robot 3.0
-            # HACK: monkey-patch robot.running's StatusReporter._get_failure()
-            # to catch the Keyword exception
-            robot.running.statusreporter.StatusReporter._get_failure \
-                = debug_get_failure
+        """Switch the current thread to debugging mode.
+
+        - The monkey patches are installed by the first DebugKeyword
+          running in any thread.
+        """
+        global _debugging_count
+        with _debugging_lock:
+            if not _debugging_count:
+                install_debug_patches()
+            _debugging_count += 1
+        self._debugging = getattr(DEBUGGING, 'active', False)
+        DEBUGGING.active = True
 
     def __exit__(self, *exc):
-        if NormalRunner:
-            robot.running.keywordrunner.NormalRunner = NormalRunner
-        if StatusReporter:
-            robot.running.statusreporter.StatusReporter._get_failure \
-                = _get_failure
+        """Leave debugging mode.
+
+        - The monkey patches are removed by the last DebugKeyword
+          running in any thread.
+        """
+        global _debugging_count
+        DEBUGGING.active = self._debugging
+        with _debugging_lock:
+            _debugging_count -= 1
+            if not _debugging_count:
+                uninstall_debug_patches()
+
+
+def install_debug_patches():
+    """Install the monkey patches for running :class:`DebugKeyword` objects.
+    """
+    if NormalRunner:
+        # Robot 2.9
+        # HACK: monkey-patch robot.running's NormalRunner
+        # to catch the Keyword exception
+        robot.running.keywordrunner.NormalRunner = DebugNormalRunner
+    if StatusReporter:
+        # Robot 3.0
+        # HACK: monkey-patch robot.running's StatusReporter._get_failure()
+        # to catch the Keyword exception
+        robot.running.statusreporter.StatusReporter._get_failure \
+            = debug_get_failure
+
+
+def uninstall_debug_patches():
+    """Restore the original Robot Framework Keyword runners.
+    """
+    if NormalRunner:
+        # Robot 2.9
+        robot.running.keywordrunner.NormalRunner = NormalRunner
+    if StatusReporter:
+        # Robot 3.0
+        robot.running.statusreporter.StatusReporter._get_failure \
+            = _get_failure
 
 
 class Keyword(KeywordInspector):
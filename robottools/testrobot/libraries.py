@@ -0,0 +1,164 @@
+# robotframework-tools
+#
+# Python Tools for Robot Framework and Test Libraries.
+#
+# Copyright (C) 2013-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# robotframework-tools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# robotframework-tools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with robotframework-tools. If not, see <http://www.gnu.org/licenses/>.
+
+"""robottools.testrobot.libraries
+
+Test Library storage with a Keyword handler index for
+:class:`robottools.TestRobot`.
+
+To notice library reloads, which replace the handlers
+of the library objects themselves,
+the ``reload`` method of Robot's library base class gets patched
+by :func:`install_reload_hook` on creation of the first
+:class:`LibrariesDict`.
+The patch is process-wide, but only additionally drops the handler indexes
+of the existing :class:`LibrariesDict` instances on every reload.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+__all__ = ['LibrariesDict', 'install_reload_hook']
+
+import threading
+from collections import OrderedDict
+from weakref import WeakValueDictionary
+
+from moretools import dictvalues
+
+from robot.utils import NormalizedDict
+from robot.running.testlibraries import _BaseTestLibrary
+
+# all LibrariesDict instances by id() - see install_reload_hook()
+_instances = WeakValueDictionary()
+
+# is the reload hook installed? - see install_reload_hook()
+_hooked = False
+_hook_lock = threading.Lock()
+
+
+def install_reload_hook():
+    """Patch Robot's library base class to drop the handler indexes
+       of all :class:`LibrariesDict` instances after any library reload.
+
+    - Only does something on the first call
+      and is automatically called on creating a :class:`LibrariesDict`.
+    """
+    global _hooked
+    if _hooked:
+        return
+
+    with _hook_lock:
+        if _hooked:
+            return
+
+        reload = getattr(_BaseTestLibrary, 'reload', None)
+        if reload is None: # Robot < 2.9 ==> no library reloads
+            _hooked = True
+            return
+
+        def reload_library(self):
+            try:
+                return reload(self)
+            finally:
+                for libraries in list(_instances.values()):
+                    libraries.invalidate()
+
+        reload_library.__name__ = reload.__name__
+        reload_library.__doc__ = reload.__doc__
+        #HACK:
+        _BaseTestLibrary.reload = reload_library
+        _hooked = True
+
+
+class LibrariesDict(OrderedDict):
+    """Ordered storage of imported RFW Test Libraries by alias name,
+       which replaces the internal libraries dict of a TestRobot's
+       ``robot.running.namespace.Namespace``.
+
+    - Additionally provides a normalized Keyword name -> handler index
+      over all stored libraries via :attr:`.handlers`,
+      which gets (re)built on first access after any change,
+      so that also imports done by Robot itself
+      (like ``BuiltIn.Import Library`` or ``ToolsLibrary.Reload Library``)
+      keep it in sync.
+    - Library reloads (like ``BuiltIn.Reload Library``)
+      replace the handlers of the library object itself
+      and drop the index via :func:`install_reload_hook`.
+    """
+    def __init__(self, *args, **kwargs):
+        self._handlers = None
+        OrderedDict.__init__(self, *args, **kwargs)
+        install_reload_hook()
+        _instances[id(self)] = self
+
+    def invalidate(self):
+        """Drop the Keyword handler index.
+        """
+        self._handlers = None
+
+    @property
+    def handlers(self):
+        """The normalized Keyword name -> handler index.
+
+        - If multiple libraries define Keywords with the same name,
+          the one from the earliest imported library is used.
+        - Keywords with embedded arguments are not indexed.
+        """
+        handlers = self._handlers
+        if handlers is None:
+            handlers = NormalizedDict(ignore='_')
+            for lib in dictvalues(self):
+                libhandlers = lib.handlers
+                if hasattr(libhandlers, 'values'): # RFW < 2.9
+                    libhandlers = libhandlers.values()
+                for handler in libhandlers:
+                    if hasattr(handler, 'name_regexp'):
+                        # ==> Keyword with embedded arguments
+                        continue
+                    if handler.name not in handlers:
+                        handlers[handler.name] = handler
+            self._handlers = handlers
+        return handlers
+
+    def __setitem__(self, name, lib):
+        self._handlers = None
+        OrderedDict.__setitem__(self, name, lib)
+
+    def __delitem__(self, name):
+        self._handlers = None
+        OrderedDict.__delitem__(self, name)
+
+    def pop(self, name, *default):
+        self._handlers = None
+        return OrderedDict.pop(self, name, *default)
+
+    def popitem(self, last=True):
+        self._handlers = None
+        return OrderedDict.popitem(self, last)
+
+    def setdefault(self, name, default=None):
+        self._handlers = None
+        return OrderedDict.setdefault(self, name, default)
+
+    def update(self, *args, **kwargs):
+        self._handlers = None
+        OrderedDict.update(self, *args, **kwargs)
+
+    def clear(self):
+        self._handlers = None
+        OrderedDict.clear(self)
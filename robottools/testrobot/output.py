@@ -26,6 +26,7 @@ __all__ = ['Output']
 import re
 import sys
 import logging
+import threading
 
 from robot.output import LOGGER, LEVELS as LOG_LEVELS
 from robot.output.loggerhelper import AbstractLogger
@@ -36,6 +37,7 @@ except ImportError:
     LibraryListeners = None
 
 from .highlighting import Highlighter
+from .streams import ThreadLocalStream
 
 
 LOG_LEVELS_MAX_WIDTH = max(map(len, LOG_LEVELS))
@@ -49,6 +51,11 @@ LOG_LEVEL_COLORS = {
 
 
 class LoggingHandler(RobotHandler):
+    # the idents of the threads which entered the handler's Output,
+    # to only handle their log records
+    # - managed by Output.__enter__() and Output.__exit__()
+    thread_idents = frozenset()
+
     def __enter__(self):
         #HACK: Adapted from robot.output.pyloggingconf.initialize()
         self._old_logging_raiseExceptions = logging.raiseExceptions
@@ -60,6 +67,13 @@ class LoggingHandler(RobotHandler):
         logging.raiseExceptions = self._old_logging_raiseExceptions
         del self._old_logging_raiseExceptions
 
+    def handle(self, record):
+        if record.thread is not None \
+           and record.thread not in self.thread_idents:
+            # ==> from another thread with its own TestRobot
+            return False
+        return RobotHandler.handle(self, record)
+
 
 class Output(AbstractLogger):
     def __init__(self, log_level='INFO'):
@@ -68,9 +82,13 @@ class Output(AbstractLogger):
         if LibraryListeners is not None:
             # Robot 3.0
             self.library_listeners = LibraryListeners(log_level)
-        # streams to be used internally for writing messages
+        # the (stdout, stderr) streams to be used internally
+        # for writing messages per thread which entered this output
         # - see self.__enter__() and self.message()
-        self._out = self._err = None
+        # - messages from other threads are ignored in self.message()
+        self._streams = {}
+        self.logging_handler.thread_idents = set()
+        self._lock = threading.Lock()
 
     def set_log_level(self, level):
         if LibraryListeners is not None:
@@ -79,27 +97,55 @@ class Output(AbstractLogger):
         return self.set_level(level)
 
     def __enter__(self):
+        """Register the output for the current thread.
+
+        - Can be entered by multiple threads at the same time.
+          Only the first one does the actual registration.
+        """
+        thread = threading.current_thread()
         # save sys.stdout and sys.stderr for writing
-        self._out = sys.stdout
-        self._err = sys.stderr
-        #HACK: Dynamically (un)register Output:
-        LOGGER.disable_message_cache()
-        LOGGER.unregister_console_logger()
-        LOGGER.register_logger(self)
-        # Catch global logging:
-        self.logging_handler.__enter__()
+        streams = tuple(
+            stream.target if isinstance(stream, ThreadLocalStream)
+            else stream for stream in (sys.stdout, sys.stderr))
+        with self._lock:
+            self._streams[thread] = streams
+            self.logging_handler.thread_idents.add(thread.ident)
+            if len(self._streams) > 1:
+                return
+
+            #HACK: Dynamically (un)register Output:
+            LOGGER.disable_message_cache()
+            LOGGER.unregister_console_logger()
+            LOGGER.register_logger(self)
+            # Catch global logging:
+            self.logging_handler.__enter__()
 
     def __exit__(self, *exc):
-        #HACK:
-        self.logging_handler.__exit__(*exc)
-        LOGGER.unregister_logger(self)
-        # unset internal streams
-        self._out = self._err = None
+        thread = threading.current_thread()
+        with self._lock:
+            # (also unsets internal streams)
+            self._streams.pop(thread, None)
+            self.logging_handler.thread_idents.discard(thread.ident)
+            if self._streams:
+                return
+
+            #HACK:
+            self.logging_handler.__exit__(*exc)
+            LOGGER.unregister_logger(self)
 
     _re_log_level = re.compile('|'.join(r % '|'.join(LOG_LEVELS)
       for r in [r'^\[ ?(%s) ?\] *', r'^\* ?(%s) ?\* *']))
 
     def message(self, message):
+        try:
+            out, err = self._streams[threading.current_thread()]
+        except KeyError:
+            if self._streams:
+                # ==> from another thread with its own TestRobot
+                return
+
+            out = err = None
+
         msg = message.message
         try:
             _, brackets, stars, msg = self._re_log_level.split(msg)
@@ -112,9 +158,9 @@ class Output(AbstractLogger):
 
         # select streams to use
         if level == 'INFO':
-            stream = self._out or sys.__stdout__
+            stream = out or sys.__stdout__
         else:
-            stream = self._err or sys.__stderr__
+            stream = err or sys.__stderr__
         #... and finally write the message
         stream.write("[ ")
         try:
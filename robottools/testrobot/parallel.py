@@ -0,0 +1,141 @@
+# robotframework-tools
+#
+# Python Tools for Robot Framework and Test Libraries.
+#
+# Copyright (C) 2013-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# robotframework-tools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# robotframework-tools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with robotframework-tools. If not, see <http://www.gnu.org/licenses/>.
+
+"""robottools.testrobot.parallel
+
+Parallel test suite execution for :meth:`robottools.TestRobot.Run`
+in a pool of worker processes.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+__all__ = ['split_suite', 'run_parallel']
+
+from multiprocessing import Pool
+
+from moretools import dictitems
+
+from robot.api import ExecutionResult
+from robot.running import TestSuiteBuilder
+
+from .result import TestResult
+
+
+# the TestRobot instance of a worker process
+# - created by init_worker()
+ROBOT = None
+
+# the test suites built by a worker process,
+# stored by path with their original child suites and tests
+# - see run_part()
+SUITES = {}
+
+
+def split_suite(suite):
+    """Get the independently runnable parts of a test `suite`
+       as ``('suites', index)`` or ``('tests', index)`` pairs,
+       referring to its direct child suites or tests.
+    """
+    return [('suites', index) for index in range(len(suite.suites))] \
+        + [('tests', index) for index in range(len(suite.tests))]
+
+
+def init_worker(name, imports):
+    """Create the worker process' TestRobot with given `name`
+       and the same ``(lib, args, alias)`` `imports`
+       as the TestRobot which started the worker pool.
+    """
+    from . import TestRobot
+
+    global ROBOT
+    ROBOT = TestRobot(name, BuiltIn=False)
+    for lib, args, alias in imports:
+        ROBOT.Import(lib, args, alias)
+
+
+def run_part(path_part_options):
+    """Reduce the test suite from `path` to the given `part`
+       (see :func:`split_suite`) and run it with the worker's TestRobot.
+
+    - The suite is only built once per worker process
+      and reused for all parts the worker runs.
+      (Robot's running model can't be pickled for sending single parts,
+      and building child suites on their own
+      would lose the settings of the parent suite's init file.)
+
+    :returns: The test run result as output XML data.
+    """
+    path, (kind, index), options = path_part_options
+    try:
+        suite, suites, tests = SUITES[path]
+    except KeyError:
+        suite = TestSuiteBuilder().build(path)
+        suites, tests = list(suite.suites), list(suite.tests)
+        SUITES[path] = suite, suites, tests
+    if kind == 'suites':
+        suite.suites = [suites[index]]
+        suite.tests = []
+    else:
+        suite.suites = []
+        suite.tests = [tests[index]]
+    result = ROBOT._run_suite(suite, **options)
+    return TestResult(result).output_xml
+
+
+def merge_results(results):
+    """Merge the ``robot.result.Result`` objects of all suite parts
+       into the first one.
+
+    :raises ValueError: If there are no `results` to merge.
+    """
+    if not results:
+        raise ValueError("No test suite results to merge.")
+
+    merged = results[0]
+    suite = merged.suite
+    for result in results[1:]:
+        suite.suites.extend(list(result.suite.suites))
+        suite.tests.extend(list(result.suite.tests))
+        suite.starttime = min(suite.starttime, result.suite.starttime)
+        suite.endtime = max(suite.endtime, result.suite.endtime)
+        merged.errors.messages.extend(list(result.errors.messages))
+    return merged
+
+
+def run_parallel(testrobot, path, workers, options):
+    """Run the test suite from `path` in a pool of `workers` processes,
+       each having its own TestRobot with the same imports as `testrobot`.
+
+    - The suite is split into its child suites or tests,
+      which means that setup and teardown of the top level suite
+      are run once for every part.
+
+    :returns: The merged ``robot.result.Result`` of all parts.
+    """
+    # output files are only written by the parent process
+    options = dict((key, value) for key, value in dictitems(options)
+                   if key not in ('output', 'log', 'report'))
+    parts = split_suite(TestSuiteBuilder().build(path))
+    pool = Pool(workers, init_worker, (testrobot.name, testrobot._imports))
+    try:
+        outputs = pool.map(run_part, [
+            (path, part, options) for part in parts])
+    finally:
+        pool.close()
+        pool.join()
+    return merge_results([ExecutionResult(xml) for xml in outputs])
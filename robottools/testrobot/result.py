@@ -23,14 +23,13 @@ Test run result wrapper for :class:`robottools.TestRobot`.
 
 .. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
 """
-from six import PY3
+from six import PY2
 
-__all__ = ['TestResult']
+__all__ = ['TestResult', 'KeywordCallResult']
 
-if PY3:
-    from io import StringIO
-else:
-    from io import BytesIO as StringIO
+import io
+from collections import namedtuple
+from io import StringIO
 
 from moretools import isstring
 
@@ -40,17 +39,34 @@ from robot.reporting.resultwriter import Results
 
 
 class Buffer(StringIO):
-    """Byte stream buffer class to be used for getting data
+    """Text stream buffer class to be used for getting data
        from :class:`robot.reporting.ResultWriter` interfaces.
 
     - ResultWriter normally expects file paths or file streams
       and closes them after writing data to them.
     """
+    def write(self, data):
+        """Write text `data` or UTF-8 encoded byte string `data`.
+        """
+        if isinstance(data, bytes): # PY2 with Robot < 3.0
+            data = data.decode('utf-8')
+        return StringIO.write(self, data)
+
     def close(self):
         """Dummy method to prevent the buffer from getting closed.
         """
         pass
 
+    def getdata(self):
+        """Get the written data as text string
+           or as UTF-8 encoded byte string on PY2,
+           like the :class:`TestResult` output properties always returned.
+        """
+        data = self.getvalue()
+        if PY2:
+            return data.encode('utf-8')
+        return data
+
 
 class TestResult(object):
     """robotshell wrapper interface for robot test run results.
@@ -81,7 +97,9 @@ class TestResult(object):
             # get data from related property
             data = getattr(self, '%s_%s' % (output, format))
             if isstring(file): # file path?
-                with open(file, 'w') as f:
+                if isinstance(data, bytes): # PY2
+                    data = data.decode('utf-8')
+                with io.open(file, 'w', encoding='utf-8') as f:
                     f.write(data)
             else: # stream
                 file.write(data)
@@ -103,19 +121,20 @@ class TestResult(object):
 
     @property
     def output_xml(self):
-        """Return the test run result as XML data (byte string),
+        """Return the test run result as XML data
+           (text string or UTF-8 byte string on PY2),
            like it gets written to output.xml files by robot.
 
         - Adapted from :meth:`robot.reporting.ReportWriter.write_results`
         """
         xml = Buffer()
         self.writer._write_output(self.robot_result, xml)
-        xml.seek(0)
-        return xml.read()
+        return xml.getdata()
 
     @property
     def log_html(self):
-        """Return the test run log as HTML data (byte string),
+        """Return the test run log as HTML data
+           (text string or UTF-8 byte string on PY2),
            like it gets written to log.html files by robot.
 
         - Adapted from :meth:`robot.reporting.ReportWriter.write_results`
@@ -127,12 +146,12 @@ class TestResult(object):
         self.writer._write_log(
           Results(self.settings, self.robot_result).js_result,
           html, log_config)
-        html.seek(0)
-        return html.read()
+        return html.getdata()
 
     @property
     def report_html(self):
-        """Return the test run log as HTML data (byte string),
+        """Return the test run log as HTML data
+           (text string or UTF-8 byte string on PY2),
            like it gets written to log.html files by robot.
 
         - Adapted from :meth:`robot.reporting.ReportWriter.write_results`
@@ -144,5 +163,22 @@ class TestResult(object):
         self.writer._write_report(
           Results(settings, self.robot_result).js_result,
           html, report_config)
-        html.seek(0)
-        return html.read()
+        return html.getdata()
+
+
+class KeywordCallResult(namedtuple(
+        'KeywordCallResult', ['name', 'passed', 'value', 'error'])):
+    """The result of a single Keyword call
+       from :meth:`robottools.TestRobot.run_many`.
+
+    - `name` is the Keyword's name as defined by its Test Library.
+    - `value` is the Keyword's return value (``None`` on FAIL).
+    - `error` is the ``robot.errors.ExecutionFailed`` exception
+      of a FAILed Keyword (``None`` on PASS).
+    """
+    __slots__ = ()
+
+    def __bool__(self):
+        return self.passed
+
+    __nonzero__ = __bool__
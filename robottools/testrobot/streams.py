@@ -0,0 +1,108 @@
+# robotframework-tools
+#
+# Python Tools for Robot Framework and Test Libraries.
+#
+# Copyright (C) 2013-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# robotframework-tools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# robotframework-tools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with robotframework-tools. If not, see <http://www.gnu.org/licenses/>.
+
+"""robottools.testrobot.streams
+
+Per-thread redirection of ``sys.stdout`` and ``sys.stderr``,
+for running Keywords in multiple threads at the same time,
+like RemoteRobot does with `workers`.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+__all__ = ['ThreadLocalStream']
+
+import sys
+import threading
+
+from six import StringIO
+
+
+class ThreadLocalStream(object):
+    """Replacement for ``sys.stdout`` or ``sys.stderr``,
+       which holds a separate stack of redirection targets
+       for every thread.
+
+    - Threads without redirection write to the original `stream`.
+    - Robot's output capturing of Keywords also redirects per thread
+      if installed. See :mod:`robottools.testrobot.context`.
+    """
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    @classmethod
+    def install(cls):
+        """Replace ``sys.stdout`` and ``sys.stderr``
+           with :class:`ThreadLocalStream` instances.
+
+        :returns: The original ``(sys.stdout, sys.stderr)`` pair.
+        """
+        streams = sys.stdout, sys.stderr
+        if not isinstance(sys.stdout, cls):
+            sys.stdout = cls(sys.stdout)
+        if not isinstance(sys.stderr, cls):
+            sys.stderr = cls(sys.stderr)
+        return streams
+
+    @property
+    def _targets(self):
+        try:
+            return self._local.targets
+        except AttributeError:
+            targets = self._local.targets = []
+            return targets
+
+    @property
+    def target(self):
+        """The stream to write to from the current thread.
+        """
+        targets = self._targets
+        if targets:
+            return targets[-1]
+        return self.stream
+
+    def push(self, stream):
+        """Redirect the output of the current thread to `stream`.
+        """
+        self._targets.append(stream)
+
+    def pop(self):
+        """Undo the last :meth:`.push` of the current thread.
+
+        :returns: The previous target stream.
+        """
+        return self._targets.pop()
+
+    def intercept(self):
+        """Start buffering the output of the current thread.
+        """
+        self.push(StringIO())
+
+    def restore(self):
+        """Stop buffering the output of the current thread.
+
+        :returns: The buffered output.
+        """
+        return self.pop().getvalue()
+
+    def write(self, data):
+        self.target.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
@@ -0,0 +1,66 @@
+import gc
+from timeit import timeit
+
+from robottools.testrobot.handler import Handler
+
+import pytest
+
+
+class TestHandler(object):
+    """Tests for :class:`robottools.testrobot.handler.Handler`.
+    """
+    def test__getitem__(self, robot):
+        handler = robot._get_handler('ShouldBeEqual')
+        assert isinstance(handler, Handler)
+        handlercls = type(handler).__bases__[1]
+        assert Handler[handlercls] is type(handler)
+        # check that all other handlers of the same RFW class
+        # get the same wrapper class
+        for name in ['Log', 'ShouldBeTrue', 'ConvertToInteger']:
+            assert type(robot._get_handler(name)) is Handler[handlercls]
+
+    def test__getitem__weak(self):
+        class RobotHandler(object):
+            def resolve_arguments(self, args, variables=None):
+                pass
+
+        wrappercls = Handler[RobotHandler]
+        assert Handler[RobotHandler] is wrappercls
+        # check that the cache doesn't keep unused wrapper classes alive
+        del wrappercls
+        gc.collect()
+        assert RobotHandler not in Handler._wrapper_classes
+
+    def test__getitem__cached(self):
+        class RobotHandler(object):
+            def resolve_arguments(self, args, variables=None):
+                pass
+
+        # keep a wrapped instance alive
+        handler = RobotHandler()
+        handler.__class__ = Handler[RobotHandler]
+        # check that the wrapper class is only created once
+        assert Handler[RobotHandler] is type(handler)
+        assert Handler._create(RobotHandler) is not type(handler)
+        assert Handler[RobotHandler] is type(handler)
+
+    @pytest.mark.benchmark
+    def test__getitem__benchmark(self):
+        """Compare the cost of getting a wrapper class
+        with (`Handler[...]`) and without cache (`Handler._create(...)`).
+        """
+        class RobotHandler(object):
+            def resolve_arguments(self, args, variables=None):
+                pass
+
+        # keep a wrapped instance alive during the benchmark
+        handler = RobotHandler()
+        handler.__class__ = Handler[RobotHandler]
+
+        number = 1000
+        uncached = timeit(lambda: Handler._create(RobotHandler),
+                          number=number)
+        cached = timeit(lambda: Handler[RobotHandler], number=number)
+        print("Handler wrapper class per call: %.2fus uncached, "
+              "%.2fus cached"
+              % (uncached / number * 1e6, cached / number * 1e6))
@@ -1,9 +1,20 @@
+import sys
+from threading import Thread, Event
+
 import zetup
 from moretools import camelize
 
+from robot.errors import ExecutionFailed
 from robot.utils import normalize
+from robot.api import ExecutionResult
+from robot.running import EXECUTION_CONTEXTS, TestSuiteBuilder
+from robot.running.statusreporter import StatusReporter
 
 import robottools.testrobot
+from robottools.testrobot import parallel
+from robottools.testrobot.parallel import merge_results, run_part
+from robottools.testrobot.result import TestResult
+from robottools.testrobot.streams import ThreadLocalStream
 
 import pytest
 
@@ -102,3 +113,236 @@ class TestRobot(object):
         # from imported standard Library works
         self.check__getattr__Keyword(
             robot_no_BuiltIn, stdlibname, stdlib_kwfuncnames)
+
+    def test__getitem__index(self, robot_no_BuiltIn, stdlibname,
+                             stdlib_kwfuncnames
+    ):
+        libraries = robot_no_BuiltIn._libraries
+        assert isinstance(
+            libraries, robottools.testrobot.libraries.LibrariesDict)
+        for name in map(camelize, stdlib_kwfuncnames):
+            keyword = robot_no_BuiltIn[name]
+            assert keyword._handler is libraries.handlers[name]
+        # check that (re)imports invalidate the Keyword index
+        robot_no_BuiltIn.Import('BuiltIn')
+        assert libraries._handlers is None
+        assert robot_no_BuiltIn['ShouldBeEqual'].libname == 'BuiltIn'
+        # ... and also library reloads, which replace the library handlers
+        lib = libraries['BuiltIn']
+        handler = robot_no_BuiltIn['ShouldBeEqual']._handler
+        lib.reload()
+        assert libraries._handlers is None
+        assert robot_no_BuiltIn['ShouldBeEqual']._handler is not handler
+        assert robot_no_BuiltIn['ShouldBeEqual']._handler \
+            is lib.handlers['Should Be Equal']
+        del libraries['BuiltIn']
+        with pytest.raises(KeyError):
+            robot_no_BuiltIn['ShouldBeEqual']
+
+    def test_session(self, robot, monkeypatch):
+        context = robot._context
+        entered = []
+        monkeypatch.setattr(
+            robot._output, '__enter__',
+            lambda: entered.append(EXECUTION_CONTEXTS.current))
+        monkeypatch.setattr(robot._output, '__exit__', lambda *exc: None)
+
+        assert not context.active
+        with robot.session() as session:
+            assert session is robot
+            assert context.active
+            for _ in range(3):
+                assert robot.ConvertToInteger('42') == 42
+                assert EXECUTION_CONTEXTS.current is context
+        assert not context.active
+        assert EXECUTION_CONTEXTS.current is None
+        # the actual context setup was only done once
+        assert entered == [context]
+
+    def test_run_many(self, robot):
+        results = robot.run_many([
+            ('ConvertToInteger', ['42'], {}),
+            ('Should Be Equal', [1, 2], {}),
+            ('convert_to_integer', ['23'], {'base': 8}),
+        ])
+        assert [r.name for r in results] == [
+            'Convert To Integer', 'Should Be Equal', 'Convert To Integer']
+        assert [bool(r) for r in results] == [True, False, True]
+        assert [r.value for r in results] == [42, None, 19]
+        assert results[0].error is None
+        assert isinstance(results[1].error, ExecutionFailed)
+        assert str(results[1].error) == '1 != 2'
+
+        results = robot.run_many([
+            ('ShouldBeEqual', [1, 2], {}),
+            ('ConvertToInteger', ['42'], {}),
+        ], stop_on_failure=True)
+        assert len(results) == 1
+        assert not results[0].passed
+
+    def test_run_many_resolved(self, robot, tmpdir, monkeypatch):
+        path = tmpdir.join('EmbeddedLibrary.py')
+        path.write('\n'.join([
+            'from robot.api.deco import keyword',
+            '',
+            '@keyword("Add ${x} And ${y}")',
+            'def add(x, y):',
+            '    return int(x) + int(y)',
+        ]))
+        robot.Import(str(path))
+        # ==> the handlers are not looked up again on running
+        with robot.session():
+            namespace = robot._context.namespace
+            monkeypatch.setattr(namespace, 'get_runner', None)
+            results = robot.run_many([
+                ('Add 1 And 2', [], {}),
+                ('Should Be Equal', [3, 3], {}),
+            ])
+        assert [r.name for r in results] == [
+            'Add 1 And 2', 'Should Be Equal']
+        assert [r.value for r in results] == [3, None]
+        assert all(results)
+
+    def test_run_many_unknown(self, robot):
+        with pytest.raises(KeyError):
+            robot.run_many([
+                ('ConvertToInteger', ['42'], {}),
+                ('Unknown Keyword', [], {}),
+            ])
+
+    def test_threads(self, robot):
+        robots = [robot, robottools.testrobot.TestRobot('Other')]
+        entered = [Event() for _ in robots]
+        results = {}
+
+        def run(index):
+            robot = robots[index]
+            with robot.session():
+                robot.SetGlobalVariable('${WHO}', robot.name)
+                entered[index].set()
+                # wait until the other thread has entered its context, too
+                for event in entered:
+                    event.wait(10)
+                results[robot.name] = (
+                    EXECUTION_CONTEXTS.current is robot._context,
+                    robot.GetVariableValue('${WHO}'))
+
+        threads = [Thread(target=run, args=(i, )) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        assert results == {'Test': (True, 'Test'), 'Other': (True, 'Other')}
+        # the main thread is not affected
+        assert EXECUTION_CONTEXTS.current is None
+
+    def test_shared_threads(self, robot):
+        robot.debug = True
+        entered = Event()
+        results = {}
+
+        def run(index):
+            with robot.session():
+                # wait until all threads are inside the shared context
+                entered.wait(10)
+                value = robot.ConvertToInteger(str(index))
+                try:
+                    robot.ShouldBeEqual(index, -1)
+                except AssertionError:
+                    # ==> debug mode raises the actual exception
+                    results[index] = (value, robot._context.active)
+
+        threads = [Thread(target=run, args=(i, )) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        entered.set()
+        for thread in threads:
+            thread.join(10)
+        assert results == dict((i, (i, True)) for i in range(4))
+        assert not robot._context.active
+        assert not robot._output._streams
+        assert EXECUTION_CONTEXTS.current is None
+
+        # debug mode is left again
+        # ==> the debugging monkey patches are removed
+        assert vars(StatusReporter)['_get_failure'] \
+            is robottools.testrobot.keyword._get_failure
+        # ==> normal Keyword FAILs are only logged
+        robot.debug = False
+        assert robot.ShouldBeEqual(1, 2) is None
+
+    def test_Run_workers(self, robot, tmpdir):
+        for name, tests in [('first', ['1    1', '1    2']),
+                            ('second', ['3    3'])]:
+            tmpdir.join('%s.robot' % name).write('\n'.join(
+                ['*** Test Cases ***'] + [
+                    'Test %d\n    Should Be Equal    %s' % (i, test)
+                    for i, test in enumerate(tests)]))
+
+        expected = robot.Run(str(tmpdir)).robot_result
+        result = robot.Run(str(tmpdir), workers=2).robot_result
+        assert [suite.name for suite in result.suite.suites] \
+            == [suite.name for suite in expected.suite.suites] \
+            == ['First', 'Second']
+        assert [[test.status for test in suite.tests]
+                for suite in result.suite.suites] \
+            == [['PASS', 'FAIL'], ['PASS']]
+        assert result.return_code == expected.return_code == 1
+        with pytest.raises(ValueError):
+            merge_results([])
+        # (byte string on PY2 and text string on PY3)
+        assert type(TestResult(expected).output_xml) is str
+
+    def test_run_part(self, robot, tmpdir, monkeypatch):
+        tmpdir.join('first.robot').write(
+            '*** Test Cases ***\nTest\n    Should Be Equal    1    1')
+        tmpdir.join('second.robot').write(
+            '*** Test Cases ***\nTest\n    Should Be Equal    1    2')
+        builds = []
+        build = TestSuiteBuilder.build
+
+        def counting_build(self, *paths):
+            builds.append(paths)
+            return build(self, *paths)
+
+        monkeypatch.setattr(TestSuiteBuilder, 'build', counting_build)
+        monkeypatch.setattr(parallel, 'ROBOT', robot)
+        monkeypatch.setattr(parallel, 'SUITES', {})
+        path = str(tmpdir)
+        outputs = [run_part((path, part, {}))
+                   for part in [('suites', 1), ('suites', 0)]]
+        # ==> the suite is only built once per worker
+        assert builds == [(path, )]
+        result = merge_results([ExecutionResult(xml) for xml in outputs])
+        assert [(suite.name, suite.status) for suite in result.suite.suites] \
+            == [('Second', 'FAIL'), ('First', 'PASS')]
+
+
+def test_thread_local_stream(robot, monkeypatch):
+    monkeypatch.setattr(sys, 'stdout', sys.stdout)
+    monkeypatch.setattr(sys, 'stderr', sys.stderr)
+    stdout, stderr = ThreadLocalStream.install()
+    assert isinstance(sys.stdout, ThreadLocalStream)
+    assert sys.stdout.stream is stdout and sys.stderr.stream is stderr
+    assert ThreadLocalStream.install() == (sys.stdout, sys.stderr)
+
+    outputs = {}
+
+    def run(index):
+        sys.stdout.intercept()
+        for _ in range(100):
+            sys.stdout.write(str(index))
+            # Robot's output capturing only redirects the current thread
+            robot.Log('%d' % index)
+        outputs[index] = sys.stdout.restore()
+
+    threads = [Thread(target=run, args=(i, )) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert set(outputs) == set(range(4))
+    for index, output in outputs.items():
+        assert output == ('%d[ INFO ]  %d\n' % (index, index)) * 100
+    assert sys.stdout.target is stdout
+    assert isinstance(sys.stdout, ThreadLocalStream)
@@ -1,6 +1,12 @@
+import sys
+from importlib import import_module
 from six import PY3, text_type as unicode
-from time import sleep
+from time import sleep, time
+from threading import Event, Thread
+from textwrap import dedent
+from subprocess import Popen
 
+import zetup
 from decorator import decorate
 from moretools import isstring
 
@@ -9,6 +15,18 @@ from robottools import TestRobot
 import pytest
 
 
+def import_remote(name=''):
+    """Import ``robottools.remote`` or its submodule `name`,
+    or skip the calling test if the ``robotremoteserver`` requirement
+    is not installed or not compatible with this Python version.
+    """
+    try:
+        return import_module('robottools.remote' + (name and '.' + name))
+    except (ImportError, SyntaxError,
+            zetup.DistributionNotFound, zetup.VersionConflict) as e:
+        pytest.skip("robottools.remote is not usable: %s" % e)
+
+
 def check_process(func):
     """Decorator for ``TestRemoteRobot.test_...`` methods
     to check if the external ``RemoteRobot`` process is still running,
@@ -98,3 +116,412 @@ class TestRemoteRobot(object):
 if PY3:
     # robotremoteserver is not PY3-compatible yet
     del TestRemoteRobot
+
+
+def test_RemoteLibrary():
+    RemoteLibrary = import_remote('library').RemoteLibrary
+    robot = TestRobot('Test', BuiltIn=False)
+    robot.Import('BuiltIn')
+    library = RemoteLibrary(robot)
+    specs = library.specs
+    assert library.get_keyword_names() == list(specs)
+    assert 'Convert To Integer' in specs
+    assert library.get_keyword_arguments('Convert To Integer') \
+        == ['item', 'base=None']
+    assert library.get_keyword_documentation('Convert To Integer') \
+        == robot.ConvertToInteger.doc
+    assert library.run_keyword('Convert To Integer', '42') == 42
+    assert library.specs is specs
+    information = library.get_library_information()
+    assert set(information) == set(specs)
+    assert information['Convert To Integer'] == {
+        'args': ['item', 'base=None'], 'tags': [],
+        'doc': robot.ConvertToInteger.doc}
+    # other spellings are looked up in the libraries
+    assert library.get_keyword_arguments('convert_to_integer') \
+        == ['item', 'base=None']
+    with pytest.raises(KeyError):
+        library.spec('BuiltIn')
+
+    # library changes are detected
+    robot.Import('Collections')
+    assert library.specs is not specs
+    assert 'Copy List' in library.get_keyword_names()
+    # ... also library reloads
+    specs = library.specs
+    keyword = library.spec('Copy List').keyword
+    robot._libraries['Collections'].reload()
+    assert library.specs is not specs
+    assert library.spec('Copy List').keyword._handler \
+        is not keyword._handler
+
+
+THREADED_LIBRARIES = {
+    'ParallelLibrary': """
+import time
+
+
+def wait(seconds):
+    time.sleep(float(seconds))
+    return 'waited'
+""",
+    'LockedLibrary': """
+import time
+
+
+def wait_locked(seconds):
+    time.sleep(float(seconds))
+    return 'waited'
+""",
+    'UnsafeLibrary': """
+import time
+
+ROBOT_LIBRARY_THREAD_SAFE = False
+
+
+def wait_unsafe(seconds):
+    time.sleep(float(seconds))
+    return 'waited'
+""",
+}
+
+
+def run_parallel(url, name, args, count):
+    """Run Keyword `name` with `args` from `count` parallel clients
+    of the server at `url`.
+
+    :returns: The results and the total time.
+    """
+    from six.moves.xmlrpc_client import ServerProxy
+
+    results = []
+    clients = [Thread(target=lambda: results.append(
+        ServerProxy(url).run_keyword(name, args, {})))
+        for _ in range(count)]
+    start = time()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join(10)
+    return results, time() - start
+
+
+def test_RemoteRobot_workers(tmpdir):
+    remote = import_remote()
+    if not remote.LEGACY_SERVER:
+        pytest.skip("RemoteRobot needs robotremoteserver 1.0.x")
+
+    for name, source in THREADED_LIBRARIES.items():
+        tmpdir.join(name + '.py').write(dedent(source))
+    port_file = tmpdir.join('port')
+    process = Popen([
+        sys.executable, '-c',
+        "import sys; sys.path.insert(0, %r); "
+        "__import__('robottools.remote').remote.RemoteRobot("
+        "    ['BuiltIn', %s], port=0, port_file=%r,"
+        "    workers=4, locked_libraries=['LockedLibrary'])"
+        % (str(tmpdir), ', '.join(map(repr, sorted(THREADED_LIBRARIES))),
+           str(port_file))])
+    try:
+        for _ in range(100):
+            if port_file.check() and port_file.read():
+                break
+            assert process.poll() is None, \
+                "RemoteRobot process is not running (anymore)."
+            sleep(0.1)
+        url = 'http://127.0.0.1:%s' % port_file.read()
+
+        # Keywords of thread-safe libraries run in parallel
+        results, duration = run_parallel(url, 'Wait', ['0.5'], 4)
+        assert results == [{'status': 'PASS', 'return': 'waited'}] * 4
+        assert duration < 1.5
+        # ==> unless listed in `locked_libraries`
+        results, duration = run_parallel(url, 'Wait Locked', ['0.3'], 3)
+        assert results == [{'status': 'PASS', 'return': 'waited'}] * 3
+        assert duration >= 0.9
+        # ==> or declared as not thread-safe
+        results, duration = run_parallel(url, 'Wait Unsafe', ['0.3'], 3)
+        assert results == [{'status': 'PASS', 'return': 'waited'}] * 3
+        assert duration >= 0.9
+
+        from six.moves.xmlrpc_client import ServerProxy
+        assert ServerProxy(url).stop_remote_server() is True
+        process.wait()
+    finally:
+        if process.poll() is None:
+            process.terminate()
+
+
+def test_RemoteRobot_legacy_server():
+    remote = import_remote()
+    if remote.LEGACY_SERVER:
+        pytest.skip("robotremoteserver 1.0.x is installed")
+
+    with pytest.raises(RuntimeError) as exc:
+        remote.RemoteRobot(
+            ['BuiltIn'], port=0, workers=2,
+            locked_libraries=['BuiltIn'])
+    assert 'AsyncRemoteRobot' in str(exc.value)
+
+
+ASYNC_LIBRARY = """
+import asyncio
+
+
+class AsyncLibrary(object):
+
+    async def wait(self, seconds):
+        await asyncio.sleep(float(seconds))
+        return 'waited'
+
+    async def fail_async(self):
+        await asyncio.sleep(0)
+        raise ValueError('failed')
+
+    def sync_echo(self, value):
+        print('echo')
+        return value
+"""
+
+
+def serve_async(tmpdir, monkeypatch, **kwargs):
+    """Start an ``AsyncRemoteRobot`` serving ``ASYNC_LIBRARY``
+    in a daemon thread.
+
+    :returns: The server thread and URL.
+    """
+    AsyncRemoteRobot = import_remote('aio').AsyncRemoteRobot
+
+    tmpdir.join('AsyncLibrary.py').write(dedent(ASYNC_LIBRARY))
+    monkeypatch.syspath_prepend(str(tmpdir))
+    port_file = tmpdir.join('port')
+    server = Thread(target=AsyncRemoteRobot, args=(
+        ['BuiltIn', 'AsyncLibrary'], ), kwargs=dict(
+            port=0, port_file=str(port_file), **kwargs))
+    server.daemon = True
+    server.start()
+    for _ in range(100):
+        if port_file.check() and port_file.read():
+            break
+        sleep(0.1)
+    return server, 'http://127.0.0.1:%s' % port_file.read()
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 5), reason="asyncio backend needs Python 3.5+")
+def test_AsyncRemoteRobot(tmpdir, monkeypatch):
+    from xmlrpc.client import ServerProxy
+    from robottools.remote.client import Remote
+
+    server, url = serve_async(
+        tmpdir, monkeypatch, workers=1, allow_import=['Collections'])
+    proxy = ServerProxy(url)
+
+    result = proxy.run_keyword('Sync Echo', ['value'], {})
+    assert result['status'] == 'PASS' and result['return'] == 'value'
+    assert 'echo' in result['output']
+    result = proxy.run_keyword('Fail Async', [], {})
+    assert result['status'] == 'FAIL' and result['error'] == \
+        'ValueError: failed'
+
+    # async Keywords don't need a worker thread while waiting
+    results = []
+    clients = [Thread(target=lambda: results.append(
+        ServerProxy(url).run_keyword('Wait', ['0.5'], {})))
+        for _ in range(5)]
+    start = time()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join(10)
+    assert time() - start < 2
+    assert results == [{'status': 'PASS', 'return': 'waited'}] * 5
+
+    # the standard Remote client library works
+    robot = TestRobot('Test', BuiltIn=False)
+    robot.Import('Remote', [url])
+    assert robot.ConvertToInteger('42') == 42
+    assert robot.Wait('0') == 'waited'
+
+    # all Keyword metadata can be requested at once
+    information = proxy.get_library_information()
+    assert information['Wait'] == {
+        'args': ['seconds'], 'doc': '', 'tags': []}
+    assert information['Import Remote Library']['args'] == ['name']
+    assert set(information) == set(proxy.get_keyword_names())
+
+    # ==> used by the extended client library
+    remote = Remote(url)
+    assert set(remote.get_keyword_names()) == set(information)
+    assert remote.get_keyword_arguments('Wait') == ['seconds']
+    assert remote.get_library_information() is remote._information
+    robot = TestRobot('Test', BuiltIn=False)
+    robot.Import('robottools.remote.client.Remote', [url])
+    assert robot.Wait('0') == 'waited'
+
+    # ==> which falls back to per Keyword calls
+    remote = Remote(url)
+    monkeypatch.setattr(remote, '_get_library_information', lambda: (
+        proxy.no_library_information()))
+    assert set(remote.get_keyword_names()) == set(information)
+    assert remote.get_keyword_arguments('Wait') == ['seconds']
+    assert remote._information is False
+
+    assert 'Copy List' not in proxy.get_keyword_names()
+    result = proxy.run_keyword('Import Remote Library', ['Collections'], {})
+    assert result['status'] == 'PASS'
+    assert 'Copy List' in proxy.get_keyword_names()
+    assert proxy.get_keyword_arguments('Copy List') == ['list_']
+
+    assert proxy.stop_remote_server() is True
+    server.join(10)
+    assert not server.is_alive()
+
+
+def check_compression(url):
+    """Check that a large response from the server at `url`
+    is gzipped for clients accepting it.
+    """
+    from six.moves import http_client
+    from six.moves.urllib.parse import urlsplit
+    from six.moves.xmlrpc_client import dumps
+
+    connection = http_client.HTTPConnection(urlsplit(url).netloc)
+    for accept_encoding, content_encoding in [
+            ('gzip', 'gzip'), ('identity', None)]:
+        connection.request(
+            'POST', '/RPC2',
+            dumps(('Sync Echo', ['x' * 10000]), 'run_keyword'),
+            {'Content-Type': 'text/xml',
+             'Accept-Encoding': accept_encoding})
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 200
+        assert response.getheader('content-encoding') == content_encoding
+    connection.close()
+
+
+def serve_xmlrpc(functions, keep_alive=False):
+    """Start a ``SimpleXMLRPCServer`` with a ``RemoteRequestHandler``
+    serving the given name -> function mapping in a daemon thread.
+
+    :returns: The server and its URL.
+    """
+    from six.moves.xmlrpc_server import SimpleXMLRPCServer
+    transport = import_remote('transport')
+
+    class Handler(transport.RemoteRequestHandler):
+        protocol_version = 'HTTP/1.1' if keep_alive else 'HTTP/1.0'
+
+    server = SimpleXMLRPCServer(
+        ('127.0.0.1', 0), requestHandler=Handler, logRequests=False)
+    for name, func in functions.items():
+        server.register_function(func, name)
+    thread = Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, 'http://127.0.0.1:%d' % server.server_address[1]
+
+
+def test_RemoteRequestHandler():
+    transport = import_remote('transport')
+    server, url = serve_xmlrpc({
+        'run_keyword': lambda name, args: args[0]})
+    try:
+        check_compression(url)
+        proxy = transport.ServerProxy(url, binary=False)
+        assert proxy.run_keyword('Echo', ['x' * 10000]) == 'x' * 10000
+        if transport.msgpack is not None:
+            proxy = transport.ServerProxy(url)
+            assert proxy.run_keyword('Echo', [b'\x00' * 10000]) \
+                == b'\x00' * 10000
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_ServerProxy_timeout():
+    import socket
+    transport = import_remote('transport')
+    calls = []
+    release = Event()
+
+    def slow():
+        calls.append(True)
+        release.wait(10)
+        return True
+
+    server, url = serve_xmlrpc({
+        'fast': lambda: True, 'slow': slow}, keep_alive=True)
+    try:
+        proxy = transport.ServerProxy(url, binary=False, timeout=0.3)
+        # ==> the next request is sent over the kept-alive connection
+        assert proxy.fast() is True
+        assert proxy._connection is not None
+        # requests which might have reached the server are not resent
+        with pytest.raises(socket.timeout):
+            proxy.slow()
+        release.set()
+        # (a resent request would be handled before this one)
+        assert transport.ServerProxy(url, binary=False).fast() is True
+        assert calls == [True]
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 5), reason="asyncio backend needs Python 3.5+")
+@pytest.mark.parametrize('binary', [False, True])
+def test_transport(tmpdir, monkeypatch, binary):
+    transport = import_remote('transport')
+    from robottools.remote.client import Remote
+
+    if binary and transport.msgpack is None:
+        pytest.skip("msgpack is not installed")
+
+    server, url = serve_async(tmpdir, monkeypatch)
+    check_compression(url)
+
+    # plain XML-RPC clients are not affected
+    remote = Remote(url)
+    assert 'Sync Echo' in remote.get_keyword_names()
+    assert remote._transport is False
+
+    # ==> the transport is opt-in
+    remote = Remote(url, binary=str(binary), compress='True')
+    assert 'Sync Echo' in remote.get_keyword_names()
+    proxy = remote._transport
+    assert isinstance(proxy, transport.ServerProxy)
+    assert proxy.compress is True
+    assert proxy.content_type == (
+        transport.MSGPACK_CONTENT_TYPE if binary
+        else transport.XMLRPC_CONTENT_TYPE)
+    assert remote.run_keyword('Sync Echo', ['x' * 10000], {}) \
+        == 'x' * 10000
+    assert remote.run_keyword('Wait', ['0'], {}) == 'waited'
+    assert remote.run_keyword('Convert To Bytes', ['00 ff', 'hex'], {}) \
+        == b'\x00\xff'
+    with pytest.raises(Exception) as exc:
+        remote.run_keyword('Fail Async', [], {})
+    assert str(exc.value) == 'ValueError: failed'
+
+    assert proxy.stop_remote_server() is True
+    server.join(10)
+    assert not server.is_alive()
+
+
+def test_transport_helpers():
+    transport = import_remote('transport')
+    data = b'x' * (transport.GZIP_THRESHOLD + 1)
+    assert transport.compress(data, 'gzip;q=0') == (data, None)
+    assert transport.compress(data[1:], 'gzip') == (data[1:], None)
+    compressed, encoding = transport.compress(data, 'deflate, gzip')
+    assert encoding == 'gzip' and len(compressed) < len(data)
+    assert transport.decompress(compressed, 'gzip') == data
+    assert transport.decompress(data, None) == data
+    with pytest.raises(ValueError):
+        transport.decompress(data, 'br')
+    with pytest.raises(ValueError):
+        transport.decompress(data, 'gzip')
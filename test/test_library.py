@@ -1,6 +1,18 @@
+from copy import copy
+from gc import collect
+from threading import Event, Lock, Thread
+from timeit import timeit
+
+from decorator import decorate
+
 import pytest
 
-from robottools import testlibrary, istestlibraryclass
+from robottools import (
+    testlibrary, istestlibraryclass, TestLibraryType,
+    SessionHandler, ContextHandler, ActiveContexts, contextmethod)
+from robottools import memoized, batch, RobotBool
+from robottools.library.keywords import KeywordName, KeywordsDict
+from robottools.library.keywords.argtypes import ArgTypes
 
 
 def test_testlibrary():
@@ -36,3 +48,580 @@ def test_testlibrary():
         with pytest.raises(RuntimeError) as e:
             method(*args)
         assert str(e.value).strip().endswith('base __init__ called?')
+
+
+def test_explicit_session_and_context_options():
+    """Test explicit <session>= and <context>= Keyword options.
+    """
+    class Device(SessionHandler):
+        class Meta:
+            auto_explicit = True
+
+        def open(self, address):
+            return address
+
+    class Mode(ContextHandler):
+        contexts = ['fast', 'slow']
+        auto_explicit = True
+
+    TestLibrary = testlibrary(
+        session_handlers=[Device], context_handlers=[Mode])
+
+    class Library(TestLibrary):
+        @TestLibrary.keyword
+        def speed(self, value=None):
+            return 'normal', self.device, value
+
+        @TestLibrary.keyword
+        @Mode.slow
+        def speed(self, value=None):
+            return 'slow', self.device, value
+
+    lib = Library()
+    lib.OpenNamedDevice('first', 'one')
+    lib.OpenNamedDevice('second', 'two')
+    # fast path without switching options
+    assert lib.Speed() == ('normal', 'two', None)
+    assert lib.Speed(value=1) == ('normal', 'two', 1)
+    # full path with explicit switching
+    assert lib.Speed(device='first', mode='slow') == ('slow', 'one', None)
+    assert lib.Speed(2, device='first') == ('normal', 'one', 2)
+    # previous session and context were restored
+    assert lib.device == 'two'
+    assert lib.mode == 'fast'
+    with pytest.raises(Device.SessionError):
+        lib.Speed(device='third')
+
+
+def test_active_contexts(monkeypatch):
+    """Test switching and reading active contexts.
+    """
+    class Mode(ContextHandler):
+        contexts = ['fast', 'slow']
+
+    class Color(ContextHandler):
+        contexts = ['red', 'green']
+        default = 'green'
+
+    TestLibrary = testlibrary(context_handlers=[Mode, Color])
+    lib = TestLibrary()
+    assert lib.mode == 'fast' and lib.color == 'green'
+    assert Mode.fast in lib.contexts and Mode.slow not in lib.contexts
+    assert lib.contexts[Color] is Color.green
+
+    # ==> activating only updates the index of the switched handler
+    monkeypatch.setattr(ActiveContexts, '_reindex', None)
+    lib.SwitchMode('slow')
+    monkeypatch.undo()
+    assert lib.mode == 'slow' and lib.color == 'green'
+    assert Mode.slow in lib.contexts and Mode.fast not in lib.contexts
+    assert sorted(lib.contexts, key=repr) == [Color.green, Mode.slow]
+    with pytest.raises(Mode.ContextError):
+        lib.SwitchMode('unknown')
+    assert lib.mode == 'slow'
+
+    # ==> still usable like the plain list of active contexts
+    assert isinstance(lib.contexts, list)
+    lib.contexts.remove(Mode.slow)
+    lib.contexts.append(Mode.fast)
+    assert lib.mode == 'fast' and lib.contexts[-1] is Mode.fast
+    assert Mode.fast in lib.contexts and Mode.slow not in lib.contexts
+    lib.contexts[:] = [Mode.slow, Color.red]
+    assert lib.mode == 'slow' and lib.color == 'red'
+    assert list(lib.contexts) == [Mode.slow, Color.red]
+    # ==> also with duplicate contexts of a handler from plain list methods
+    lib.contexts.insert(0, Mode.fast)
+    lib.contexts.activate(Color.green)
+    assert lib.mode == 'slow' and lib.color == 'green'
+    lib.contexts.activate(Mode.fast)
+    assert lib.mode == 'fast' and Mode.slow not in lib.contexts
+
+
+def test_contextmethod():
+    """Test dispatching of context specific method implementations.
+    """
+    class Backend(ContextHandler):
+        contexts = ['first', 'second']
+
+    TestLibrary = testlibrary(context_handlers=[Backend])
+
+    class Library(TestLibrary):
+        @contextmethod(Backend)
+        def query(self, value):
+            pass
+
+        @query.first
+        def query_first(self, value):
+            return 'first', value
+
+        @query.second
+        def query_second(self, value):
+            return 'second', value
+
+        @contextmethod.combined.parallel(Backend)
+        def parallel_query(self):
+            pass
+
+        @parallel_query.first
+        def parallel_query_first(self):
+            return overlap(started[0], started[1])
+
+        @parallel_query.second
+        def parallel_query_second(self):
+            return overlap(started[1], started[0])
+
+        @contextmethod.combined.parallel(Backend, workers=1)
+        def serial_query(self):
+            pass
+
+        @serial_query.first
+        def serial_query_first(self):
+            return overlap(started[0], started[1], timeout=0.1)
+
+        @serial_query.second
+        def serial_query_second(self):
+            return overlap(started[1], started[0], timeout=0.1)
+
+    def overlap(own, other, timeout=5):
+        """Signal the `own` start and wait for the `other` implementation.
+        """
+        own.set()
+        other.wait(timeout)
+        return other.is_set()
+
+    lib = Library()
+    assert lib.query(1) == ('first', 1)
+    lib.SwitchBackend('second')
+    assert lib.query(2) == ('second', 2)
+
+    # ==> both implementations run at the same time
+    started = [Event(), Event()]
+    assert lib.parallel_query() == {'first': True, 'second': True}
+    # ==> one worker runs them one after another
+    started = [Event(), Event()]
+    results = lib.serial_query()
+    assert sorted(results.values()) == [False, True]
+
+
+def test_session_registries():
+    """Test the per-instance and optionally per-thread session storage.
+    """
+    closed = []
+
+    class Device(SessionHandler):
+        def open(self, address):
+            return address
+
+        def close(self, device):
+            closed.append(device)
+
+    class Port(SessionHandler):
+        class Meta:
+            thread_local_session = True
+
+        def open(self, number):
+            return number
+
+    TestLibrary = testlibrary(session_handlers=[Device, Port])
+
+    first, second = TestLibrary(), TestLibrary()
+    first.OpenNamedDevice('one', 'first')
+    second.OpenNamedDevice('one', 'second')
+    assert first.device == 'first' and second.device == 'second'
+    assert first.devices == {'one': 'first'}
+    assert second.devices == {'one': 'second'}
+    # the handler's default registry is not affected
+    assert Device.session is None and Device.sessions == {}
+
+    # reverse lookup of session aliases
+    registry = first.session_registries['Device']
+    first.OpenNamedDevice('alias', 'first')
+    assert registry.name_of('first') in ('one', 'alias')
+    first.CloseDevice('alias')
+    assert registry.name_of('first') == 'one'
+    assert registry.name_of('unknown') is None
+    first.SwitchDevice('one')
+    del closed[:]
+
+    # opening an unnamed session doesn't close the named one
+    first.OpenDevice('unnamed')
+    assert first.device == 'unnamed' and not closed
+    # but switching closes the unnamed one
+    first.SwitchDevice('one')
+    assert first.device == 'first' and closed == ['unnamed']
+    first.CloseDevice()
+    assert not first.devices and closed == ['unnamed', 'first']
+    with pytest.raises(Device.SessionError):
+        first.device
+
+    lib = TestLibrary()
+    lib.OpenNamedPort('main', 1)
+    lib.OpenNamedPort('other', 2)
+    results = {}
+
+    def flow():
+        # the thread has no active session until it switches
+        results['initial'] = lib.session_registries['Port'].session
+        lib.SwitchPort('main')
+        results['switched'] = lib.port
+
+    thread = Thread(target=flow)
+    thread.start()
+    thread.join()
+    assert results == {'initial': None, 'switched': 1}
+    assert lib.port == 2
+    # closing a named session resets its active pointers in all threads
+    lib.ClosePort('other')
+    with pytest.raises(Port.SessionError):
+        lib.port
+
+
+def test_session_handler_helpers():
+    """Test the SessionHandler helper methods and class attributes.
+    """
+    class Device(SessionHandler):
+        def open(self, address):
+            return address
+
+    TestLibrary = testlibrary(session_handlers=[Device])
+    lib = TestLibrary()
+    # ==> helpers work on the library's sessions like the Keywords
+    Device.add_named_session('one', 'first', libinstance=lib)
+    assert lib.device == 'first' and lib.devices == {'one': 'first'}
+    assert Device.switch_session('one', libinstance=lib) == 'first'
+    assert Device.close_session(libinstance=lib) == 'first'
+    assert not lib.devices and Device.sessions == {}
+
+    # ==> the shared default registry is deprecated for the helpers
+    with pytest.warns(DeprecationWarning):
+        Device.add_session('shared')
+    assert Device.session == 'shared'
+    # ==> but the class attributes are still settable
+    Device.sessions = {'one': 'first'}
+    Device.session = 'first'
+    assert Device.session == 'first'
+    assert Device.registry.name_of('first') == 'one'
+    Device.session = None
+    Device.sessions = {}
+    assert Device.session is None and Device.sessions == {}
+
+
+def test_session_pool():
+    """Test reusing idle sessions with ``Meta.pool = True``.
+    """
+    opened = []
+    closed = []
+
+    class Connection(object):
+        def __init__(self, host):
+            self.host = host
+            self.healthy = True
+
+    class Client(SessionHandler):
+        class Meta:
+            pool = True
+            pool_size = 2
+
+        def open(self, host):
+            connection = Connection(host)
+            opened.append(connection)
+            return connection
+
+        def close(self, connection):
+            closed.append(connection)
+
+        def check(self, connection):
+            return connection.healthy
+
+    TestLibrary = testlibrary(session_handlers=[Client])
+    lib = TestLibrary()
+    pool = lib.session_registries['Client'].pool
+
+    lib.OpenClient('a')
+    first = lib.client
+    # replacing the unnamed session parks it instead of closing it
+    lib.OpenClient('b')
+    assert len(pool) == 1 and not closed
+    # and opening with the same arguments reuses it
+    lib.OpenClient('a')
+    assert lib.client is first and len(opened) == 2
+    lib.CloseClient()
+    lib.OpenNamedClient('named', 'a')
+    assert lib.client is first
+
+    # unhealthy idle sessions get closed instead of reused
+    lib.CloseClient()
+    first.healthy = False
+    lib.OpenClient('a')
+    assert lib.client is not first and closed == [first]
+
+    # exceeding the pool size closes the longest idle sessions
+    del closed[:]
+    for host in 'cde':
+        lib.OpenClient(host)
+    assert len(pool) == 2 and [c.host for c in closed] == ['b', 'a']
+    lib.CloseIdleClients()
+    assert not len(pool) \
+        and [c.host for c in closed] == ['b', 'a', 'c', 'd']
+
+    # idle sessions expire after the TTL
+    pool.ttl = 0
+    lib.OpenClient('f')
+    lib.OpenClient('e')
+    assert lib.client.host == 'e' and len(opened) == 8
+
+    # sessions dropped without closing are not kept alive by the pool
+    lib.session_registries['Client'].active = (None, None)
+    del opened[:], closed[:]
+    collect()
+    assert not pool._keys
+
+
+def test_open_named_sessions():
+    """Test opening multiple named sessions in parallel.
+    """
+    lock = Lock()
+    running = []
+    peak = [0]
+    # set as soon as the max number of workers are opening at the same time
+    ready = Event()
+
+    class Device(SessionHandler):
+        class Meta:
+            open_workers = 3
+
+        def open(self, address):
+            with lock:
+                running.append(address)
+                peak[0] = max(peak[0], len(running))
+                if len(running) == 3:
+                    ready.set()
+            ready.wait(5)
+            with lock:
+                running.remove(address)
+            if address == 'broken':
+                raise ValueError(address)
+            return address
+
+    TestLibrary = testlibrary(session_handlers=[Device])
+    lib = TestLibrary()
+    assert 'Open Named Devices' in lib.get_keyword_names()
+
+    lib.OpenNamedDevices(*[['dev%d' % i, 'addr%d' % i] for i in range(5)])
+    # ==> opened in parallel, but by never more than open_workers threads
+    assert ready.is_set() and peak[0] == 3
+    assert lib.devices == dict(
+        ('dev%d' % i, 'addr%d' % i) for i in range(5))
+    # the last one is active
+    assert lib.device == 'addr4'
+
+    with pytest.raises(ValueError):
+        lib.OpenNamedDevices(['ok', 'okay'], ['bad', 'broken'])
+    assert lib.devices['ok'] == 'okay' and 'bad' not in lib.devices
+
+
+def test_async_session_opener():
+    """Test session openers returning coroutines.
+    """
+    asyncio = pytest.importorskip('asyncio')
+
+    class Device(SessionHandler):
+        def open(self, address):
+            return asyncio.sleep(0.01, result=address)
+
+    TestLibrary = testlibrary(session_handlers=[Device])
+    lib = TestLibrary()
+    lib.OpenDevice('single')
+    assert lib.device == 'single'
+    lib.OpenNamedDevices(['first', 'one'], ['second', 'two'])
+    assert lib.devices == {'first': 'one', 'second': 'two'}
+
+
+def test_lazy_keywords():
+    """Test lazy creation of instance-bound Keywords.
+    """
+    TestLibrary = testlibrary()
+
+    @TestLibrary.keyword
+    def first_keyword(self, arg):
+        return arg
+
+    @TestLibrary.keyword
+    def second_keyword(self):
+        pass
+
+    lib = TestLibrary()
+    assert not lib.keywords._dict
+    assert sorted(lib.get_keyword_names()) \
+        == ['First Keyword', 'Second Keyword']
+    assert not lib.keywords._dict
+
+    assert lib.run_keyword('first_keyword', [1]) == 1
+    keyword = lib.keywords['First Keyword']
+    assert keyword.libinstance is lib
+    assert lib.FirstKeyword is keyword
+    assert list(lib.keywords._dict) == ['firstkeyword']
+    assert len(lib.keywords) == 2
+    # the unbound Keyword metadata is shared by all library instances
+    other = TestLibrary()
+    assert other.FirstKeyword is not keyword
+    assert other.FirstKeyword.context_handlers is keyword.context_handlers
+
+    # the Dynamic API argument spec is computed only once
+    args = lib.get_keyword_arguments('First Keyword')
+    assert args == ('arg', )
+    assert other.get_keyword_arguments('first_keyword') is args
+
+
+def test_keyword_name():
+    """Test precomputed normalization of Keyword names.
+    """
+    name = KeywordName('some_keyword')
+    assert name == 'Some Keyword'
+    assert name.normalized == 'somekeyword'
+    assert name == 'some keyword' == KeywordName('SomeKeyword')
+    assert name != 'Other Keyword'
+    assert hash(name) == hash('somekeyword')
+    assert copy(name) == name and copy(name).normalized == 'somekeyword'
+    assert KeywordsDict._normalize('Some_Keyword') == 'somekeyword'
+
+
+def test_keywords_dict(monkeypatch):
+    """Test that repeated lookups by raw names are normalized only once.
+    """
+    from robottools.library.keywords import utils
+
+    keywords = KeywordsDict()
+    keywords['some_keyword'] = 'keyword'
+    normalize = utils.normalize
+    normalized = []
+
+    def counting_normalize(name, ignore=()):
+        normalized.append(name)
+        return normalize(name, ignore=ignore)
+
+    monkeypatch.setattr(utils, 'normalize', counting_normalize)
+    name = KeywordName('some_keyword')
+    for _ in range(5):
+        assert keywords['SOME_keyword'] == 'keyword'
+        assert keywords[name] == 'keyword'
+    name, keyword = keywords.item('SOME_keyword')
+    assert type(name) is KeywordName and keyword == 'keyword'
+    # (the KeywordName creation is the only other normalization)
+    assert normalized == ['Some Keyword', 'SOME_keyword']
+    assert name == 'Some Keyword'
+    assert list(keywords.names()) == ['Some Keyword']
+    assert list(keywords) == [('Some Keyword', 'keyword')]
+
+
+def test_lru_cache():
+    """Test the bounded function cache (with its own version on PY2).
+    """
+    from robottools.library.keywords.utils import lru_cache
+
+    calls = []
+
+    @lru_cache(maxsize=2)
+    def double(number):
+        calls.append(number)
+        return 2 * number
+
+    assert [double(n) for n in [1, 2, 1, 2]] == [2, 4, 2, 4]
+    assert calls == [1, 2]
+    assert double(3) == 6 and double(3) == 6
+    assert calls == [1, 2, 3]
+    with pytest.raises(TypeError):
+        double([1])
+
+
+def test_argtypes():
+    """Test the compiled argtypes conversion of Keyword arguments.
+    """
+    TestLibrary = testlibrary()
+    keyword_int = TestLibrary.keyword[int]
+    keyword_bool_ints = TestLibrary.keyword[
+        memoized(RobotBool), batch(memoized(int))]
+
+    class Library(TestLibrary):
+        @keyword_int
+        def single(self, number):
+            return number
+
+        @keyword_bool_ints
+        def multiple(self, flag, numbers, *rest):
+            return flag, numbers, rest
+
+    lib = Library()
+    assert lib.Single('1') == 1
+    assert lib.run_keyword('multiple', ['true', ['1', 2, '3'], 'x']) \
+        == (True, [1, 2, 3], ('x', ))
+
+    converter = memoized(int)
+    assert converter.convert('10') == 10
+    assert converter.convert(10.5) == 10
+    assert converter.convert('10') == 10
+    # unhashable arguments work without cache
+    assert memoized(list).convert([1]) == [1]
+
+    argtypes = ArgTypes((int, memoized(RobotBool)))
+    assert list(argtypes) == [int, argtypes[1]]
+    assert argtypes[1].convert('true') is True
+    assert argtypes[1].convert('false') is False
+
+
+@pytest.mark.benchmark
+def test_argtypes_benchmark():
+    """Compare plain RobotBool conversion with the memoized one.
+    """
+    argtypes = ArgTypes((memoized(RobotBool), ))
+    number = 100000
+    uncached = timeit(lambda: RobotBool('true'), number=number)
+    cached = timeit(lambda: argtypes[0].convert('true'), number=number)
+    print("RobotBool conversion per call: %.2fus uncached, "
+          "%.2fus memoized"
+          % (uncached / number * 1e6, cached / number * 1e6))
+
+
+def test_run_keyword_direct():
+    TestLibrary = testlibrary()
+
+    @TestLibrary.keyword
+    def test_keyword(self, arg):
+        return arg
+
+    assert TestLibrary().run_keyword('Test Keyword', [1]) == 1
+    # make sure that run_keyword is not wrapped by any generated trampoline
+    assert TestLibraryType.__dict__['run_keyword'].__code__.co_filename \
+        == TestLibraryType.__dict__['__init__'].__code__.co_filename
+
+
+@pytest.mark.benchmark
+def test_run_keyword_benchmark():
+    """Compare the throughput of the direct `run_keyword` method
+    with a variant wrapped by a :mod:`decorator`-based instance check,
+    like it was done before.
+    """
+    TestLibrary = testlibrary()
+
+    @TestLibrary.keyword
+    def test_keyword(self, arg):
+        return arg
+
+    def caller(func, self, *args, **kwargs):
+        if self.keywords is type(self).keywords:
+            raise RuntimeError
+        return func(self, *args, **kwargs)
+
+    class CheckedLibrary(TestLibrary):
+        # (the plain function, which is an unbound method on PY2)
+        run_keyword = decorate(TestLibraryType.__dict__['run_keyword'], caller)
+
+    direct = TestLibrary()
+    checked = CheckedLibrary()
+    number = 10000
+    direct_time = timeit(
+        lambda: direct.run_keyword('Test Keyword', [1]), number=number)
+    checked_time = timeit(
+        lambda: checked.run_keyword('Test Keyword', [1]), number=number)
+    print("run_keyword throughput: %d/s direct, %d/s checked"
+          % (number / direct_time, number / checked_time))
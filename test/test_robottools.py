@@ -1 +1,146 @@
+import os
+import sys
+from subprocess import check_output
+from textwrap import dedent
+
 import robottools
+from robottools.importtime import ImportProfiler, main
+from robottools.library.inspector import RobotLibraries
+from robottools.library.inspector.manifest import Manifest
+
+import pytest
+
+
+def run_python(code):
+    """Run `code` in a fresh Python process and return its output.
+    """
+    output = check_output([sys.executable, '-c', dedent(code)])
+    return output.decode().strip()
+
+
+def test_lazy_loading():
+    if not isinstance(robottools, robottools.LazyModule):
+        pytest.skip("no lazy loading on this Python version")
+
+    assert run_python("""
+        import sys
+        import robottools
+        print(sorted(name for name in sys.modules if name.startswith(
+            ('robottools.testrobot', 'robottools.library.inspector'))))
+        robottools.TestRobot
+        print('robottools.testrobot' in sys.modules)
+        """).splitlines() == ['[]', 'True']
+
+    # ==> requirements are still checked on import
+    assert run_python("""
+        import robottools
+        print('__requires__' in vars(robottools))
+        """) == 'True'
+
+    assert set(robottools.__all__) <= set(dir(robottools))
+    for modname, names in robottools.SUBMODULE_NAMES.items():
+        for name in names:
+            assert robottools.LAZY_NAMES[name] == modname
+    for name in robottools.__all__:
+        assert getattr(robottools, name) is not None
+    assert callable(robottools.libdoc)
+    assert robottools.__version__
+    with pytest.raises(AttributeError):
+        robottools.NonExisting
+
+
+def test_robot_libraries():
+    libraries = robottools.ROBOT_LIBRARIES
+    assert 'BuiltIn' in libraries and 'OperatingSystem' in libraries
+    assert list(libraries) == sorted(libraries)
+    assert libraries == list(libraries)
+    with pytest.raises(TypeError):
+        hash(libraries)
+    # ==> the test session doesn't write to the user's cache directory
+    assert libraries.manifest.path.startswith(
+        os.environ['ROBOTTOOLS_CACHE_DIR'])
+
+
+def test_robot_libraries_manifest(tmpdir):
+    path = str(tmpdir.join('manifest.json'))
+    discovered = []
+
+    def discover():
+        discovered.append(True)
+        return RobotLibraries.discover()
+
+    libraries = RobotLibraries(Manifest(path))
+    libraries.discover = discover
+    assert list(libraries) == list(robottools.ROBOT_LIBRARIES)
+    assert 'Log' in libraries.keywords('BuiltIn')
+    assert discovered == [True]
+
+    # ==> a new process only reads the manifest file
+    libraries = RobotLibraries(Manifest(path))
+    libraries.discover = discover
+    assert list(libraries) == list(robottools.ROBOT_LIBRARIES)
+    assert libraries.keywords('BuiltIn') == RobotLibraries(
+        Manifest(path)).keywords('BuiltIn')
+    assert discovered == [True]
+
+    # ==> manifests of other robot versions are ignored
+    manifest = Manifest(path)
+    manifest.data['robot'] = '0.0'
+    assert manifest.save()
+    assert Manifest(path).data == {
+        'robot': Manifest(path).data['robot'], 'keywords': {}}
+
+    # ==> failed writes don't leave temporary files behind
+    manifest = Manifest(str(tmpdir.join('broken', 'manifest.json')))
+    manifest.data['keywords']['Broken'] = object()
+    with pytest.raises(TypeError):
+        manifest.save()
+    assert tmpdir.join('broken').listdir() == []
+
+    # ==> unwritable cache directories just disable caching
+    manifest = Manifest(str(tmpdir.join('file', 'manifest.json')))
+    tmpdir.join('file').write('')
+    assert not manifest.save()
+    assert manifest.libraries(RobotLibraries.discover) == list(
+        robottools.ROBOT_LIBRARIES)
+
+
+def test_inspector_cache():
+    from robottools import TestLibraryInspector
+    # ==> every inspector gets its own library instance
+    first, second = TestLibraryInspector.BuiltIn, TestLibraryInspector.BuiltIn
+    assert first is not second
+    assert first._library is not second._library
+    assert dir(TestLibraryInspector) == list(robottools.ROBOT_LIBRARIES)
+    with pytest.raises(AttributeError):
+        TestLibraryInspector.NonExistingLibrary
+
+
+def test_importtime(capsys):
+    sys.modules.pop('colorsys', None)
+    with ImportProfiler() as profiler:
+        __import__('colorsys')
+    [(depth, name, selftime, cumulative)] = profiler.records
+    assert (depth, name) == (0, 'colorsys')
+    assert 0 < selftime <= cumulative
+
+    assert main(['--top', '3', 'robottools:TestRobot']) == 0
+
+
+def test_testrobot_patches():
+    # Robot's process-wide objects are only patched on first use
+    output = run_python("""
+        from robot.running import EXECUTION_CONTEXTS
+        from robot.running.outputcapture import PythonCapturer
+        set_stdout = PythonCapturer.__dict__['_set_stdout']
+        from robottools import TestRobot
+        print(type(EXECUTION_CONTEXTS).__name__)
+        print(PythonCapturer.__dict__['_set_stdout'] is set_stdout)
+        TestRobot('Test').Log('patched')
+        print(type(EXECUTION_CONTEXTS).__name__)
+        print(PythonCapturer.__dict__['_set_stdout'] is set_stdout)
+        """)
+    # (without TestRobot's log messages)
+    assert [line for line in output.splitlines()
+            if not line.startswith('[')] == [
+        'ExecutionContexts', 'True', 'ThreadLocalExecutionContexts', 'False']